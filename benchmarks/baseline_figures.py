@@ -0,0 +1,596 @@
+"""
+Figure builders before the shared "soccer" template: plotly express, make_subplots
+and layout/traces styling repeated in every figure. Kept as the baseline of
+benchmarks/benchmark_figures.py.
+"""
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+# utils_statistics
+
+
+def create_goals_distribution(data: pd.DataFrame, **args):
+    """
+    Scored/missed goals distribution
+    """
+    colors = {
+        "for": args["dash"]["colors"]["agressive"],
+        "against": args["dash"]["colors"]["soft"],
+    }
+
+    fig = make_subplots(
+        rows=1,
+        cols=2,
+        specs=[[{"type": "bar"}, {"type": "pie"}]],
+        horizontal_spacing=0.001,
+        subplot_titles=("by minutes", "total"),
+    )
+
+    for direction, name in zip(["for", "against"], ["scored", "missed"]):
+        fig.add_trace(
+            go.Bar(
+                x=data[data["direction"] == direction]["minute"],
+                y=data[data["direction"] == direction]["goals"],
+                name=name,
+                text=data[data["direction"] == direction]["goals"],
+                width=0.35,
+                marker_color=colors[direction],
+            ),
+            row=1,
+            col=1,
+        )
+
+    sum_goals = (
+        data.groupby("direction")["goals"].sum().reset_index().sort_values(by=["goals"])
+    )
+
+    fig.add_trace(
+        go.Pie(
+            values=sum_goals["goals"],
+            labels=sum_goals["direction"],
+            showlegend=False,
+            text=sum_goals["goals"],
+            marker_colors=list(colors.values())[::-1],
+        ),
+        row=1,
+        col=2,
+    )
+
+    fig.update_layout(
+        xaxis_title="minutes",
+        yaxis_title="goals",
+        height=400,
+        width=1200,
+        plot_bgcolor="white",
+        yaxis=dict(showgrid=True, gridcolor="lightgrey"),
+        title_text="Scored/missed goals distribution",
+    )
+    fig.update_traces(marker=dict(line=dict(color="#000000", width=0.75)))
+
+    return fig
+
+
+def create_cards_boxplot(data: pd.DataFrame, **args):
+    """
+    Card distribution visualusation.
+    """
+    colors = {
+        "yellow": args["dash"]["colors"]["agressive"],
+        "red": args["dash"]["colors"]["soft"],
+    }
+
+    fig = px.bar(
+        data,
+        x="minute",
+        y="number",
+        color="color",
+        text_auto=".s",
+        color_discrete_map=colors,
+    )
+
+    fig.update_layout(
+        height=400,
+        width=600,
+        title_text="Cards distribution",
+        plot_bgcolor="white",
+        yaxis=dict(showgrid=True, gridcolor="lightgrey"),
+    )
+    fig.update_traces(marker=dict(line=dict(color="#000000", width=0.75)))
+
+    return fig
+
+
+def create_lineups_boxplot(data: pd.DataFrame, **args):
+    """
+    Teams lineups distribution visualisation.
+    """
+    fig = px.bar(data, x="formation", y="games", text_auto=".s")
+
+    fig.update_layout(
+        height=400,
+        width=600,
+        title_text="Lineups distribution",
+        plot_bgcolor="white",
+        yaxis=dict(showgrid=True, gridcolor="lightgrey"),
+    )
+
+    fig.update_traces(
+        marker_color=args["dash"]["colors"]["agressive"],
+        marker=dict(line=dict(color="#000000", width=0.75)),
+    )
+
+    return fig
+
+
+def create_penalties_boxplot(data: pd.DataFrame, **args):
+    """
+    Penalties results distribution visualisation.
+    """
+    colors = {
+        "missed": args["dash"]["colors"]["agressive"],
+        "scored": args["dash"]["colors"]["soft"],
+    }
+
+    fig = px.bar(
+        data,
+        x="result",
+        y="number",
+        text_auto=".s",
+        color="result",
+        color_discrete_map=colors,
+    )
+
+    fig.update_layout(
+        height=400,
+        width=600,
+        title_text="Penalties distribution",
+        plot_bgcolor="white",
+        yaxis=dict(showgrid=True, gridcolor="lightgrey"),
+    )
+
+    fig.update_traces(
+        marker_color=args["dash"]["colors"]["soft"],
+        marker=dict(line=dict(color="#000000", width=0.75)),
+    )
+
+    return fig
+
+
+def create_cleansheets_boxplot(data: pd.DataFrame, **args):
+    """
+    Cleansheets distribution visualisation.
+    """
+    colors = {
+        "home": args["dash"]["colors"]["agressive"],
+        "away": args["dash"]["colors"]["soft"],
+    }
+
+    fig = px.pie(
+        data,
+        values="games",
+        names="location",
+        color="location",
+        color_discrete_map=colors,
+    )
+
+    fig.update_traces(hole=0.5, textposition="inside", textinfo="value+percent")
+
+    fig.update_layout(
+        height=400,
+        width=600,
+        title_text="Cleansheets distribution",
+        plot_bgcolor="white",
+        yaxis=dict(showgrid=True, gridcolor="lightgrey"),
+    )
+    fig.update_traces(marker=dict(line=dict(color="#000000", width=0.75)))
+
+    return fig
+
+
+# utils_tables
+
+
+def create_standings_boxplot(data: pd.DataFrame, **args) -> px.bar:
+    """
+    Scored/missed goals distribution visualisation.
+    """
+    fig = make_subplots(
+        rows=1, cols=1, specs=[[{"type": "bar"}]], horizontal_spacing=0.001
+    )
+
+    for direction, color in zip(
+        ["scored", "missed"], [args["agressive"], args["soft"]]
+    ):
+        fig.add_trace(
+            go.Bar(
+                x=data["team"],
+                y=data[direction],
+                name=direction,
+                text=[i for i in data[direction]],
+                marker_color=color,
+                width=0.35,
+            ),
+            row=1,
+            col=1,
+        )
+
+    fig.update_layout(
+        yaxis_title="goals",
+        margin=dict(l=10, r=10, t=10),
+        plot_bgcolor="white",
+        yaxis=dict(showgrid=True, gridcolor="lightgrey"),
+    )
+
+    return fig
+
+
+def create_results_boxplot(data: pd.DataFrame, **args) -> px.bar:
+    """
+    Win/lose distribution visualisation.
+    """
+    fig = make_subplots(
+        rows=1, cols=1, specs=[[{"type": "bar"}]], horizontal_spacing=0.001
+    )
+
+    for result, color in zip(["win", "lose"], [args["agressive"], args["soft"]]):
+        fig.add_trace(
+            go.Bar(
+                x=data["team"],
+                y=data[result],
+                name=result,
+                text=[i for i in data[result]],
+                marker_color=color,
+                width=0.35,
+            ),
+            row=1,
+            col=1,
+        )
+
+    fig.update_layout(
+        yaxis_title="results",
+        margin=dict(l=10, r=10, t=10),
+        plot_bgcolor="white",
+        yaxis=dict(showgrid=True, gridcolor="lightgrey"),
+    )
+
+    return fig
+
+
+def create_topscorers_barplot(data: pd.DataFrame, column: str, **args) -> dict:
+    """
+    Topscorers statistic (min_per_goal, shots_per_goal) visualisation.
+    """
+    fig = {
+        "data": [
+            {
+                "x": data["player"],
+                "y": data[column],
+                "type": "bar",
+                "marker": {"color": args["agressive"]},
+                "width": 0.3,
+                "text": [np.round(i, 2) for i in data[column].unique()],
+            }
+        ],
+        "layout": {
+            "xaxis": {"automargin": True},
+            "yaxis": {"automargin": True, "title": {"text": column}},
+            "height": 250,
+            "margin": {"t": 10, "l": 10, "r": 10},
+        },
+    }
+
+    return fig
+
+
+# utils_h2h
+
+
+def create_barplot(data: pd.DataFrame, column: str, team: str, horizontal=False):
+    """
+    Selected team column boxplot.
+
+    params:
+        data - statistics dataframe
+        column - values
+        team - name of team
+        horizontal - whether to plot barplot in horizontal orientation
+    """
+    if horizontal:
+        if team in data["team"].unique():
+            fig = go.Bar(
+                y=data["team"],
+                x=data[column],
+                name=team,
+                text=[i for i in data[column]],
+                orientation="h",
+            )
+        else:
+            fig = go.Bar(
+                y=[f"{team} is relegated."],
+                x=[0],
+                name=team,
+                text=["relegated"],
+                orientation="h",
+            )
+    else:
+        if team in data["team"].unique():
+            fig = go.Bar(
+                x=data["team"],
+                y=data[column],
+                name=team,
+                text=[i for i in data[column]],
+            )
+        else:
+            fig = go.Bar(
+                x=[f"{team} is relegated."], y=[0], name=team, text=["relegated"]
+            )
+
+    return fig
+
+
+# (column, color) of comparison traces
+RESULTS_TRACES = [("win", "#7BD190"), ("draw", "#E7E19B"), ("lose", "#E69CA5")]
+GOALS_TRACES = [("for", "scored"), ("against", "missed")]
+CARDS_TRACES = [("yellow", "#E7E19B"), ("red", "#E69CA5")]
+
+
+def create_points_trace(standings: pd.DataFrame, team: str) -> go.Bar:
+    """
+    Selected team points barplot.
+    """
+    trace = create_barplot(
+        data=standings[standings["team"] == team], column="points", team=team
+    )
+    trace.update(marker=dict(line=dict(color="#000000", width=0.75)))
+
+    return trace
+
+
+def create_points_comparison(standings: pd.DataFrame, teams: list) -> go.Figure:
+    """
+    Points comparison of selected teams, one trace per team.
+    """
+    fig = make_subplots(
+        rows=1, cols=1, specs=[[{"type": "bar"}]], horizontal_spacing=0.001
+    )
+
+    for team in teams:
+        fig.add_trace(create_points_trace(standings=standings, team=team))
+
+    fig.update_layout(
+        yaxis_title="points",
+        plot_bgcolor="white",
+        yaxis=dict(showgrid=True, gridcolor="lightgrey"),
+        title_text="Points comparison",
+    )
+
+    return fig
+
+
+def create_results_comparison(statistics: pd.DataFrame) -> go.Figure:
+    """
+    Win/draw/lose comparison of selected teams.
+    """
+    fig = go.Figure()
+
+    for column, color in RESULTS_TRACES:
+        fig.add_trace(
+            go.Bar(
+                y=statistics.index.tolist(),
+                x=statistics[column].tolist(),
+                name=column,
+                text=statistics[column].tolist(),
+                orientation="h",
+                marker=dict(color=color, line=dict(color="#000000", width=0.75)),
+            )
+        )
+
+    fig.update_layout(
+        yaxis_title="teams",
+        plot_bgcolor="white",
+        yaxis=dict(showgrid=True, gridcolor="lightgrey"),
+        title_text="Results comparison",
+        barmode="stack",
+    )
+
+    return fig
+
+
+def create_goals_comparison(statistics: pd.DataFrame) -> go.Figure:
+    """
+    Scored/missed goals comparison of selected teams.
+    """
+    fig = make_subplots(
+        rows=1,
+        cols=2,
+        specs=[[{"type": "pie"}, {"type": "pie"}]],
+        horizontal_spacing=0.001,
+        subplot_titles=[name for _, name in GOALS_TRACES],
+    )
+
+    for col, (direction, _) in enumerate(GOALS_TRACES, start=1):
+        fig.add_trace(
+            go.Pie(
+                labels=statistics.index.tolist(),
+                values=statistics[direction].tolist(),
+                name=direction,
+            ),
+            row=1,
+            col=col,
+        )
+
+    fig.update_traces(
+        hole=0.5,
+        textposition="inside",
+        textinfo="value+percent",
+        marker=dict(line=dict(color="#000000", width=0.75)),
+    )
+
+    fig.update_layout(
+        yaxis_title="teams",
+        plot_bgcolor="white",
+        yaxis=dict(showgrid=True, gridcolor="lightgrey"),
+        title_text="Goals comparison",
+    )
+
+    return fig
+
+
+def create_cards_comparison(statistics: pd.DataFrame) -> go.Figure:
+    """
+    Yellow/red cards comparison of selected teams.
+    """
+    fig = go.Figure()
+
+    for card, color in CARDS_TRACES:
+        fig.add_trace(
+            go.Bar(
+                y=statistics.index.tolist(),
+                x=statistics[card].tolist(),
+                name=card,
+                text=statistics[card].tolist(),
+                orientation="h",
+                marker=dict(color=color, line=dict(color="#000000", width=0.75)),
+            )
+        )
+
+    fig.update_layout(
+        yaxis_title="teams",
+        plot_bgcolor="white",
+        yaxis=dict(showgrid=True, gridcolor="lightgrey"),
+        title_text="Cards comparison",
+        barmode="stack",
+    )
+
+    return fig
+
+
+# utils_aggregations
+
+
+def create_aggregated_goals_plot(data: pd.DataFrame):
+    """
+    Selected leagues aggregated goals lineplots.
+    """
+    goals_aggs = (
+        data[data["direction"] == "for"]
+        .groupby(["league", "season"])["sum_goals"]
+        .agg(["mean", "sum"])
+        .reset_index()
+    )
+
+    fig_sum = go.Figure()
+    fig_mean = go.Figure()
+
+    for league in goals_aggs["league"].unique():
+        fig_sum.add_trace(
+            go.Scatter(
+                x=goals_aggs[goals_aggs["league"] == league]["season"],
+                y=goals_aggs[goals_aggs["league"] == league]["sum"],
+                mode="lines",
+                name=league,
+            )
+        )
+
+        fig_mean.add_trace(
+            go.Scatter(
+                x=goals_aggs[goals_aggs["league"] == league]["season"],
+                y=goals_aggs[goals_aggs["league"] == league]["mean"],
+                mode="lines",
+                name=league,
+            )
+        )
+
+    for fig, name in zip([fig_sum, fig_mean], ["Sum", "Mean"]):
+        fig.update_layout(
+            yaxis_title="goals",
+            height=400,
+            width=1200,
+            plot_bgcolor="white",
+            yaxis=dict(showgrid=True, gridcolor="lightgrey"),
+            title_text=f"{name} of Scored goals through seasons",
+        )
+
+    return fig_sum, fig_mean
+
+
+def create_aggregated_cards_plot(data: pd.DataFrame):
+    """
+    Selected leagues aggregated goals plots.
+    """
+    fig_sum = go.Figure()
+    fig_mean = go.Figure()
+
+    cards_aggs = (
+        data.groupby(["color", "league"])["sum_number"]
+        .agg(["mean", "sum"])
+        .reset_index()
+    )
+    cards_aggs["mean"] = cards_aggs["mean"].round(2)
+
+    for card, color in zip(["yellow", "red"], ["#E7E19B", "#E69CA5"]):
+        fig_sum.add_trace(
+            go.Bar(
+                y=cards_aggs[cards_aggs["color"] == card]["league"],
+                x=cards_aggs[cards_aggs["color"] == card]["sum"],
+                name=card,
+                text=[i for i in cards_aggs[cards_aggs["color"] == card]["sum"]],
+                orientation="h",
+                marker=dict(color=color, line=dict(color="#000000", width=0.75)),
+            )
+        )
+
+    for card, color in zip(["yellow", "red"], ["#E7E19B", "#E69CA5"]):
+        fig_mean.add_trace(
+            go.Bar(
+                y=cards_aggs[cards_aggs["color"] == card]["league"],
+                x=cards_aggs[cards_aggs["color"] == card]["mean"],
+                name=card,
+                text=[i for i in cards_aggs[cards_aggs["color"] == card]["mean"]],
+                orientation="h",
+                marker=dict(color=color, line=dict(color="#000000", width=0.75)),
+            )
+        )
+
+    for fig, name in zip([fig_sum, fig_mean], ["Sum", "Mean"]):
+        fig.update_layout(
+            yaxis_title="cards",
+            height=400,
+            width=600,
+            plot_bgcolor="white",
+            yaxis=dict(showgrid=True, gridcolor="lightgrey"),
+            title_text=f"{name} of cards",
+        )
+
+    return fig_sum, fig_mean
+
+
+def create_aggregated_cleansheets_plot(data: pd.DataFrame):
+    """
+    Selected leagues aggregated cleansheets plots.
+    """
+    cs_aggs = data.groupby(["league"])["sum_games"].agg(["mean", "sum"]).reset_index()
+    cs_aggs["mean"] = cs_aggs["mean"].round(2)
+
+    fig = px.bar(
+        cs_aggs,
+        x="league",
+        y="sum",
+        color="league",
+        text_auto=".s",
+        title="Sum of Cleansheets",
+    )
+
+    fig.update_layout(
+        height=400,
+        width=1200,
+        plot_bgcolor="white",
+        yaxis=dict(showgrid=True, gridcolor="lightgrey"),
+    )
+
+    fig.update_traces(marker=dict(line=dict(color="#000000", width=0.75)))
+
+    return fig
@@ -0,0 +1,96 @@
+"""
+As-of snapshot lookup latency as history of daily snapshots grows.
+
+Synthetic standings history (daily snapshots of 5 leagues x 20 teams) is written to
+a temporary table of the configured DB (conf/configs.yaml), which is dropped after.
+Leagues are taken from leagues reference (src/references.py should be run before).
+
+Run from the project root:
+    python3 -m benchmarks.benchmark_as_of --days 30 365 1095 1825 --repeat 50
+"""
+import argparse
+import datetime
+import statistics
+import time
+
+import numpy as np
+from omegaconf import OmegaConf
+
+import src.database_connection as database_connection
+
+TABLE = "as_of_benchmark"
+LEAGUES = ["Ligue 1", "Premier League", "Bundesliga", "Serie A", "La Liga"]
+START = datetime.datetime(2018, 8, 1, 9, 0)
+
+
+def create_history(db, days: int):
+    """
+    Daily snapshots of standings of every league for `days` days.
+    """
+    db.execute(f"DROP TABLE IF EXISTS {TABLE};")
+    db.execute(
+        f"""
+        CREATE TABLE {TABLE} AS
+        SELECT
+            2023 AS season,
+            l.league_id,
+            l.name AS league,
+            'team ' || team AS team,
+            team AS rank,
+            (random() * 100)::integer AS points,
+            %(start)s::timestamp + day * interval '1 day' AS time_extraction
+        FROM leagues l,
+            generate_series(1, 20) AS team,
+            generate_series(0, %(days)s - 1) AS day
+        WHERE l.name = any(%(leagues)s::varchar[]);
+        """,
+        params={"start": START, "leagues": LEAGUES, "days": days},
+    )
+    db.execute(
+        f"CREATE INDEX {TABLE}_season_league_id_idx ON {TABLE} (season, league_id, time_extraction);"
+    )
+    db.execute(f"ANALYZE {TABLE};")
+
+
+def measure(db, days: int, repeat: int) -> float:
+    """
+    Median latency (ms) of as-of lookup at random dates of history.
+    """
+    rng = np.random.default_rng(0)
+    latencies = []
+
+    for _ in range(repeat):
+        league = LEAGUES[rng.integers(len(LEAGUES))]
+        as_of = START + datetime.timedelta(days=int(rng.integers(days)), hours=12)
+
+        start = time.perf_counter()
+        data = db.query_as_of(table_name=TABLE, season=2023, league=league, as_of=as_of)
+        latencies.append(time.perf_counter() - start)
+
+        assert len(data) == 20
+
+    return statistics.median(latencies) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--days", type=int, nargs="+", default=[30, 365, 1095, 1825])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    cfg = OmegaConf.load("conf/configs.yaml")
+    db = database_connection.SoccerDatabase(**cfg["db"])
+
+    print(f"{'days':>8}{'rows':>12}{'as-of, ms':>12}")
+    try:
+        for days in args.days:
+            create_history(db=db, days=days)
+            latency = measure(db=db, days=days, repeat=args.repeat)
+            print(f"{days:>8}{days * len(LEAGUES) * 20:>12}{latency:>12.2f}")
+    finally:
+        db.execute(f"DROP TABLE IF EXISTS {TABLE};")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
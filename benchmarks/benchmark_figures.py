@@ -0,0 +1,290 @@
+"""
+Per-figure build time of utils_dash builders on synthetic season data, side by side
+with the baseline builders (benchmarks/baseline_figures.py, before shared template).
+
+Run from the project root:
+    python3 -m benchmarks.benchmark_figures --repeat 50
+"""
+import argparse
+import timeit
+
+import numpy as np
+import pandas as pd
+import plotly.io as pio
+
+from benchmarks import baseline_figures
+from utils_dash.utils_aggregations import (
+    create_aggregated_cards_plot,
+    create_aggregated_cleansheets_plot,
+    create_aggregated_goals_plot,
+)
+from utils_dash.utils_h2h import (
+    create_cards_comparison,
+    create_goals_comparison,
+    create_h2h_statistics,
+    create_points_comparison,
+    create_results_comparison,
+)
+from utils_dash.utils_statistics import (
+    create_cards_boxplot,
+    create_cleansheets_boxplot,
+    create_goals_distribution,
+    create_lineups_boxplot,
+    create_penalties_boxplot,
+)
+from utils_dash.utils_tables import (
+    create_results_boxplot,
+    create_standings_boxplot,
+    create_topscorers_barplot,
+)
+
+COLORS = {"agressive": "#102937", "soft": "#61A0C6", "head_background": "#7FB3D5"}
+MINUTES = ["0-15", "16-30", "31-45", "46-60", "61-75", "76-90", "91-105", "106-120"]
+LEAGUES = ["Ligue 1", "Premier League", "Bundesliga", "Serie A", "La Liga"]
+
+
+def create_data(teams_number: int = 20, seed: int = 0) -> dict:
+    """
+    Synthetic statistics of one league season (and aggregations of all leagues).
+    """
+    rng = np.random.default_rng(seed)
+    teams = [f"team {i}" for i in range(teams_number)]
+    results = rng.integers(0, 15, size=(teams_number, 3))
+
+    standings = pd.DataFrame(
+        {
+            "team": teams,
+            "points": 3 * results[:, 0] + results[:, 1],
+            "win": results[:, 0],
+            "draw": results[:, 1],
+            "lose": results[:, 2],
+            "scored": rng.integers(10, 80, teams_number),
+            "missed": rng.integers(10, 80, teams_number),
+        }
+    )
+    topscorers = pd.DataFrame(
+        {
+            "player": [f"player {i}" for i in range(20)],
+            "min_per_goal": rng.uniform(80, 400, 20).round(2),
+            "shots_per_goal": rng.uniform(2, 10, 20).round(2),
+        }
+    )
+    goals = pd.DataFrame(
+        [
+            {"team": team, "direction": direction, "minute": minute, "goals": g}
+            for team in teams
+            for direction in ["for", "against"]
+            for minute, g in zip(MINUTES, rng.integers(0, 10, len(MINUTES)))
+        ]
+    )
+    cards = pd.DataFrame(
+        [
+            {"team": team, "color": color, "minute": minute, "number": n}
+            for team in teams
+            for color in ["yellow", "red"]
+            for minute, n in zip(MINUTES, rng.integers(0, 6, len(MINUTES)))
+        ]
+    )
+    lineups = pd.DataFrame(
+        {"formation": ["4-4-2", "4-3-3", "3-5-2"], "games": rng.integers(0, 20, 3)}
+    )
+    penalties = pd.DataFrame(
+        {"result": ["scored", "missed"], "number": rng.integers(0, 8, 2)}
+    )
+    cleansheets = pd.DataFrame(
+        {"location": ["home", "away"], "games": rng.integers(0, 10, 2)}
+    )
+
+    aggregations_index = pd.MultiIndex.from_product(
+        [LEAGUES, range(2018, 2024), teams], names=["league", "season", "team"]
+    ).to_frame(index=False)
+    goals_aggregations = pd.concat(
+        [aggregations_index.assign(direction=d) for d in ["for", "against"]]
+    ).assign(sum_goals=lambda df: rng.integers(10, 80, len(df)))
+    cards_aggregations = pd.concat(
+        [aggregations_index.assign(color=c) for c in ["yellow", "red"]]
+    ).assign(sum_number=lambda df: rng.integers(0, 80, len(df)))
+    cleansheets_aggregations = aggregations_index.assign(
+        sum_games=rng.integers(0, 20, len(aggregations_index))
+    )
+
+    goals_totals = goals.groupby(["team", "direction"])["goals"].sum()
+    cards_totals = cards.groupby(["team", "color"])["number"].sum()
+
+    return {
+        "teams": teams,
+        "standings": standings,
+        "topscorers": topscorers,
+        "goals": goals,
+        "team_goals": goals[goals["team"] == teams[0]],
+        "team_cards": cards[cards["team"] == teams[0]],
+        "cards": cards,
+        "goals_totals": goals_totals.rename("sum_goals").reset_index(),
+        "cards_totals": cards_totals.rename("sum_number").reset_index(),
+        "lineups": lineups,
+        "penalties": penalties,
+        "cleansheets": cleansheets,
+        "goals_aggregations": goals_aggregations,
+        "cards_aggregations": cards_aggregations,
+        "cleansheets_aggregations": cleansheets_aggregations,
+    }
+
+
+def get_builders(data: dict) -> dict:
+    """
+    Figure builders with their arguments.
+    """
+    cfg = {"dash": {"colors": COLORS}}
+    teams = data["teams"][:5]
+    statistics = create_h2h_statistics(
+        standings=data["standings"],
+        goals=data["goals_totals"],
+        cards=data["cards_totals"],
+        teams=teams,
+    )
+
+    return {
+        "statistics.goals_distribution": lambda: create_goals_distribution(
+            data=data["team_goals"],
+            totals=data["goals_totals"][data["goals_totals"]["team"] == teams[0]],
+            **cfg,
+        ),
+        "statistics.cards": lambda: create_cards_boxplot(
+            data=data["team_cards"], **cfg
+        ),
+        "statistics.lineups": lambda: create_lineups_boxplot(
+            data=data["lineups"], **cfg
+        ),
+        "statistics.penalties": lambda: create_penalties_boxplot(
+            data=data["penalties"], **cfg
+        ),
+        "statistics.cleansheets": lambda: create_cleansheets_boxplot(
+            data=data["cleansheets"], **cfg
+        ),
+        "tables.standings": lambda: create_standings_boxplot(
+            data=data["standings"], **COLORS
+        ),
+        "tables.results": lambda: create_results_boxplot(
+            data=data["standings"], **COLORS
+        ),
+        "tables.topscorers": lambda: create_topscorers_barplot(
+            data=data["topscorers"], column="min_per_goal", **COLORS
+        ),
+        "h2h.points": lambda: create_points_comparison(statistics=statistics),
+        "h2h.results": lambda: create_results_comparison(statistics=statistics),
+        "h2h.goals": lambda: create_goals_comparison(statistics=statistics),
+        "h2h.cards": lambda: create_cards_comparison(statistics=statistics),
+        "aggregations.goals": lambda: create_aggregated_goals_plot(
+            data=data["goals_aggregations"]
+        ),
+        "aggregations.cards": lambda: create_aggregated_cards_plot(
+            data=data["cards_aggregations"]
+        ),
+        "aggregations.cleansheets": lambda: create_aggregated_cleansheets_plot(
+            data=data["cleansheets_aggregations"]
+        ),
+    }
+
+
+def get_baseline_builders(data: dict) -> dict:
+    """
+    Baseline figure builders with their arguments (same names as get_builders).
+    """
+    cfg = {"dash": {"colors": COLORS}}
+    teams = data["teams"][:5]
+    statistics = create_h2h_statistics(
+        standings=data["standings"],
+        goals=data["goals_totals"],
+        cards=data["cards_totals"],
+        teams=teams,
+    )
+
+    return {
+        "statistics.goals_distribution": lambda: baseline_figures.create_goals_distribution(
+            data=data["team_goals"], **cfg
+        ),
+        "statistics.cards": lambda: baseline_figures.create_cards_boxplot(
+            data=data["team_cards"], **cfg
+        ),
+        "statistics.lineups": lambda: baseline_figures.create_lineups_boxplot(
+            data=data["lineups"], **cfg
+        ),
+        "statistics.penalties": lambda: baseline_figures.create_penalties_boxplot(
+            data=data["penalties"], **cfg
+        ),
+        "statistics.cleansheets": lambda: baseline_figures.create_cleansheets_boxplot(
+            data=data["cleansheets"], **cfg
+        ),
+        "tables.standings": lambda: baseline_figures.create_standings_boxplot(
+            data=data["standings"], **COLORS
+        ),
+        "tables.results": lambda: baseline_figures.create_results_boxplot(
+            data=data["standings"], **COLORS
+        ),
+        "tables.topscorers": lambda: baseline_figures.create_topscorers_barplot(
+            data=data["topscorers"], column="min_per_goal", **COLORS
+        ),
+        "h2h.points": lambda: baseline_figures.create_points_comparison(
+            standings=data["standings"], teams=teams
+        ),
+        "h2h.results": lambda: baseline_figures.create_results_comparison(
+            statistics=statistics
+        ),
+        "h2h.goals": lambda: baseline_figures.create_goals_comparison(
+            statistics=statistics
+        ),
+        "h2h.cards": lambda: baseline_figures.create_cards_comparison(
+            statistics=statistics
+        ),
+        "aggregations.goals": lambda: baseline_figures.create_aggregated_goals_plot(
+            data=data["goals_aggregations"]
+        ),
+        "aggregations.cards": lambda: baseline_figures.create_aggregated_cards_plot(
+            data=data["cards_aggregations"]
+        ),
+        "aggregations.cleansheets": lambda: baseline_figures.create_aggregated_cleansheets_plot(
+            data=data["cleansheets_aggregations"]
+        ),
+    }
+
+
+def measure(builder, repeat: int, template: str = None) -> float:
+    """
+    Best build time (s) of builder (with default plotly template, if set).
+    """
+    default_template = pio.templates.default
+    if template is not None:
+        pio.templates.default = template
+
+    try:
+        builder()  # warm up validators
+        return min(timeit.repeat(builder, number=1, repeat=repeat))
+    finally:
+        pio.templates.default = default_template
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    data = create_data()
+    builders = get_builders(data=data)
+    baseline_builders = get_baseline_builders(data=data)
+
+    print(f"{'figure':<30}{'baseline, ms':>14}{'build, ms':>12}")
+    baseline_total = total = 0
+    for name, builder in builders.items():
+        # baseline figures were built with the plotly default template
+        baseline_seconds = measure(
+            baseline_builders[name], repeat=args.repeat, template="plotly"
+        )
+        seconds = measure(builder, repeat=args.repeat)
+        baseline_total += baseline_seconds
+        total += seconds
+        print(f"{name:<30}{baseline_seconds * 1000:>14.2f}{seconds * 1000:>12.2f}")
+    print(f"{'total':<30}{baseline_total * 1000:>14.2f}{total * 1000:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
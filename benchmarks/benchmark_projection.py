@@ -0,0 +1,96 @@
+"""
+Monte Carlo season projection time for all five leagues.
+
+Synthetic mid-season standings (5 leagues x 20 teams, 19 of 38 games played) are
+projected serially and by process pool.
+
+Run from the project root:
+    python3 -m benchmarks.benchmark_projection --simulations 100000 --repeat 3
+"""
+import argparse
+import os
+import statistics
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils_dash.utils_projection import project_seasons
+
+LEAGUES = ["Ligue 1", "Premier League", "Bundesliga", "Serie A", "La Liga"]
+TEAMS = 20
+PLAYED = 19
+
+
+def create_standings(seed: int = 0) -> dict:
+    """
+    Mid-season standings of every league: {(season, league): dataframe}.
+    """
+    rng = np.random.default_rng(seed)
+    slices = {}
+
+    for league in LEAGUES:
+        win = rng.integers(2, 15, TEAMS)
+        draw = rng.integers(0, PLAYED - win + 1)
+        lose = PLAYED - win - draw
+
+        slices[(2023, league)] = pd.DataFrame(
+            {
+                "team": [f"{league} {i}" for i in range(TEAMS)],
+                "points": 3 * win + draw,
+                "played": PLAYED,
+                "win": win,
+                "draw": draw,
+                "lose": lose,
+                "goals_diff": rng.integers(-20, 30, TEAMS),
+                "form": ["".join(rng.choice(list("WDL"), 5)) for _ in range(TEAMS)],
+            }
+        )
+
+    return slices
+
+
+def measure(standings_slices: dict, simulations: int, processes: int, repeat: int):
+    """
+    Median time (s) of projection of all leagues.
+    """
+    times = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        projections = project_seasons(
+            standings_slices=standings_slices,
+            simulations=simulations,
+            processes=processes,
+            start_method="fork",
+        )
+        times.append(time.perf_counter() - start)
+
+        assert len(projections) == len(LEAGUES)
+
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--simulations", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    standings_slices = create_standings()
+
+    print(f"{'processes':>10}{'simulations':>14}{'time, s':>10}")
+    for processes in [1, None]:
+        duration = measure(
+            standings_slices=standings_slices,
+            simulations=args.simulations,
+            processes=processes,
+            repeat=args.repeat,
+        )
+        print(
+            f"{processes or os.cpu_count():>10}{args.simulations:>14}{duration:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import importlib
+import os
+import sys
+
+import yaml
+
+# DAG file is re-parsed by scheduler every parse loop: keep import cheap, read only
+# plain yaml here, project modules & full configs are loaded inside tasks
+PROJECT_PATH = os.path.join(os.path.dirname(__file__), "../../soccer_api")
+CONFIG_PATH = os.path.join(PROJECT_PATH, "conf/configs.yaml")
+
+with open(CONFIG_PATH, "r") as f:
+    ARGS = dict(yaml.safe_load(f)["airflow"]["dag_args"])
+
+
+def load_config(overrides: list):
+    """
+    Project configs with dotlist overrides (same as hydra command line overrides).
+    """
+    from omegaconf import OmegaConf
+
+    return OmegaConf.merge(
+        OmegaConf.load(CONFIG_PATH), OmegaConf.from_dotlist(overrides)
+    )
+
+
+def import_entry_point(name: str):
+    """
+    Import script from src: relative paths in configs are resolved from home directory.
+    """
+    src_path = os.path.abspath(os.path.join(PROJECT_PATH, "src"))
+    if src_path not in sys.path:
+        sys.path.insert(0, src_path)
+
+    os.chdir(os.path.expanduser("~"))
+
+    return importlib.import_module(name)
+
+
+def import_dashboard():
+    """
+    Import dashboard (main.py of project root).
+    """
+    project_path = os.path.abspath(PROJECT_PATH)
+    if project_path not in sys.path:
+        sys.path.insert(0, project_path)
+
+    return importlib.import_module("main")
@@ -0,0 +1,21 @@
+import datetime
+
+from airflow.decorators import task
+from airflow.models.dag import DAG
+from dag_utils import ARGS, import_entry_point, load_config
+
+with DAG(
+    dag_id="snapshots_compaction",
+    schedule="@weekly",
+    start_date=datetime.datetime(2024, 1, 7, 3, 0),
+    catchup=False,
+    tags=["soccer"],
+    default_args=ARGS,
+) as dag:
+
+    @task(task_id="weekly_snapshots_compaction")
+    def compact_snapshots() -> None:
+        snapshots_compaction = import_entry_point("snapshots_compaction")
+        snapshots_compaction.run_compaction(cfg=load_config(overrides=[]))
+
+    compact_snapshots()
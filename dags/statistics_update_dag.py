@@ -1,14 +1,10 @@
 import datetime
 
+from airflow.decorators import task
+from airflow.exceptions import AirflowSkipException
 from airflow.models.dag import DAG
-from airflow.operators.bash import BashOperator
-from hydra import compose, initialize
-
-
-initialize(version_base=None, config_path="../../soccer_api/conf")
-cfg = compose(config_name="configs.yaml")
-
-ARGS = dict(cfg["airflow"]["dag_args"])
+from airflow.utils.trigger_rule import TriggerRule
+from dag_utils import ARGS, import_dashboard, import_entry_point, load_config
 
 with DAG(
     dag_id="statistics_update",
@@ -18,16 +14,82 @@ with DAG(
     tags=["soccer"],
     default_args=ARGS,
 ) as dag:
-    task_update_statistics = BashOperator(
-        task_id="daily_statistics_update",
-        bash_command="./statistics_update_run.sh",
-        dag=dag,
-    )
-
-    task_update_aggregations = BashOperator(
-        task_id="daily_aggregations_update",
-        bash_command="./aggregations_update_run.sh",
-        dag=dag,
-    )
-
-    task_update_statistics >> task_update_aggregations
+
+    @task(task_id="get_partitions")
+    def get_partitions() -> list:
+        """
+        Daily update extracts only the last season: one (season, league) per league.
+        """
+        cfg = load_config(overrides=[])
+
+        return [
+            [cfg["data_extraction"]["seasons"][-1], league]
+            for league in cfg["data_extraction"]["leagues"]
+        ]
+
+    @task(task_id="daily_statistics_update")
+    def update_statistics(partition: list) -> list:
+        season, league = partition
+
+        data_extraction = import_entry_point("data_extraction")
+        data_extraction.run_extraction(
+            cfg=load_config(
+                overrides=[
+                    "data_extraction.first_run=False",
+                    f"data_extraction.seasons=[{season}]",
+                    f"data_extraction.leagues=[{league}]",
+                ]
+            )
+        )
+
+        return partition
+
+    @task(task_id="join_extracted_leagues", trigger_rule=TriggerRule.ALL_DONE)
+    def join_extracted_leagues(extracted) -> list:
+        """
+        Collect (season, league) of successful extraction tasks (failed tasks push
+        no XCom), so that failed leagues don't block aggregation of others.
+        Aggregation is skipped if no league was extracted.
+        """
+        succeeded = sorted(list(partition) for partition in extracted)
+
+        if not succeeded:
+            raise AirflowSkipException("No league was extracted")
+
+        return succeeded
+
+    @task(task_id="daily_aggregations_update")
+    def update_aggregations(partitions: list) -> None:
+        """
+        Extracted leagues are aggregated by extraction tasks: here only joined leagues
+        left not aggregated since their extraction are caught up (incremental by load_log).
+        """
+        statistics_aggregation = import_entry_point("statistics_aggregation")
+        statistics_aggregation.run_aggregation(
+            cfg=load_config(
+                overrides=[
+                    "data_extraction.first_run=False",
+                    "statistics_aggregation.incremental=True",
+                    f"statistics_aggregation.partitions={partitions}",
+                ]
+            )
+        )
+
+    @task(task_id="prerender_dashboard")
+    def prerender_dashboard() -> None:
+        """
+        Dashboard outputs of the new data version are rendered for serving mode.
+        """
+        dashboard = import_dashboard()
+        dashboard.main(
+            load_config(
+                overrides=[
+                    "dash.prerender.render=True",
+                    "dash.refresh.enabled=False",
+                ]
+            )
+        )
+
+    extracted = update_statistics.expand(partition=get_partitions())
+    joined = join_extracted_leagues(extracted=extracted)
+    update_aggregations(partitions=joined) >> prerender_dashboard()
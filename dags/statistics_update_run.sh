@@ -1,3 +0,0 @@
-#!/bin/bash
-
-python3 ~/soccer_api/src/data_extraction.py data_extraction.first_run=False && echo Statistics are updated!
\ No newline at end of file
@@ -1,123 +1,133 @@
 import dash_bootstrap_components as dbc
 import hydra
-import numpy as np
-import pandas as pd
 import plotly.graph_objects as go
-from dash import Dash, Input, Output, callback
+from dash import Dash, Input, Output, State, callback, clientside_callback
 from dash import dash_table as dt
-from dash import dcc, html
+from dash import dcc, html, no_update
 from omegaconf import DictConfig
-from plotly.subplots import make_subplots
 
 import src.database_connection as database_connection
-from utils_dash.utils_aggregations import (create_aggregated_cards_plot,
-                                           create_aggregated_cleansheets_plot,
-                                           create_aggregated_goals_plot)
-from utils_dash.utils_h2h import create_barplot
-from utils_dash.utils_statistics import (create_cards_boxplot,
-                                         create_cleansheets_boxplot,
-                                         create_goals_distribution,
-                                         create_lineups_boxplot,
-                                         create_penalties_boxplot)
-from utils_dash.utils_tables import (create_results_boxplot,
-                                     create_standings_boxplot)
-
-
-def filter_max_date(data: pd.DataFrame) -> pd.DataFrame:
-    """
-    Фильтрация данных по максимальной дате экстракции статистики.
-
-    :param data: pd.DataFrame со статистикой
-
-    :return: pd.DataFrame
-    """
-    max_date = data.groupby(["season"])["time_extraction"].max().reset_index()
-
-    data = data.merge(max_date, on=["season", "time_extraction"]).reset_index(drop=True)
-
-    return data
-
-
-def get_data(table_name, db_connection):
-    """"""
-    data = db_connection.query(
-        f"""
-        select * from {table_name}
-        """
-    )
-
-    return data
+from utils_dash.utils_aggregations import (
+    create_aggregated_cards_plot,
+    create_aggregated_cleansheets_plot,
+    create_aggregated_goals_plot,
+)
+from utils_dash.utils_api import create_api_blueprint
+from utils_dash.utils_data import DashboardData, DataRefresher
+from utils_dash.utils_h2h import (
+    CARDS_TRACES,
+    GOALS_TRACES,
+    RESULTS_TRACES,
+    create_cards_comparison,
+    create_goals_comparison,
+    create_h2h_matrices,
+    create_points_comparison,
+    create_results_comparison,
+    diff_teams,
+    gather_h2h_statistics,
+    patch_comparison,
+    patch_points_comparison,
+)
+from utils_dash.utils_payloads import create_tables_payloads
+from utils_dash.utils_poisson import create_predictions, fit_leagues
+from utils_dash.utils_prerender import (
+    Prerender,
+    leagues_space,
+    season_league_space,
+    team_space,
+)
+from utils_dash.utils_projection import (
+    has_remaining_games,
+    project_season,
+    project_seasons,
+)
+from utils_dash.utils_similarity import SimilarityIndex
+from utils_dash.utils_singleflight import SingleFlight, coalesce
+from utils_dash.utils_statistics import (
+    create_cards_boxplot,
+    create_cleansheets_boxplot,
+    create_goals_distribution,
+    create_lineups_boxplot,
+    create_penalties_boxplot,
+)
+from utils_dash.utils_tables import create_progression_plot
+
+# columns of standings progression plot (filter_progression_column)
+PROGRESSION_COLUMNS = ["rank", "points", "goals_diff"]
 
 
 @hydra.main(version_base=None, config_path="./conf", config_name="configs")
 def main(cfg: DictConfig):
     """"""
-    # db connection
-    mydb = database_connection.SoccerDatabase(
+    # db connections pool: tables are loaded concurrently
+    mydb = database_connection.SoccerDatabasePool(
         host=cfg["db"]["host"],
         database=cfg["db"]["database"],
         user=cfg["db"]["user"],
         password=cfg["db"]["password"],
         port=cfg["db"]["port"],
+        maxconn=cfg["dash"]["load_workers"],
     )
 
-    # get data
-    standings = get_data(table_name="standings", db_connection=mydb)
-    topscorers = get_data(table_name="topscorers", db_connection=mydb)
-    cards = get_data(table_name="cards", db_connection=mydb)
-    goals_distribution = get_data(table_name="goals", db_connection=mydb)
-    lineups = get_data(table_name="lineups", db_connection=mydb)
-    penalties = get_data(table_name="penalties", db_connection=mydb)
-    cleansheets = get_data(table_name="cleansheets", db_connection=mydb)
-    # aggregations
-    cards_aggregations = get_data(table_name="cards_aggregations", db_connection=mydb)
-    cleansheets_aggregations = get_data(
-        table_name="cleansheets_aggregations", db_connection=mydb
-    )
-    goals_aggregations = get_data(table_name="goals_aggregations", db_connection=mydb)
+    # get data: last snapshot of each season & league
+    data = DashboardData(redundant_columns=cfg["dash"]["redundant_columns"])
+    data.load(db_connection=mydb, max_workers=cfg["dash"]["load_workers"])
 
-    # keep only max date of data extraction for each season
-    standings = filter_max_date(data=standings).drop(
-        cfg["dash"]["redundant_columns"] + ["description"], axis=1
-    )
-    topscorers = filter_max_date(data=topscorers).drop(
-        cfg["dash"]["redundant_columns"], axis=1
-    )
-    cards = filter_max_date(data=cards).drop(cfg["dash"]["redundant_columns"], axis=1)
-    goals_distribution = filter_max_date(data=goals_distribution).drop(
-        cfg["dash"]["redundant_columns"], axis=1
-    )
-    lineups = filter_max_date(data=lineups).drop(
-        cfg["dash"]["redundant_columns"], axis=1
-    )
-    penalties = filter_max_date(data=penalties).drop(
-        cfg["dash"]["redundant_columns"], axis=1
-    )
-    cleansheets = filter_max_date(data=cleansheets).drop(
-        cfg["dash"]["redundant_columns"], axis=1
-    )
-    # aggregations
-    redundant_columns = list(
-        set(cfg["dash"]["redundant_columns"]) - set(["date_extraction"])
-    )
-    cards_aggregations = filter_max_date(data=cards_aggregations).drop(
-        redundant_columns, axis=1
-    )
-    cleansheets_aggregations = filter_max_date(data=cleansheets_aggregations).drop(
-        redundant_columns, axis=1
-    )
-    goals_aggregations = filter_max_date(data=goals_aggregations).drop(
-        redundant_columns, axis=1
-    )
+    # pool stays open for as-of queries of historical snapshots
 
-    mydb.close()
+    # nearest teams by statistical profiles of all seasons & leagues
+    similarity = SimilarityIndex()
+    similarity.sync(data=data)
 
-    # available seasons and leagues
-    seasons = standings["season"].unique().tolist()
-    leagues = standings["league"].unique().tolist()
+    # post-ETL render stage forks workers from this process: no background threads
+    # and DB connections are started for it
+    render = cfg["dash"]["prerender"]["render"]
+
+    # reload changed seasons & leagues after new loads without restart
+    if cfg["dash"]["refresh"]["enabled"] and not render:
+        DataRefresher(
+            data=data, db=cfg["db"], interval=cfg["dash"]["refresh"]["interval"]
+        ).start()
+
+    # identical concurrent callbacks (same inputs & data version) are computed once
+    singleflight = None
+    if cfg["dash"]["singleflight"]["enabled"]:
+        singleflight = SingleFlight(
+            path=cfg["dash"]["singleflight"]["path"],
+            ttl=cfg["dash"]["singleflight"]["ttl"],
+        )
+    coalesced = coalesce(singleflight=singleflight, version=lambda: data.version)
+
+    # outputs rendered for all inputs after ETL (dash.prerender.render=True)
+    prerender = Prerender(
+        path=cfg["dash"]["prerender"]["path"],
+        version=lambda: data.version,
+        serve=cfg["dash"]["prerender"]["serve"],
+    )
 
     app = Dash(suppress_callback_exceptions=True)
 
+    # read-only JSON/Arrow API over the same data for other services
+    if cfg["dash"]["api"]["enabled"] and not render:
+        app.server.register_blueprint(
+            create_api_blueprint(
+                data=data,
+                # long exports wait for their own connections, not the callbacks' ones
+                db_connection=database_connection.SoccerDatabasePool(
+                    host=cfg["db"]["host"],
+                    database=cfg["db"]["database"],
+                    user=cfg["db"]["user"],
+                    password=cfg["db"]["password"],
+                    port=cfg["db"]["port"],
+                    maxconn=cfg["dash"]["api"]["export_connections"],
+                ),
+                export_tables=cfg["export"]["tables"],
+                max_age=cfg["dash"]["api"]["max_age"],
+                compress_min_size=cfg["dash"]["api"]["compress_min_size"],
+            ),
+            url_prefix="/api/v1",
+        )
+
     SIDEBAR_STYLE = {
         "position": "fixed",
         "top": 110,
@@ -183,333 +193,526 @@ def main(cfg: DictConfig):
         ],
     )
 
-    dropdown_seasons = html.Div(
-        [
-            "Season",
-            dcc.Dropdown(
-                id="filter_seasons",
-                options=[{"label": ss, "value": ss} for ss in seasons],
-                placeholder="Select Season",
-                multi=False,
-                value=seasons[-1],
-            ),
-        ]
-    )
+    def create_pages() -> dict:
+        """
+        Dashboard pages built from current data.
+        """
+        standings = data["standings"]
+        cards = data["cards"]
 
-    dropdown_leagues = html.Div(
-        [
-            "League",
-            dcc.Dropdown(
-                id="filter_leagues",
-                options=[{"label": league, "value": league} for league in leagues],
-                placeholder="Select League",
-                multi=False,
-                value=leagues[2],
-            ),
-        ]
-    )
+        # available seasons and leagues
+        seasons = sorted(standings["season"].unique().tolist())
+        leagues = standings["league"].unique().tolist()
 
-    dropdown_teams = html.Div(
-        [
-            "Team",
-            dcc.Dropdown(id="filter_teams", placeholder="Select Team", multi=False),
-        ]
-    )
-    dropdown_multiple_teams = html.Div(
-        [
-            "Teams",
-            dcc.Dropdown(
-                id="filter_multiple_teams", placeholder="Select Teams", multi=True
-            ),
-        ]
-    )
-    dropdown_multiple_leagues = html.Div(
-        [
-            "Leagues",
-            dcc.Dropdown(
-                id="filter_multiple_leagues",
-                placeholder="Select Leagues",
-                multi=True,
-                options=[{"label": league, "value": league} for league in leagues],
-            ),
-        ]
-    )
+        dropdown_seasons = html.Div(
+            [
+                "Season",
+                dcc.Dropdown(
+                    id="filter_seasons",
+                    options=[{"label": ss, "value": ss} for ss in seasons],
+                    placeholder="Select Season",
+                    multi=False,
+                    value=seasons[-1],
+                ),
+            ]
+        )
 
-    # standings & topscorers
-    tables = html.Div(
-        children=[
-            dcc.Markdown(children="# Tables"),
-            dcc.Markdown("### Standigs and Topscorers by leagues and seasons."),
-            dcc.Markdown(children="*Select Season and League*"),
-            dropdown_seasons,
-            dropdown_leagues,
-            dcc.Markdown(children="\n## Teams Standings"),
-            dt.DataTable(
-                id="table-standings",
-                columns=[
-                    {"name": col, "id": col, "deletable": True}
-                    for col in standings.columns
-                ],
-                data=standings.to_dict("records"),
-                filter_action="native",
-                sort_action="native",
-                row_deletable=True,
-                page_action="native",
-                page_current=0,
-                page_size=10,
-                style_as_list_view=True,
-                style_header={"fontWeight": "bold"},
-                style_data_conditional=[
-                    {
-                        "if": {"filter_query": "{points} > 0", "column_id": "points"},
-                        "color": "tomato",
-                        "fontWeight": "bold",
-                    }
-                ],
-            ),
-            dcc.Graph(id="display_standings", style={"height": 250}),
-            dcc.Graph(id="display_results", style={"height": 250}),
-            dcc.Markdown(children="\n## Top Scorers"),
-            dt.DataTable(
-                id="table-topscorers",
-                columns=[
-                    {"name": col, "id": col, "deletable": True}
-                    for col in topscorers.columns
-                ],
-                data=topscorers.to_dict("records"),
-                filter_action="native",
-                sort_action="native",
-                row_deletable=True,
-                page_action="native",
-                page_current=0,
-                page_size=10,
-                style_as_list_view=True,
-                style_header={"fontWeight": "bold"},
-                style_data_conditional=[
-                    {
-                        "if": {"filter_query": "{goals} > 0", "column_id": "goals"},
-                        "color": "tomato",
-                        "fontWeight": "bold",
-                    }
-                ],
-            ),
-            html.Div(id="display_topscorers"),
-        ]
-    )
+        dropdown_leagues = html.Div(
+            [
+                "League",
+                dcc.Dropdown(
+                    id="filter_leagues",
+                    options=[{"label": league, "value": league} for league in leagues],
+                    placeholder="Select League",
+                    multi=False,
+                    value=leagues[2],
+                ),
+            ]
+        )
+
+        date_picker_as_of = html.Div(
+            [
+                "As of",
+                html.Br(),
+                dcc.DatePickerSingle(
+                    id="filter_as_of",
+                    placeholder="Latest",
+                    display_format="YYYY-MM-DD",
+                    clearable=True,
+                ),
+            ]
+        )
+
+        dropdown_teams = html.Div(
+            [
+                "Team",
+                dcc.Dropdown(id="filter_teams", placeholder="Select Team", multi=False),
+            ]
+        )
+        dropdown_multiple_teams = html.Div(
+            [
+                "Teams",
+                dcc.Dropdown(
+                    id="filter_multiple_teams", placeholder="Select Teams", multi=True
+                ),
+            ]
+        )
+        dropdown_multiple_leagues = html.Div(
+            [
+                "Leagues",
+                dcc.Dropdown(
+                    id="filter_multiple_leagues",
+                    placeholder="Select Leagues",
+                    multi=True,
+                    options=[{"label": league, "value": league} for league in leagues],
+                ),
+            ]
+        )
 
-    # STATISTICS
+        # standings & topscorers
+        tables = html.Div(
+            children=[
+                dcc.Markdown(children="# Tables"),
+                dcc.Markdown("### Standigs and Topscorers by leagues and seasons."),
+                dcc.Markdown(children="*Select Season and League*"),
+                dropdown_seasons,
+                dropdown_leagues,
+                date_picker_as_of,
+                dcc.Markdown(children="\n## Teams Standings"),
+                dt.DataTable(
+                    id="table-standings",
+                    columns=[
+                        {"name": col, "id": col, "deletable": True}
+                        for col in standings.columns
+                    ],
+                    data=[],
+                    filter_action="native",
+                    sort_action="native",
+                    row_deletable=True,
+                    page_action="native",
+                    page_current=0,
+                    page_size=10,
+                    style_as_list_view=True,
+                    style_header={"fontWeight": "bold"},
+                    style_data_conditional=[
+                        {
+                            "if": {
+                                "filter_query": "{points} > 0",
+                                "column_id": "points",
+                            },
+                            "color": "tomato",
+                            "fontWeight": "bold",
+                        }
+                    ],
+                ),
+                dcc.Graph(id="display_standings", style={"height": 250}),
+                dcc.Graph(id="display_results", style={"height": 250}),
+                dcc.Markdown(children="\n## Season Progression"),
+                dcc.RadioItems(
+                    id="filter_progression_column",
+                    options=PROGRESSION_COLUMNS,
+                    value="rank",
+                    inline=True,
+                ),
+                dcc.Graph(id="display_standings_progression"),
+                dcc.Markdown(children="\n## Season Projection"),
+                dcc.Markdown(
+                    children="*Title, top-4 and relegation probabilities "
+                    "by Monte Carlo simulation of remaining games*"
+                ),
+                dt.DataTable(
+                    id="table-projection",
+                    columns=[
+                        {"name": col, "id": col}
+                        for col in [
+                            "team",
+                            "points",
+                            "expected_points",
+                            "title",
+                            "top",
+                            "relegation",
+                        ]
+                    ],
+                    data=[],
+                    sort_action="native",
+                    page_action="native",
+                    page_current=0,
+                    page_size=10,
+                    style_as_list_view=True,
+                    style_header={"fontWeight": "bold"},
+                ),
+                dcc.Markdown(children="\n## Top Scorers"),
+                dt.DataTable(
+                    id="table-topscorers",
+                    columns=[
+                        {"name": col, "id": col, "deletable": True}
+                        for col in data["topscorers"].columns
+                    ],
+                    data=[],
+                    filter_action="native",
+                    sort_action="native",
+                    row_deletable=True,
+                    page_action="native",
+                    page_current=0,
+                    page_size=10,
+                    style_as_list_view=True,
+                    style_header={"fontWeight": "bold"},
+                    style_data_conditional=[
+                        {
+                            "if": {"filter_query": "{goals} > 0", "column_id": "goals"},
+                            "color": "tomato",
+                            "fontWeight": "bold",
+                        }
+                    ],
+                ),
+                dcc.Graph(id="display_topscorers_min_per_goal", style={"height": 250}),
+                dcc.Graph(
+                    id="display_topscorers_shots_per_goal", style={"height": 250}
+                ),
+            ]
+        )
 
-    goals_distribution_graph = dcc.Graph(id="display_goals_distribution")
+        # STATISTICS
 
-    cleansheets_graph = html.Div(
-        children=[dcc.Graph(id="display_cleansheets")],
-        style={"display": "inline-block"},
-    )
-    penalties_graph = html.Div(
-        children=[dcc.Graph(id="display_penalties")], style={"display": "inline-block"}
-    )
-    cards_grapth = html.Div(
-        children=[dcc.Graph(id="display_cards")], style={"display": "inline-block"}
-    )
-    lineups_graph = html.Div(
-        children=[dcc.Graph(id="display_lineups")], style={"display": "inline-block"}
-    )
+        goals_distribution_graph = dcc.Graph(id="display_goals_distribution")
 
-    page_statistics = html.Div(
-        children=[
-            dcc.Markdown(children="# Statistics"),
-            dcc.Markdown(children="### Statistics of individual teams by seasons"),
-            dcc.Markdown(children="*Select Season, League & Team*"),
-            dropdown_seasons,
-            dropdown_leagues,
-            dropdown_teams,
-            goals_distribution_graph,
-            html.Hr(),
-            html.Div(children=[cards_grapth, lineups_graph]),
-            html.Hr(),
-            html.Div(children=[cleansheets_graph, penalties_graph]),
-        ]
-    )
+        cleansheets_graph = html.Div(
+            children=[dcc.Graph(id="display_cleansheets")],
+            style={"display": "inline-block"},
+        )
+        penalties_graph = html.Div(
+            children=[dcc.Graph(id="display_penalties")],
+            style={"display": "inline-block"},
+        )
+        cards_grapth = html.Div(
+            children=[dcc.Graph(id="display_cards")], style={"display": "inline-block"}
+        )
+        lineups_graph = html.Div(
+            children=[dcc.Graph(id="display_lineups")],
+            style={"display": "inline-block"},
+        )
 
-    # H2H
+        page_statistics = html.Div(
+            children=[
+                dcc.Markdown(children="# Statistics"),
+                dcc.Markdown(children="### Statistics of individual teams by seasons"),
+                dcc.Markdown(children="*Select Season, League & Team*"),
+                dropdown_seasons,
+                dropdown_leagues,
+                date_picker_as_of,
+                dropdown_teams,
+                goals_distribution_graph,
+                html.Hr(),
+                html.Div(children=[cards_grapth, lineups_graph]),
+                html.Hr(),
+                html.Div(children=[cleansheets_graph, penalties_graph]),
+                html.Hr(),
+                dcc.Markdown(children="\n## Similar Teams"),
+                dcc.Markdown(
+                    children="*Teams of all seasons & leagues with the closest "
+                    "goals, cards, formations, clean sheets and penalties profile*"
+                ),
+                dt.DataTable(
+                    id="table-similar-teams",
+                    columns=[
+                        {"name": col, "id": col}
+                        for col in ["season", "league", "team", "similarity"]
+                    ],
+                    data=[],
+                    style_as_list_view=True,
+                    style_header={"fontWeight": "bold"},
+                ),
+            ]
+        )
 
-    comparison_points = dcc.Graph(id="display_comparison_points")
-    slider_seasons = html.Div(
-        children=[
-            html.Label("Season"),
-            dcc.Slider(
-                cards["season"].min(),
-                cards["season"].max(),
-                step=None,
-                value=cards["season"].max(),
-                marks={str(year): str(year) for year in cards["season"].unique()},
-                id="slider_seasons",
-            ),
-        ]
-    )
-    comparison_results = dbc.Row([dcc.Graph(id="display_comparison_results")])
-    comparison_goals = dbc.Row([dcc.Graph(id="display_comparison_goals")])
-    comparison_cards = dbc.Row([dcc.Graph(id="display_comparison_cards")])
+        # H2H
+
+        comparison_points = dcc.Graph(id="display_comparison_points")
+        slider_seasons = html.Div(
+            children=[
+                html.Label("Season"),
+                dcc.Slider(
+                    cards["season"].min(),
+                    cards["season"].max(),
+                    step=None,
+                    value=cards["season"].max(),
+                    marks={str(year): str(year) for year in cards["season"].unique()},
+                    id="slider_seasons",
+                ),
+            ]
+        )
+        comparison_results = dbc.Row([dcc.Graph(id="display_comparison_results")])
+        comparison_goals = dbc.Row([dcc.Graph(id="display_comparison_goals")])
+        comparison_cards = dbc.Row([dcc.Graph(id="display_comparison_cards")])
+        comparison_progression = dbc.Row(
+            [dcc.Graph(id="display_comparison_progression")]
+        )
 
-    page_h2h = html.Div(
-        children=[
-            dcc.Markdown(children="# Head to Head Statistics"),
-            dcc.Markdown(children="### Statistics comparison of multiple teams"),
-            dcc.Markdown(children="*Select League, Teams & Season*"),
-            dropdown_leagues,
-            dropdown_multiple_teams,
-            slider_seasons,
-            comparison_results,
-            comparison_points,
-            comparison_goals,
-            comparison_cards,
-        ]
-    )
+        comparison_predictions = html.Div(
+            children=[
+                dcc.Markdown(children="\n## Match Predictions"),
+                dcc.Markdown(
+                    children="*Poisson model of scored/missed goals, neutral venue*"
+                ),
+                dt.DataTable(
+                    id="table-comparison-predictions",
+                    columns=[
+                        {"name": col, "id": col}
+                        for col in [
+                            "team",
+                            "opponent",
+                            "xg",
+                            "xg_opponent",
+                            "win",
+                            "draw",
+                            "lose",
+                            "score",
+                        ]
+                    ],
+                    data=[],
+                    sort_action="native",
+                    page_action="native",
+                    page_current=0,
+                    page_size=10,
+                    style_as_list_view=True,
+                    style_header={"fontWeight": "bold"},
+                ),
+            ]
+        )
 
-    # LEAGUES AGGREGATIONS
+        page_h2h = html.Div(
+            children=[
+                dcc.Markdown(children="# Head to Head Statistics"),
+                dcc.Markdown(children="### Statistics comparison of multiple teams"),
+                dcc.Markdown(children="*Select League, Teams & Season*"),
+                dropdown_leagues,
+                dropdown_multiple_teams,
+                slider_seasons,
+                comparison_results,
+                comparison_predictions,
+                comparison_points,
+                comparison_progression,
+                comparison_goals,
+                comparison_cards,
+                dcc.Store(id="store_h2h_selection"),
+            ]
+        )
 
-    goals_aggregations_graph_sum = dcc.Graph(id="display_goals_aggregations_graph_sum")
-    goals_aggregations_graph_mean = dcc.Graph(
-        id="display_goals_aggregations_graph_mean"
-    )
-    cards_aggregations_graph_sum = html.Div(
-        children=[dcc.Graph(id="display_cards_aggregations_graph_sum")],
-        style={"display": "inline-block"},
-    )
-    cards_aggregations_graph_mean = html.Div(
-        children=[dcc.Graph(id="display_cards_aggregations_graph_mean")],
-        style={"display": "inline-block"},
-    )
-    cleansheets_aggregations_graph = html.Div(
-        children=[dcc.Graph(id="display_cleansheets_aggregations_graph")],
-        style={"display": "inline-block"},
-    )
+        # LEAGUES AGGREGATIONS
 
-    # dcc.Graph(id="display_cleansheets_aggregations_graph")
+        goals_aggregations_graph_sum = dcc.Graph(
+            id="display_goals_aggregations_graph_sum"
+        )
+        goals_aggregations_graph_mean = dcc.Graph(
+            id="display_goals_aggregations_graph_mean"
+        )
+        cards_aggregations_graph_sum = html.Div(
+            children=[dcc.Graph(id="display_cards_aggregations_graph_sum")],
+            style={"display": "inline-block"},
+        )
+        cards_aggregations_graph_mean = html.Div(
+            children=[dcc.Graph(id="display_cards_aggregations_graph_mean")],
+            style={"display": "inline-block"},
+        )
+        cleansheets_aggregations_graph = html.Div(
+            children=[dcc.Graph(id="display_cleansheets_aggregations_graph")],
+            style={"display": "inline-block"},
+        )
 
-    page_leagues = html.Div(
-        children=[
-            dcc.Markdown(children="# Leagues Aggregated Statistics"),
-            dcc.Markdown(
-                children="### Multiple leagues aggregated statistics comparison"
-            ),
-            dcc.Markdown(children="*Select Leagues & Season*"),
-            dropdown_multiple_leagues,
-            goals_aggregations_graph_sum,
-            goals_aggregations_graph_mean,
-            html.Hr(),
-            slider_seasons,
-            html.Div(
-                children=[cards_aggregations_graph_sum, cards_aggregations_graph_mean]
-            ),
-            cleansheets_aggregations_graph,
-        ]
-    )
+        # dcc.Graph(id="display_cleansheets_aggregations_graph")
+
+        page_leagues = html.Div(
+            children=[
+                dcc.Markdown(children="# Leagues Aggregated Statistics"),
+                dcc.Markdown(
+                    children="### Multiple leagues aggregated statistics comparison"
+                ),
+                dcc.Markdown(children="*Select Leagues & Season*"),
+                dropdown_multiple_leagues,
+                goals_aggregations_graph_sum,
+                goals_aggregations_graph_mean,
+                html.Hr(),
+                slider_seasons,
+                html.Div(
+                    children=[
+                        cards_aggregations_graph_sum,
+                        cards_aggregations_graph_mean,
+                    ]
+                ),
+                cleansheets_aggregations_graph,
+            ]
+        )
+
+        return {
+            "/": tables,
+            "/page-1": page_statistics,
+            "/page-2": page_h2h,
+            "/page-3": page_leagues,
+        }
 
     content = html.Div(id="page-content", style=CONTENT_STYLE)
 
-    app.layout = html.Div(children=[dcc.Location(id="url"), head, sidebar, content])
+    # pre-serialized Tables page figures, picked in the browser by clientside callback
+    def create_payloads(data: DashboardData) -> dict:
+        return create_tables_payloads(
+            standings_slices=data.state.slices["standings"],
+            topscorers_slices=data.state.slices["topscorers"],
+            **cfg["dash"]["colors"],
+        )
 
-    # STANDINGS
+    def serve_layout():
+        store_tables_figures = dcc.Store(
+            id="store_tables_figures",
+            data=data.cached(name="tables_payloads", builder=create_payloads),
+        )
 
-    # table
+        return html.Div(
+            children=[
+                dcc.Location(id="url"),
+                store_tables_figures,
+                dcc.Store(id="store_tables_as_of_figures"),
+                head,
+                sidebar,
+                content,
+            ]
+        )
+
+    # layout is served on every page load, so it picks up refreshed data
+    app.layout = serve_layout
+
+    # TABLES callbacks
 
     @callback(
         Output("table-standings", "data"),
+        Output("table-topscorers", "data"),
+        Output("store_tables_as_of_figures", "data"),
         Input("filter_seasons", "value"),
         Input("filter_leagues", "value"),
+        Input("filter_as_of", "date"),
     )
-    def display_standings(season, league):
-        dff = standings[
-            (standings["season"].isin([season])) & (standings["league"].isin([league]))
-        ]
+    @prerender.register(
+        space=lambda data: [(*key, None) for key in season_league_space(data)]
+    )
+    @coalesced
+    def display_tables(season, league, as_of):
+        if season is None or league is None:
+            return [no_update] * 3
+
+        dff_standings = data.get_slice_as_of("standings", season, league, as_of, mydb)
+        dff_topscorers = data.get_slice_as_of("topscorers", season, league, as_of, mydb)
+
+        # historical figures are built on demand, latest ones are pre-serialized
+        as_of_payloads = None
+        if as_of is not None:
+            as_of_payloads = create_tables_payloads(
+                standings_slices={(season, league): dff_standings},
+                topscorers_slices={(season, league): dff_topscorers},
+                **cfg["dash"]["colors"],
+            )
 
-        return dff.to_dict("records")
+        return [
+            dff_standings.to_dict("records"),
+            dff_topscorers.to_dict("records"),
+            as_of_payloads,
+        ]
 
-    # scored/missed goals
+    # scored/missed goals, win/lose & topscorers barplots
 
-    @callback(
+    clientside_callback(
+        """
+        function(season, league, as_of, payloads, as_of_payloads) {
+            if (season == null || league == null || !payloads) {
+                return Array(4).fill(window.dash_clientside.no_update);
+            }
+            // historical figures come from server callback when date is picked
+            if (as_of != null && !as_of_payloads) {
+                return Array(4).fill(window.dash_clientside.no_update);
+            }
+            const payload = (as_of != null ? as_of_payloads : payloads)[season + "|" + league];
+
+            return ["standings", "results", "min_per_goal", "shots_per_goal"].map(
+                (name) => payload ? JSON.parse(payload[name]) : {data: [], layout: {}}
+            );
+        }
+        """,
         Output("display_standings", "figure"),
+        Output("display_results", "figure"),
+        Output("display_topscorers_min_per_goal", "figure"),
+        Output("display_topscorers_shots_per_goal", "figure"),
         Input("filter_seasons", "value"),
         Input("filter_leagues", "value"),
+        Input("filter_as_of", "date"),
+        Input("store_tables_figures", "data"),
+        Input("store_tables_as_of_figures", "data"),
     )
-    def visualize_standings(season, league):
-        dff = standings[
-            (standings["season"].isin([season])) & (standings["league"].isin([league]))
-        ].reset_index(drop=True)
-
-        fig = create_standings_boxplot(data=dff, **cfg["dash"]["colors"])
 
-        return fig
-
-    # win/lose
+    # rank/points progression through season from precomputed standings_progression
 
     @callback(
-        Output("display_results", "figure"),
+        Output("display_standings_progression", "figure"),
         Input("filter_seasons", "value"),
         Input("filter_leagues", "value"),
+        Input("filter_as_of", "date"),
+        Input("filter_progression_column", "value"),
     )
-    def visualize_results(season, league):
-        dff = standings[
-            (standings["season"].isin([season])) & (standings["league"].isin([league]))
-        ].reset_index(drop=True)
-
-        fig = create_results_boxplot(data=dff, **cfg["dash"]["colors"])
+    @prerender.register(
+        space=lambda data: [
+            (*key, None, column)
+            for key in season_league_space(data)
+            for column in PROGRESSION_COLUMNS
+        ]
+    )
+    @coalesced
+    def display_standings_progression(season, league, as_of, column):
+        if season is None or league is None:
+            return no_update
+
+        return create_progression_plot(
+            data=data.get_slice("standings_progression", season, league),
+            column=column,
+            as_of=as_of,
+            **cfg["dash"]["colors"],
+        )
 
-        return fig
+    # title/top-4/relegation probabilities of unfinished seasons
 
-    # TOPSCORERS
+    def create_projections(data: DashboardData) -> dict:
+        return project_seasons(
+            standings_slices=data.state.slices["standings"],
+            # forking a threaded server may copy held locks into workers
+            start_method="fork" if render else "spawn",
+            **cfg["dash"]["projection"],
+        )
 
     @callback(
-        Output("table-topscorers", "data"),
+        Output("table-projection", "data"),
         Input("filter_seasons", "value"),
         Input("filter_leagues", "value"),
+        Input("filter_as_of", "date"),
     )
-    def display_topscorers_table(season, league):
-        dff = topscorers[
-            (topscorers["season"].isin([season]))
-            & (topscorers["league"].isin([league]))
-        ]
+    @prerender.register(
+        space=lambda data: [(*key, None) for key in season_league_space(data)]
+    )
+    @coalesced
+    def display_projection(season, league, as_of):
+        if season is None or league is None:
+            return no_update
 
-        return dff.to_dict("records")
+        # latest projections are computed once per data version for all leagues
+        if as_of is None:
+            projections = data.cached(name="projections", builder=create_projections)
+            projection = projections.get((season, league))
 
-    # barplots
+            return [] if projection is None else projection.to_dict("records")
 
-    @callback(
-        Output("display_topscorers", "children"),
-        Input("filter_seasons", "value"),
-        Input("filter_leagues", "value"),
-    )
-    def display_topscorers(season, league):
-        dff = topscorers[
-            (topscorers["season"].isin([season]))
-            & (topscorers["league"].isin([league]))
-        ]
+        dff_standings = data.get_slice_as_of("standings", season, league, as_of, mydb)
+        if dff_standings.empty or not has_remaining_games(dff_standings):
+            return []
 
-        return [
-            dcc.Graph(
-                figure={
-                    "data": [
-                        {
-                            "x": dff["player"],
-                            "y": dff[column],
-                            "type": "bar",
-                            "marker": {"color": cfg["dash"]["colors"]["agressive"]},
-                            "width": 0.3,
-                            "text": [np.round(i, 2) for i in dff[column].unique()],
-                        }
-                    ],
-                    "layout": {
-                        "xaxis": {"automargin": True},
-                        "yaxis": {"automargin": True, "title": {"text": column}},
-                        "height": 250,
-                        "margin": {"t": 10, "l": 10, "r": 10},
-                    },
-                },
-            )
-            for column in ["min_per_goal", "shots_per_goal"]
-            if column in dff
-        ]
+        return project_season(
+            standings=dff_standings,
+            simulations=cfg["dash"]["projection"]["simulations"],
+        ).to_dict("records")
 
     # STATISTICS callbacks
 
@@ -519,115 +722,89 @@ def main(cfg: DictConfig):
         Input("filter_leagues", "value"),
     )
     def set_teams_options(season, league):
-        dff = cards[(cards["season"].isin([season])) & (cards["league"].isin([league]))]
+        dff = data.get_slice("cards", season, league)
         available_teams = dff["team"].unique().tolist()
 
         return [{"label": i, "value": i} for i in available_teams]
 
-    # cards
+    # cards, goals, lineups, penalties & cleansheets distributions
 
     @callback(
         Output("display_cards", "figure"),
-        Input("filter_seasons", "value"),
-        Input("filter_leagues", "value"),
-        Input("filter_teams", "value"),
-    )
-    def visualise_cards(season, league, team):
-        dff = cards[
-            (cards["season"].isin([season]))
-            & (cards["league"].isin([league]))
-            & (cards["team"].isin([team]))
-        ]
-
-        fig = create_cards_boxplot(data=dff, **cfg)
-
-        return fig
-
-    # goals distribution
-
-    @callback(
         Output("display_goals_distribution", "figure"),
-        Input("filter_seasons", "value"),
-        Input("filter_leagues", "value"),
-        Input("filter_teams", "value"),
-    )
-    def visualise_goals_distribution(season, league, team):
-        dff = goals_distribution[
-            (goals_distribution["season"].isin([season]))
-            & (goals_distribution["league"].isin([league]))
-            & (goals_distribution["team"].isin([team]))
-        ]
-
-        fig = create_goals_distribution(data=dff, **cfg)
-
-        return fig
-
-    # lineups distribution
-
-    @callback(
         Output("display_lineups", "figure"),
-        Input("filter_seasons", "value"),
-        Input("filter_leagues", "value"),
-        Input("filter_teams", "value"),
-    )
-    def visualise_lineups(season, league, team):
-        fig = go.Figure()
-
-        if team:
-            dff = lineups[
-                (lineups["season"].isin([season]))
-                & (lineups["league"].isin([league]))
-                & (lineups["team"].isin([team]))
-            ]
-
-            fig = create_lineups_boxplot(data=dff, **cfg)
-
-            return fig
-        else:
-            return fig
-
-    # penalties distribution
-
-    @callback(
         Output("display_penalties", "figure"),
+        Output("display_cleansheets", "figure"),
         Input("filter_seasons", "value"),
         Input("filter_leagues", "value"),
         Input("filter_teams", "value"),
+        Input("filter_as_of", "date"),
     )
-    def visualise_penalties(season, league, team):
-        fig = go.Figure()
-
-        if team:
-            dff = penalties[
-                (penalties["season"].isin([season]))
-                & (penalties["league"].isin([league]))
-                & (penalties["team"].isin([team]))
-            ]
-
-            fig = create_penalties_boxplot(data=dff, **cfg)
+    @prerender.register(space=lambda data: [(*key, None) for key in team_space(data)])
+    @coalesced
+    def visualise_team_statistics(season, league, team, as_of):
+        if season is None or league is None:
+            return [no_update] * 5
+
+        if not team:
+            return [go.Figure()] * 5
+
+        dff = {
+            name: dff_slice[dff_slice["team"] == team]
+            for name, dff_slice in zip(
+                [
+                    "cards",
+                    "goals",
+                    "goals_totals",
+                    "lineups",
+                    "penalties",
+                    "cleansheets",
+                ],
+                [
+                    data.get_slice_as_of("cards", season, league, as_of, mydb),
+                    data.get_slice_as_of(
+                        "goals_distribution", season, league, as_of, mydb
+                    ),
+                    data.get_slice_as_of(
+                        "goals_aggregations", season, league, as_of, mydb
+                    ),
+                    data.get_slice_as_of("lineups", season, league, as_of, mydb),
+                    data.get_slice_as_of("penalties", season, league, as_of, mydb),
+                    data.get_slice_as_of("cleansheets", season, league, as_of, mydb),
+                ],
+            )
+        }
 
-            return fig
-        else:
-            return fig
+        return [
+            create_cards_boxplot(data=dff["cards"], **cfg),
+            create_goals_distribution(
+                data=dff["goals"], totals=dff["goals_totals"], **cfg
+            ),
+            create_lineups_boxplot(data=dff["lineups"], **cfg),
+            create_penalties_boxplot(data=dff["penalties"], **cfg),
+            create_cleansheets_boxplot(data=dff["cleansheets"], **cfg),
+        ]
 
-    # cleansheets distribution
+    # similar teams
 
     @callback(
-        Output("display_cleansheets", "figure"),
+        Output("table-similar-teams", "data"),
         Input("filter_seasons", "value"),
         Input("filter_leagues", "value"),
         Input("filter_teams", "value"),
     )
-    def visualise_cleansheets(season, league, team):
-        dff = cleansheets[
-            (cleansheets["season"].isin([season]))
-            & (cleansheets["league"].isin([league]))
-            & (cleansheets["team"].isin([team]))
-        ]
+    @prerender.register(space=team_space)
+    @coalesced
+    def display_similar_teams(season, league, team):
+        if season is None or league is None or not team:
+            return []
 
-        fig = create_cleansheets_boxplot(data=dff, **cfg)
+        # profiles of seasons & leagues reloaded by refresh are rebuilt here
+        similarity.sync(data=data)
 
-        return fig
+        return similarity.query(season=season, league=league, team=team).to_dict(
+            "records"
+        )
 
     # H2H callbacks
 
@@ -635,193 +812,140 @@ def main(cfg: DictConfig):
         Output("filter_multiple_teams", "options"), Input("filter_leagues", "value")
     )
     def set_h2h_teams_options(league):
+        cards = data["cards"]
         dff = cards[(cards["league"].isin([league]))]
         available_teams = dff["team"].unique().tolist()
 
         return [{"label": i, "value": i} for i in available_teams]
 
-    # points
+    # points, results, goals & cards comparison
 
-    @callback(
-        Output("display_comparison_points", "figure"),
-        [
-            Input("slider_seasons", "value"),
-            Input("filter_leagues", "value"),
-            Input("filter_multiple_teams", "value"),
-        ],
-    )
-    def visualise_comparison_points(season, league, teams):
-        fig_points = make_subplots(
-            rows=1, cols=1, specs=[[{"type": "bar"}]], horizontal_spacing=0.001
-        )
-
-        if teams:
-            for team in teams:
-                dff_standings = standings[
-                    (standings["season"].isin([season]))
-                    & (standings["league"].isin([league]))
-                    & (standings["team"].isin([team]))
-                ]
-
-                fig_points.add_trace(
-                    create_barplot(data=dff_standings, column="points", team=team)
-                )
-
-        fig_points.update_layout(
-            yaxis_title="points",
-            plot_bgcolor="white",
-            yaxis=dict(showgrid=True, gridcolor="lightgrey"),
-            title_text="Points comparison",
+    def create_matrices(data: DashboardData) -> dict:
+        return create_h2h_matrices(
+            standings_slices=data.state.slices["standings"],
+            goals_slices=data.state.slices["goals_aggregations"],
+            cards_slices=data.state.slices["cards_aggregations"],
         )
 
-        fig_points.update_traces(marker=dict(line=dict(color="#000000", width=0.75)))
-
-        return fig_points
-
-    # results comparison
-
     @callback(
+        Output("display_comparison_points", "figure"),
         Output("display_comparison_results", "figure"),
+        Output("display_comparison_goals", "figure"),
+        Output("display_comparison_cards", "figure"),
+        Output("store_h2h_selection", "data"),
         Input("slider_seasons", "value"),
         Input("filter_leagues", "value"),
         Input("filter_multiple_teams", "value"),
+        State("store_h2h_selection", "data"),
     )
-    def visualise_comparison_results(season, league, teams):
-        fig_results = go.Figure()
-
-        if teams:
-            dff_standings = standings[
-                (standings["season"].isin([season]))
-                & (standings["league"].isin([league]))
-                & (standings["team"].isin(teams))
+    def visualise_comparison(season, league, teams, selection):
+        teams = teams or []
+        selection = selection or {}
+
+        # team x statistic matrices of all leagues are built once per data version
+        matrices = data.cached(name="h2h_matrices", builder=create_matrices)
+        matrix = matrices.get((season, league))
+
+        # empty store (first call) or season or league changed: full render
+        difference = None
+        if (
+            selection.get("teams") is not None
+            and selection.get("season") == season
+            and selection.get("league") == league
+        ):
+            difference = diff_teams(previous=selection["teams"], current=teams)
+
+        new_selection = {"season": season, "league": league, "teams": teams}
+
+        if difference is None:
+            statistics = gather_h2h_statistics(matrix=matrix, teams=teams)
+
+            return [
+                create_points_comparison(statistics=statistics),
+                create_results_comparison(statistics=statistics),
+                create_goals_comparison(statistics=statistics),
+                create_cards_comparison(statistics=statistics),
+                new_selection,
             ]
 
-            for column, color in zip(
-                ["win", "draw", "lose"], ["#7BD190", "#E7E19B", "#E69CA5 "]
-            ):
-                fig_results.add_trace(
-                    go.Bar(
-                        y=dff_standings["team"],
-                        x=dff_standings[column],
-                        name=column,
-                        text=[i for i in dff_standings[column]],
-                        orientation="h",
-                        marker=dict(
-                            color=color, line=dict(color="#000000", width=0.75)
-                        ),
-                    )
-                )
-
-        fig_results.update_layout(
-            yaxis_title="teams",
-            plot_bgcolor="white",
-            yaxis=dict(showgrid=True, gridcolor="lightgrey"),
-            title_text="Results comparison",
-            barmode="stack",
-        )
-
-        return fig_results
-
-    # goals comparison
+        # teams added/removed: update only affected traces
+        removed, added = difference
+        statistics = gather_h2h_statistics(matrix=matrix, teams=added)
 
-    @callback(
-        Output("display_comparison_goals", "figure"),
-        [
-            Input("slider_seasons", "value"),
-            Input("filter_leagues", "value"),
-            Input("filter_multiple_teams", "value"),
-        ],
-    )
-    def visualise_comparison_goals(season, league, teams):
-        fig = make_subplots(
-            rows=1,
-            cols=2,
-            specs=[[{"type": "pie"}, {"type": "pie"}]],
-            horizontal_spacing=0.001,
-            subplot_titles=("scored", "missed"),
-        )
-
-        if teams:
-            dff_goals = goals_distribution[
-                (goals_distribution["season"].isin([season]))
-                & (goals_distribution["league"].isin([league]))
-                & (goals_distribution["team"].isin(teams))
-            ]
-            goals_sum = (
-                dff_goals.groupby(["direction", "team"])["goals"].sum().reset_index()
-            )
+        return [
+            patch_points_comparison(
+                statistics=statistics, removed=removed, added=added
+            ),
+            patch_comparison(
+                statistics=statistics,
+                removed=removed,
+                added=added,
+                columns=[column for column, _ in RESULTS_TRACES],
+                teams_axis="y",
+                values_axis="x",
+            ),
+            patch_comparison(
+                statistics=statistics,
+                removed=removed,
+                added=added,
+                columns=[direction for direction, _ in GOALS_TRACES],
+                teams_axis="labels",
+                values_axis="values",
+                with_text=False,
+            ),
+            patch_comparison(
+                statistics=statistics,
+                removed=removed,
+                added=added,
+                columns=[card for card, _ in CARDS_TRACES],
+                teams_axis="y",
+                values_axis="x",
+            ),
+            new_selection,
+        ]
 
-            for direction, col in zip(["for", "against"], [1, 2]):
-                fig.add_trace(
-                    go.Pie(
-                        labels=goals_sum[goals_sum["direction"] == direction]["team"],
-                        values=goals_sum[goals_sum["direction"] == direction]["goals"],
-                        name=str(direction),
-                    ),
-                    row=1,
-                    col=col,
-                )
-        fig.update_traces(
-            hole=0.5,
-            textposition="inside",
-            textinfo="value+percent",
-            marker=dict(line=dict(color="#000000", width=0.75)),
-        )
+    # points progression of selected teams
 
-        fig.update_layout(
-            yaxis_title="teams",
-            plot_bgcolor="white",
-            yaxis=dict(showgrid=True, gridcolor="lightgrey"),
-            title_text="Goals comparison",
+    @callback(
+        Output("display_comparison_progression", "figure"),
+        Input("slider_seasons", "value"),
+        Input("filter_leagues", "value"),
+        Input("filter_multiple_teams", "value"),
+    )
+    @coalesced
+    def visualise_progression_comparison(season, league, teams):
+        return create_progression_plot(
+            data=data.get_slice("standings_progression", season, league),
+            column="points",
+            teams=teams or [],
+            title="Points progression",
+            **cfg["dash"]["colors"],
         )
 
-        return fig
+    # score-line predictions of selected teams pairs
 
-    # cards comparison
+    def create_models(data: DashboardData) -> dict:
+        return fit_leagues(
+            standings_slices=data.state.slices["standings"],
+            goals_slices=data.state.slices["goals_aggregations"],
+        )
 
     @callback(
-        Output("display_comparison_cards", "figure"),
+        Output("table-comparison-predictions", "data"),
         Input("slider_seasons", "value"),
         Input("filter_leagues", "value"),
         Input("filter_multiple_teams", "value"),
     )
-    def visualise_comparison_cards(season, league, teams):
-        fig = go.Figure()
+    @coalesced
+    def visualise_predictions(season, league, teams):
+        # models of all leagues are fitted once per data version
+        models = data.cached(name="poisson_models", builder=create_models)
+        model = models.get((season, league))
 
-        if teams:
-            dff = cards[
-                (cards["season"].isin([season]))
-                & (cards["league"].isin([league]))
-                & (cards["team"].isin(teams))
-            ]
+        if model is None or not teams:
+            return []
 
-            cards_sum = dff.groupby(["color", "team"])["number"].sum().reset_index()
-
-            for card, color in zip(["yellow", "red"], ["#E7E19B", "#E69CA5"]):
-                fig.add_trace(
-                    go.Bar(
-                        y=cards_sum[cards_sum["color"] == card]["team"],
-                        x=cards_sum[cards_sum["color"] == card]["number"],
-                        name=card,
-                        text=[
-                            i for i in cards_sum[cards_sum["color"] == card]["number"]
-                        ],
-                        orientation="h",
-                        marker=dict(
-                            color=color, line=dict(color="#000000", width=0.75)
-                        ),
-                    )
-                )
-
-        fig.update_layout(
-            yaxis_title="teams",
-            plot_bgcolor="white",
-            yaxis=dict(showgrid=True, gridcolor="lightgrey"),
-            title_text="Cards comparison",
-            barmode="stack",
-        )
-
-        return fig
+        return create_predictions(model=model, teams=teams).to_dict("records")
 
     # LEAGUES callbacks
 
@@ -832,10 +956,15 @@ def main(cfg: DictConfig):
         Output("display_goals_aggregations_graph_mean", "figure"),
         [Input("filter_multiple_leagues", "value")],
     )
+    @prerender.register(
+        space=lambda data: [(leagues,) for leagues in leagues_space(data)]
+    )
+    @coalesced
     def visualise_aggregated_goals(leagues):
         fig = go.Figure()
 
         if leagues:
+            goals_aggregations = data["goals_aggregations"]
             dff = goals_aggregations[(goals_aggregations["league"].isin(leagues))]
 
             fig_sum, fig_mean = create_aggregated_goals_plot(dff)
@@ -852,10 +981,19 @@ def main(cfg: DictConfig):
         Output("display_cards_aggregations_graph_mean", "figure"),
         [Input("filter_multiple_leagues", "value"), Input("slider_seasons", "value")],
     )
+    @prerender.register(
+        space=lambda data: [
+            (leagues, season)
+            for leagues in leagues_space(data)
+            for season in data["standings"]["season"].unique().tolist()
+        ]
+    )
+    @coalesced
     def visualise_aggregated_cards(leagues, season):
         fig = go.Figure()
 
         if leagues:
+            cards_aggregations = data["cards_aggregations"]
             dff = cards_aggregations[
                 (cards_aggregations["league"].isin(leagues))
                 & (cards_aggregations["season"] == season)
@@ -874,10 +1012,19 @@ def main(cfg: DictConfig):
         Output("display_cleansheets_aggregations_graph", "figure"),
         [Input("filter_multiple_leagues", "value"), Input("slider_seasons", "value")],
     )
+    @prerender.register(
+        space=lambda data: [
+            (leagues, season)
+            for leagues in leagues_space(data)
+            for season in data["standings"]["season"].unique().tolist()
+        ]
+    )
+    @coalesced
     def visualise_aggregated_cleansheets(leagues, season):
         fig = go.Figure()
 
         if leagues:
+            cleansheets_aggregations = data["cleansheets_aggregations"]
             dff = cleansheets_aggregations[
                 (cleansheets_aggregations["league"].isin(leagues))
                 & (cleansheets_aggregations["season"] == season)
@@ -893,14 +1040,10 @@ def main(cfg: DictConfig):
 
     @app.callback(Output("page-content", "children"), [Input("url", "pathname")])
     def render_page_content(pathname):
-        if pathname == "/":
-            return html.Div(children=[tables])
-        elif pathname == "/page-1":
-            return html.Div(children=[page_statistics])
-        elif pathname == "/page-2":
-            return html.Div(children=[page_h2h])
-        elif pathname == "/page-3":
-            return html.Div(children=[page_leagues])
+        pages = create_pages()
+
+        if pathname in pages:
+            return html.Div(children=[pages[pathname]])
 
         # If the user tries to reach a different page, return a 404 message
         return html.Div(
@@ -912,6 +1055,12 @@ def main(cfg: DictConfig):
             className="p-3 bg-light rounded-3",
         )
 
+    # post-ETL stage: render all outputs and exit (rendered inputs don't query DB)
+    if render:
+        mydb.close()
+        prerender.render(data=data, processes=cfg["dash"]["prerender"]["processes"])
+        return
+
     app.run_server(debug=True, host="0.0.0.0", port="8050")
 
 
@@ -1,18 +1,21 @@
 --sum of cards by teams through seasons
 
-INSERT INTO cards_aggregations
+INSERT INTO cards_aggregations (team, team_id, league, league_id, season, color, sum_number, time_extraction)
 with max_time as (
 	select 
 		c.season, 
-		c.league,
+		c.league_id,
 		max(c.time_extraction) as max_time_extraction
 	from cards c
-	where c.season in (%s)
-	group by c.season, c.league
+	where c.season = %(season)s
+	and c.league_id = any(%(leagues)s)
+	group by c.season, c.league_id
 )
 select 
 	c.team, 
+	c.team_id, 
 	c.league, 
+	c.league_id, 
 	c.season,
 	c.color, 
 	sum(c.number) as sum_number,
@@ -20,6 +23,6 @@ select
 from cards c
 inner join max_time
 on max_time.season = c.season
-and max_time.league = c.league
+and max_time.league_id = c.league_id
 and max_time.max_time_extraction = c.time_extraction
-group by c.season, c.league, c.team, c.color, c.time_extraction
\ No newline at end of file
+group by c.season, c.league_id, c.league, c.team_id, c.team, c.color, c.time_extraction
\ No newline at end of file
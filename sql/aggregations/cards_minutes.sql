@@ -0,0 +1,29 @@
+--sum of cards by teams and minutes through seasons
+
+INSERT INTO cards_minutes_aggregations (team, team_id, league, league_id, season, color, minute, sum_number, time_extraction)
+with max_time as (
+	select 
+		c.season, 
+		c.league_id,
+		max(c.time_extraction) as max_time_extraction
+	from cards c
+	where c.season = %(season)s
+	and c.league_id = any(%(leagues)s)
+	group by c.season, c.league_id
+)
+select 
+	c.team, 
+	c.team_id, 
+	c.league, 
+	c.league_id, 
+	c.season,
+	c.color, 
+	c.minute,
+	sum(c.number) as sum_number,
+	now()::timestamp as time_extraction
+from cards c
+inner join max_time
+on max_time.season = c.season
+and max_time.league_id = c.league_id
+and max_time.max_time_extraction = c.time_extraction
+group by c.season, c.league_id, c.league, c.team_id, c.team, c.color, c.minute, c.time_extraction
\ No newline at end of file
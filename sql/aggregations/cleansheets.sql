@@ -1,24 +1,27 @@
 --sum of cleansheets by teams through seasons
 
-INSERT INTO cleansheets_aggregations
+INSERT INTO cleansheets_aggregations (team, team_id, league, league_id, season, sum_games, time_extraction)
 with max_time as (
 	select 
 		c.season, 
-		c.league,
+		c.league_id,
 		max(c.time_extraction) as max_time_extraction
 	from cleansheets c
-	where c.season in (%s)
-	group by c.season, c.league
+	where c.season = %(season)s
+	and c.league_id = any(%(leagues)s)
+	group by c.season, c.league_id
 )
 select 
 	c.team, 
+	c.team_id, 
 	c.league, 
+	c.league_id, 
 	c.season,
 	sum(c.games) as sum_games,
 	now()::timestamp as time_extraction
 from cleansheets c
 inner join max_time
 on max_time.season = c.season
-and max_time.league = c.league
+and max_time.league_id = c.league_id
 and max_time.max_time_extraction = c.time_extraction
-group by c.season, c.league, c.team, c.time_extraction
\ No newline at end of file
+group by c.season, c.league_id, c.league, c.team_id, c.team, c.time_extraction
\ No newline at end of file
@@ -1,18 +1,21 @@
 --sum of goals (for/against) by teams through seasons
 
-INSERT INTO goals_aggregations
+INSERT INTO goals_aggregations (team, team_id, league, league_id, season, direction, sum_goals, time_extraction)
 with max_time as (
 	select 
 		g.season, 
-		g.league,
+		g.league_id,
 		max(g.time_extraction) as max_time_extraction
 	from goals g
-	where g.season in (%s)
-	group by g.season, g.league
+	where g.season = %(season)s
+	and g.league_id = any(%(leagues)s)
+	group by g.season, g.league_id
 )
 select 
 	g.team, 
+	g.team_id, 
 	g.league, 
+	g.league_id, 
 	g.season,
 	g.direction,
 	sum(g.goals) as sum_goals,
@@ -20,6 +23,6 @@ select
 from goals g
 inner join max_time
 on max_time.season = g.season
-and max_time.league = g.league
+and max_time.league_id = g.league_id
 and max_time.max_time_extraction = g.time_extraction
-group by g.season, g.league, g.team, g.direction, g.time_extraction
\ No newline at end of file
+group by g.season, g.league_id, g.league, g.team_id, g.team, g.direction, g.time_extraction
\ No newline at end of file
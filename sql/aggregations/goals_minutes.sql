@@ -0,0 +1,29 @@
+--sum of goals (for/against) by teams and minutes through seasons
+
+INSERT INTO goals_minutes_aggregations (team, team_id, league, league_id, season, direction, minute, sum_goals, time_extraction)
+with max_time as (
+	select 
+		g.season, 
+		g.league_id,
+		max(g.time_extraction) as max_time_extraction
+	from goals g
+	where g.season = %(season)s
+	and g.league_id = any(%(leagues)s)
+	group by g.season, g.league_id
+)
+select 
+	g.team, 
+	g.team_id, 
+	g.league, 
+	g.league_id, 
+	g.season,
+	g.direction,
+	g.minute,
+	sum(g.goals) as sum_goals,
+	now()::timestamp as time_extraction
+from goals g
+inner join max_time
+on max_time.season = g.season
+and max_time.league_id = g.league_id
+and max_time.max_time_extraction = g.time_extraction
+group by g.season, g.league_id, g.league, g.team_id, g.team, g.direction, g.minute, g.time_extraction
\ No newline at end of file
@@ -0,0 +1,50 @@
+--standings of teams by extraction dates (last snapshot of every day) through seasons
+--only days since the last progression day are recomputed
+
+DELETE FROM standings_progression p
+WHERE p.season = %(season)s
+AND p.league_id = any(%(leagues)s)
+AND p.date_extraction >= (
+	select max(l.date_extraction)
+	from standings_progression l
+	where l.season = p.season
+	and l.league_id = p.league_id
+);
+
+INSERT INTO standings_progression (team, team_id, league, league_id, season, date_extraction, rank, points, played, goals_diff, form, time_extraction)
+with max_time as (
+	select 
+		s.season, 
+		s.league_id,
+		s.date_extraction,
+		max(s.time_extraction) as max_time_extraction
+	from standings s
+	where s.season = %(season)s
+	and s.league_id = any(%(leagues)s)
+	and not exists (
+		select 1
+		from standings_progression p
+		where p.season = s.season
+		and p.league_id = s.league_id
+		and p.date_extraction >= s.date_extraction
+	)
+	group by s.season, s.league_id, s.date_extraction
+)
+select 
+	s.team, 
+	s.team_id, 
+	s.league, 
+	s.league_id, 
+	s.season,
+	s.date_extraction,
+	s.rank,
+	s.points,
+	s.played,
+	s.goals_diff,
+	s.form,
+	s.time_extraction
+from standings s
+inner join max_time
+on max_time.season = s.season
+and max_time.league_id = s.league_id
+and max_time.max_time_extraction = s.time_extraction
\ No newline at end of file
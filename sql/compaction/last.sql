@@ -0,0 +1,15 @@
+--closed seasons: keep only final snapshot of every season & league
+
+DELETE FROM {table} t
+USING (
+	select 
+		s.season, 
+		s.league,
+		max(s.time_extraction) as max_time_extraction
+	from {table} s
+	where s.season < %(season)s
+	group by s.season, s.league
+) max_time
+WHERE t.season = max_time.season
+AND t.league = max_time.league
+AND t.time_extraction < max_time.max_time_extraction
\ No newline at end of file
@@ -0,0 +1,17 @@
+--closed seasons: keep last snapshot of every week of every season & league
+
+DELETE FROM {table} t
+USING (
+	select 
+		s.season, 
+		s.league,
+		date_trunc('week', s.time_extraction) as week,
+		max(s.time_extraction) as max_time_extraction
+	from {table} s
+	where s.season < %(season)s
+	group by s.season, s.league, date_trunc('week', s.time_extraction)
+) max_time
+WHERE t.season = max_time.season
+AND t.league = max_time.league
+AND date_trunc('week', t.time_extraction) = max_time.week
+AND t.time_extraction < max_time.max_time_extraction
\ No newline at end of file
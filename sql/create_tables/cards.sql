@@ -4,7 +4,9 @@ CREATE TABLE cards
     minute varchar,
     number integer,
     team varchar,
+    team_id integer,
     league varchar,
+    league_id integer,
     season integer,
     date_extraction date,
     time_extraction timestamp
@@ -1,7 +1,9 @@
 CREATE TABLE cards_aggregations 
 (
     team varchar,
+    team_id integer,
     league varchar,
+    league_id integer,
     season integer,
     color varchar,
     sum_number integer,
@@ -0,0 +1,12 @@
+CREATE TABLE cards_minutes_aggregations 
+(
+    team varchar,
+    team_id integer,
+    league varchar,
+    league_id integer,
+    season integer,
+    color varchar,
+    minute varchar,
+    sum_number integer,
+    time_extraction timestamp
+    );
\ No newline at end of file
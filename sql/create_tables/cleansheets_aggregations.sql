@@ -1,7 +1,9 @@
 CREATE TABLE cleansheets_aggregations 
 (
     team varchar,
+    team_id integer,
     league varchar,
+    league_id integer,
     season integer,
     sum_games integer,
     time_extraction timestamp
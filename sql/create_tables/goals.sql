@@ -3,7 +3,9 @@ CREATE TABLE goals
     minute varchar,
     goals integer,
     team varchar,
+    team_id integer,
     league varchar,
+    league_id integer,
     season integer,
     direction varchar,
     date_extraction date,
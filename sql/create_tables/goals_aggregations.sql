@@ -1,7 +1,9 @@
 CREATE TABLE goals_aggregations 
 (
     team varchar,
+    team_id integer,
     league varchar,
+    league_id integer,
     season integer,
     direction varchar,
     sum_goals integer,
@@ -0,0 +1,12 @@
+CREATE TABLE goals_minutes_aggregations 
+(
+    team varchar,
+    team_id integer,
+    league varchar,
+    league_id integer,
+    season integer,
+    direction varchar,
+    minute varchar,
+    sum_goals integer,
+    time_extraction timestamp
+    );
\ No newline at end of file
@@ -0,0 +1,8 @@
+CREATE TABLE leagues 
+(
+    league_id integer PRIMARY KEY,
+    name varchar,
+    country varchar,
+    logo varchar,
+    time_extraction timestamp
+    );
\ No newline at end of file
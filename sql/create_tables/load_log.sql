@@ -0,0 +1,9 @@
+CREATE TABLE load_log 
+(
+    season integer,
+    league varchar,
+    league_id integer,
+    stage varchar,
+    time_extraction timestamp,
+    run_id varchar
+    );
\ No newline at end of file
@@ -3,7 +3,9 @@ CREATE TABLE penalties
     number integer,
     result varchar,
     team varchar,
+    team_id integer,
     league varchar,
+    league_id integer,
     season integer,
     date_extraction date,
     time_extraction timestamp
@@ -2,8 +2,10 @@ CREATE TABLE standings
 (
     season integer,
     league varchar,
+    league_id integer,
     rank integer,
     team varchar,
+    team_id integer,
     points integer,
     played integer,
     win integer,
@@ -0,0 +1,15 @@
+CREATE TABLE standings_progression 
+(
+    team varchar,
+    team_id integer,
+    league varchar,
+    league_id integer,
+    season integer,
+    date_extraction date,
+    rank integer,
+    points integer,
+    played integer,
+    goals_diff integer,
+    form varchar,
+    time_extraction timestamp
+    );
\ No newline at end of file
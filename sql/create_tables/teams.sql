@@ -0,0 +1,12 @@
+CREATE TABLE teams 
+(
+    season integer,
+    league_id integer,
+    team_id integer,
+    name varchar,
+    code varchar,
+    country varchar,
+    logo varchar,
+    time_extraction timestamp,
+    PRIMARY KEY (season, league_id, team_id)
+    );
\ No newline at end of file
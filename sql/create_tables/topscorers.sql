@@ -2,8 +2,10 @@ CREATE TABLE topscorers
 (
     season integer,
     league varchar,
+    league_id integer,
     player varchar,
     team varchar,
+    team_id integer,
     age integer,
     nationality varchar,
     games integer,
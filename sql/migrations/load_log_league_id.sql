@@ -0,0 +1,9 @@
+--load log keyed by league_id: incremental aggregation doesn't depend on league names
+
+ALTER TABLE load_log ADD COLUMN IF NOT EXISTS league_id integer;
+
+UPDATE load_log x
+SET league_id = l.league_id
+FROM leagues l
+WHERE x.league_id IS NULL
+AND x.league = l.name;
\ No newline at end of file
@@ -0,0 +1,3 @@
+--id of extraction run in load log
+
+ALTER TABLE load_log ADD COLUMN IF NOT EXISTS run_id varchar;
\ No newline at end of file
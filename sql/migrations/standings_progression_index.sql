@@ -0,0 +1,3 @@
+--standings progression lookups by season & league
+
+CREATE INDEX IF NOT EXISTS standings_progression_season_league_idx ON standings_progression (season, league_id, date_extraction);
\ No newline at end of file
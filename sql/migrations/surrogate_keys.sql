@@ -0,0 +1,27 @@
+--integer surrogate keys of leagues & teams in tables created before them
+
+ALTER TABLE standings ADD COLUMN IF NOT EXISTS league_id integer, ADD COLUMN IF NOT EXISTS team_id integer;
+ALTER TABLE topscorers ADD COLUMN IF NOT EXISTS league_id integer, ADD COLUMN IF NOT EXISTS team_id integer;
+ALTER TABLE cards ADD COLUMN IF NOT EXISTS league_id integer, ADD COLUMN IF NOT EXISTS team_id integer;
+ALTER TABLE lineups ADD COLUMN IF NOT EXISTS league_id integer, ADD COLUMN IF NOT EXISTS team_id integer;
+ALTER TABLE penalties ADD COLUMN IF NOT EXISTS league_id integer, ADD COLUMN IF NOT EXISTS team_id integer;
+ALTER TABLE cleansheets ADD COLUMN IF NOT EXISTS league_id integer, ADD COLUMN IF NOT EXISTS team_id integer;
+ALTER TABLE goals ADD COLUMN IF NOT EXISTS league_id integer, ADD COLUMN IF NOT EXISTS team_id integer;
+ALTER TABLE cards_aggregations ADD COLUMN IF NOT EXISTS league_id integer, ADD COLUMN IF NOT EXISTS team_id integer;
+ALTER TABLE cleansheets_aggregations ADD COLUMN IF NOT EXISTS league_id integer, ADD COLUMN IF NOT EXISTS team_id integer;
+ALTER TABLE goals_aggregations ADD COLUMN IF NOT EXISTS league_id integer, ADD COLUMN IF NOT EXISTS team_id integer;
+ALTER TABLE cards_minutes_aggregations ADD COLUMN IF NOT EXISTS league_id integer, ADD COLUMN IF NOT EXISTS team_id integer;
+ALTER TABLE goals_minutes_aggregations ADD COLUMN IF NOT EXISTS league_id integer, ADD COLUMN IF NOT EXISTS team_id integer;
+
+CREATE INDEX IF NOT EXISTS standings_season_league_id_idx ON standings (season, league_id, time_extraction);
+CREATE INDEX IF NOT EXISTS topscorers_season_league_id_idx ON topscorers (season, league_id, time_extraction);
+CREATE INDEX IF NOT EXISTS cards_season_league_id_idx ON cards (season, league_id, time_extraction);
+CREATE INDEX IF NOT EXISTS lineups_season_league_id_idx ON lineups (season, league_id, time_extraction);
+CREATE INDEX IF NOT EXISTS penalties_season_league_id_idx ON penalties (season, league_id, time_extraction);
+CREATE INDEX IF NOT EXISTS cleansheets_season_league_id_idx ON cleansheets (season, league_id, time_extraction);
+CREATE INDEX IF NOT EXISTS goals_season_league_id_idx ON goals (season, league_id, time_extraction);
+CREATE INDEX IF NOT EXISTS cards_aggregations_season_league_id_idx ON cards_aggregations (season, league_id, time_extraction);
+CREATE INDEX IF NOT EXISTS cleansheets_aggregations_season_league_id_idx ON cleansheets_aggregations (season, league_id, time_extraction);
+CREATE INDEX IF NOT EXISTS goals_aggregations_season_league_id_idx ON goals_aggregations (season, league_id, time_extraction);
+CREATE INDEX IF NOT EXISTS cards_minutes_aggregations_season_league_id_idx ON cards_minutes_aggregations (season, league_id, time_extraction);
+CREATE INDEX IF NOT EXISTS goals_minutes_aggregations_season_league_id_idx ON goals_minutes_aggregations (season, league_id, time_extraction);
\ No newline at end of file
@@ -0,0 +1,169 @@
+--fill league_id & team_id of rows extracted before reference tables by names
+
+UPDATE standings x
+SET league_id = l.league_id
+FROM leagues l
+WHERE x.league_id IS NULL
+AND x.league = l.name;
+
+UPDATE standings x
+SET team_id = t.team_id
+FROM teams t
+WHERE x.team_id IS NULL
+AND x.season = t.season
+AND x.league_id = t.league_id
+AND x.team = t.name;
+
+UPDATE topscorers x
+SET league_id = l.league_id
+FROM leagues l
+WHERE x.league_id IS NULL
+AND x.league = l.name;
+
+UPDATE topscorers x
+SET team_id = t.team_id
+FROM teams t
+WHERE x.team_id IS NULL
+AND x.season = t.season
+AND x.league_id = t.league_id
+AND x.team = t.name;
+
+UPDATE cards x
+SET league_id = l.league_id
+FROM leagues l
+WHERE x.league_id IS NULL
+AND x.league = l.name;
+
+UPDATE cards x
+SET team_id = t.team_id
+FROM teams t
+WHERE x.team_id IS NULL
+AND x.season = t.season
+AND x.league_id = t.league_id
+AND x.team = t.name;
+
+UPDATE lineups x
+SET league_id = l.league_id
+FROM leagues l
+WHERE x.league_id IS NULL
+AND x.league = l.name;
+
+UPDATE lineups x
+SET team_id = t.team_id
+FROM teams t
+WHERE x.team_id IS NULL
+AND x.season = t.season
+AND x.league_id = t.league_id
+AND x.team = t.name;
+
+UPDATE penalties x
+SET league_id = l.league_id
+FROM leagues l
+WHERE x.league_id IS NULL
+AND x.league = l.name;
+
+UPDATE penalties x
+SET team_id = t.team_id
+FROM teams t
+WHERE x.team_id IS NULL
+AND x.season = t.season
+AND x.league_id = t.league_id
+AND x.team = t.name;
+
+UPDATE cleansheets x
+SET league_id = l.league_id
+FROM leagues l
+WHERE x.league_id IS NULL
+AND x.league = l.name;
+
+UPDATE cleansheets x
+SET team_id = t.team_id
+FROM teams t
+WHERE x.team_id IS NULL
+AND x.season = t.season
+AND x.league_id = t.league_id
+AND x.team = t.name;
+
+UPDATE goals x
+SET league_id = l.league_id
+FROM leagues l
+WHERE x.league_id IS NULL
+AND x.league = l.name;
+
+UPDATE goals x
+SET team_id = t.team_id
+FROM teams t
+WHERE x.team_id IS NULL
+AND x.season = t.season
+AND x.league_id = t.league_id
+AND x.team = t.name;
+
+UPDATE cards_aggregations x
+SET league_id = l.league_id
+FROM leagues l
+WHERE x.league_id IS NULL
+AND x.league = l.name;
+
+UPDATE cards_aggregations x
+SET team_id = t.team_id
+FROM teams t
+WHERE x.team_id IS NULL
+AND x.season = t.season
+AND x.league_id = t.league_id
+AND x.team = t.name;
+
+UPDATE cleansheets_aggregations x
+SET league_id = l.league_id
+FROM leagues l
+WHERE x.league_id IS NULL
+AND x.league = l.name;
+
+UPDATE cleansheets_aggregations x
+SET team_id = t.team_id
+FROM teams t
+WHERE x.team_id IS NULL
+AND x.season = t.season
+AND x.league_id = t.league_id
+AND x.team = t.name;
+
+UPDATE goals_aggregations x
+SET league_id = l.league_id
+FROM leagues l
+WHERE x.league_id IS NULL
+AND x.league = l.name;
+
+UPDATE goals_aggregations x
+SET team_id = t.team_id
+FROM teams t
+WHERE x.team_id IS NULL
+AND x.season = t.season
+AND x.league_id = t.league_id
+AND x.team = t.name;
+
+UPDATE cards_minutes_aggregations x
+SET league_id = l.league_id
+FROM leagues l
+WHERE x.league_id IS NULL
+AND x.league = l.name;
+
+UPDATE cards_minutes_aggregations x
+SET team_id = t.team_id
+FROM teams t
+WHERE x.team_id IS NULL
+AND x.season = t.season
+AND x.league_id = t.league_id
+AND x.team = t.name;
+
+UPDATE goals_minutes_aggregations x
+SET league_id = l.league_id
+FROM leagues l
+WHERE x.league_id IS NULL
+AND x.league = l.name;
+
+UPDATE goals_minutes_aggregations x
+SET team_id = t.team_id
+FROM teams t
+WHERE x.team_id IS NULL
+AND x.season = t.season
+AND x.league_id = t.league_id
+AND x.team = t.name;
\ No newline at end of file
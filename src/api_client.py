@@ -0,0 +1,274 @@
+import contextlib
+import datetime
+import fcntl
+import hashlib
+import json
+import os
+import threading
+import time
+
+import requests
+
+# rapid api quota headers
+QUOTA_LIMIT_HEADER = "x-ratelimit-requests-limit"
+QUOTA_REMAINING_HEADER = "x-ratelimit-requests-remaining"
+
+TOO_MANY_REQUESTS = 429
+
+
+def quota_day() -> str:
+    """
+    Day of daily quota (rapid api quotas are reset at 00:00 UTC).
+    """
+    return datetime.datetime.now(datetime.timezone.utc).date().isoformat()
+
+
+class TokenBucket:
+    """
+    Token bucket: up to capacity requests at once, refilled by rate tokens per second.
+
+    Wall clock time is used: bucket state is shared between processes.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.time()
+
+    def refill(self):
+        now = time.time()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self) -> float:
+        """
+        Seconds until one token is available.
+        """
+        self.refill()
+
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+    def take(self):
+        self.refill()
+        self.tokens -= 1
+
+    def block(self, seconds: float):
+        """
+        No tokens for the next seconds (server asked to retry after them).
+        """
+        self.refill()
+        self.tokens = min(self.tokens, 1 - seconds * self.rate)
+
+
+class ApiKey:
+    """
+    Rapid api key with its rate limit and remaining daily quota.
+    """
+
+    def __init__(self, key: str, rate: float, capacity: int):
+        self.key = key
+        # key is not written to shared state as is
+        self.id = hashlib.md5(key.encode()).hexdigest()
+        self.bucket = TokenBucket(rate=rate, capacity=capacity)
+        # unknown until first response of the day
+        self.quota_limit = None
+        self.quota_remaining = None
+        self.quota_day = None
+
+    def expire_quota(self):
+        """
+        Remaining quota of previous days is unknown again (quota was reset).
+        """
+        if self.quota_day != quota_day():
+            self.quota_remaining = None
+
+    @property
+    def exhausted(self) -> bool:
+        self.expire_quota()
+
+        return self.quota_remaining is not None and self.quota_remaining <= 0
+
+    def used_share(self) -> float:
+        """
+        Used share of daily quota (0 if unknown).
+        """
+        self.expire_quota()
+
+        if not self.quota_limit or self.quota_remaining is None:
+            return 0.0
+
+        return 1 - self.quota_remaining / self.quota_limit
+
+    def update_quota(self, headers):
+        if QUOTA_REMAINING_HEADER in headers:
+            self.quota_remaining = int(headers[QUOTA_REMAINING_HEADER])
+            self.quota_day = quota_day()
+        if QUOTA_LIMIT_HEADER in headers:
+            self.quota_limit = int(headers[QUOTA_LIMIT_HEADER])
+
+    def dump(self) -> dict:
+        return {
+            "tokens": self.bucket.tokens,
+            "updated": self.bucket.updated,
+            "quota_limit": self.quota_limit,
+            "quota_remaining": self.quota_remaining,
+            "quota_day": self.quota_day,
+        }
+
+    def load(self, state: dict):
+        self.bucket.tokens = state["tokens"]
+        self.bucket.updated = state["updated"]
+        self.quota_limit = state["quota_limit"]
+        # state without day (written before days were kept) is stale
+        self.quota_remaining = state["quota_remaining"]
+        self.quota_day = state.get("quota_day")
+        self.expire_quota()
+
+
+def retry_after(headers, default: float) -> float:
+    """
+    Seconds to wait from Retry-After header (default if there is no header or it is a date).
+    """
+    try:
+        return max(float(headers["Retry-After"]), 0.0)
+    except (KeyError, ValueError):
+        return default
+
+
+class RapidApiClient:
+    """
+    Rapid api client distributing requests across pool of keys (subscriptions).
+
+    Every key has its own token bucket (requests_per_minute). Request is sent with
+    the key which has a free token and the least used daily quota (taken from
+    response headers), so keys are drained evenly and throughput grows with number
+    of keys. Thread safe.
+
+    With state_path buckets and quotas of keys are kept in a file under flock, so
+    processes running in parallel (mapped extraction tasks) share the rate limit
+    of each key instead of applying it each. Responses 429 are retried with
+    exponential backoff or after Retry-After seconds, the key is paused meanwhile.
+    """
+
+    def __init__(
+        self,
+        keys: list,
+        host: str,
+        requests_per_minute: float = 20,
+        burst: int = 1,
+        timeout: float = 30,
+        state_path: str = None,
+        retries: int = 5,
+        backoff: float = 2,
+    ):
+        if not keys:
+            raise ValueError("At least one rapid api key is required")
+
+        self.host = host
+        self.timeout = timeout
+        self.state_path = state_path
+        self.retries = retries
+        self.backoff = backoff
+        self.keys = [
+            ApiKey(key=key, rate=requests_per_minute / 60, capacity=burst)
+            for key in keys
+        ]
+
+        self._lock = threading.Lock()
+        self._session = requests.Session()
+
+        if state_path is not None and os.path.dirname(state_path):
+            os.makedirs(os.path.dirname(state_path), exist_ok=True)
+
+    @contextlib.contextmanager
+    def _shared(self):
+        """
+        Keys state locked by this thread (and process, if state_path is set).
+        """
+        with self._lock:
+            if self.state_path is None:
+                yield
+
+                return
+
+            with open(self.state_path, "a+") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+
+                try:
+                    f.seek(0)
+                    try:
+                        state = json.loads(f.read() or "{}")
+                    except ValueError:
+                        state = {}
+
+                    for key in self.keys:
+                        if key.id in state:
+                            key.load(state[key.id])
+
+                    yield
+
+                    state.update({key.id: key.dump() for key in self.keys})
+                    f.seek(0)
+                    f.truncate()
+                    f.write(json.dumps(state))
+                    f.flush()
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _acquire(self) -> ApiKey:
+        """
+        Wait for a free token and take it from the least drained key.
+        """
+        while True:
+            with self._shared():
+                keys = [key for key in self.keys if not key.exhausted]
+
+                if not keys:
+                    raise RuntimeError("Daily quota of all rapid api keys is exhausted")
+
+                key = min(keys, key=lambda k: (k.bucket.wait_time(), k.used_share()))
+                wait = key.bucket.wait_time()
+
+                if wait == 0:
+                    key.bucket.take()
+
+                    return key
+
+            time.sleep(wait)
+
+    def get(self, url: str, params: dict = None) -> dict:
+        """
+        GET request to rapid api.
+
+        :param url: str url
+        :param params: dict query string
+
+        :return: dict response json
+        """
+        for attempt in range(self.retries + 1):
+            key = self._acquire()
+
+            response = self._session.get(
+                url,
+                headers={"X-RapidAPI-Key": key.key, "X-RapidAPI-Host": self.host},
+                params=params,
+                timeout=self.timeout,
+            )
+
+            with self._shared():
+                key.update_quota(response.headers)
+
+                if response.status_code == TOO_MANY_REQUESTS:
+                    key.bucket.block(
+                        retry_after(
+                            response.headers, default=self.backoff * 2**attempt
+                        )
+                    )
+
+            if response.status_code != TOO_MANY_REQUESTS:
+                break
+
+        response.raise_for_status()
+
+        return response.json()
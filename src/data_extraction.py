@@ -1,49 +1,15 @@
 import datetime
-import time
+import uuid
 
 import hydra
 import pandas as pd
-import requests
 from omegaconf import DictConfig
 from tqdm import tqdm
 
 import database_connection
-
-
-def extract_available_teams(
-    url_teams: str, headers: dict, seasons: list, league_ids: list
-):
-    """
-    Извлечение всех команд, принимавших участие в турнире в заданные сезоны и чемпионаты.
-
-    :param url_teams: str url к странице с информацией о командах на rapid-api
-    :param headers: dict конфигурации для подкючения к rapid api:
-                        - key
-                        - host
-    :param seasons: list сезонов
-    :param league_ids: list id лиг
-    :return: dict
-    """
-    teams = {}
-
-    for season in seasons:
-        teams[season] = {}
-        teams[season]["leagues"] = {}
-
-        for league_id in league_ids:
-            # get response
-            querystring = {"league": league_id, "season": season}
-            response_teams = requests.get(
-                url_teams, headers=headers, params=querystring
-            ).json()
-
-            # save response
-            teams[season]["leagues"][league_id] = {
-                "id": league_id,
-                "teams": response_teams["response"],
-            }
-
-    return teams
+from api_client import RapidApiClient
+from references import update_references
+from statistics_aggregation import aggregate_loaded
 
 
 def extract_cards_statistics(stats: dict) -> pd.DataFrame:
@@ -70,7 +36,9 @@ def extract_cards_statistics(stats: dict) -> pd.DataFrame:
             "minute": minutes,
             "number": numbers,
             "team": stats["team"]["name"],
+            "team_id": stats["team"]["id"],
             "league": stats["league"]["name"],
+            "league_id": stats["league"]["id"],
             "season": stats["league"]["season"],
         }
     )
@@ -93,7 +61,9 @@ def extract_lineups_statistics(stats: dict) -> pd.DataFrame:
             "formation": [i["formation"] for i in stats["lineups"]],
             "games": [i["played"] for i in stats["lineups"]],
             "team": stats["team"]["name"],
+            "team_id": stats["team"]["id"],
             "league": stats["league"]["name"],
+            "league_id": stats["league"]["id"],
             "season": stats["league"]["season"],
         }
     )
@@ -117,7 +87,9 @@ def extract_penalties_statistics(stats: dict) -> pd.DataFrame:
             ],
             "result": ["scored", "missed"],
             "team": stats["team"]["name"],
+            "team_id": stats["team"]["id"],
             "league": stats["league"]["name"],
+            "league_id": stats["league"]["id"],
             "season": stats["league"]["season"],
         }
     )
@@ -138,7 +110,9 @@ def extract_cleansheets_statistics(stats: dict) -> pd.DataFrame:
             "location": list(stats["clean_sheet"].keys()),
             "games": list(stats["clean_sheet"].values()),
             "team": stats["team"]["name"],
+            "team_id": stats["team"]["id"],
             "league": stats["league"]["name"],
+            "league_id": stats["league"]["id"],
             "season": stats["league"]["season"],
         }
     )
@@ -169,7 +143,9 @@ def extract_goals_statistics(stats: dict) -> pd.DataFrame:
                 "minute": minutes,
                 "goals": minutes_goals,
                 "team": stats["team"]["name"],
+                "team_id": stats["team"]["id"],
                 "league": stats["league"]["name"],
+                "league_id": stats["league"]["id"],
                 "season": stats["league"]["season"],
                 "direction": direction,
             }
@@ -193,6 +169,7 @@ def extract_standings(response_standings: dict) -> pd.DataFrame:
     """
     ranks = []
     teams = []
+    team_ids = []
     points = []
     goals_diff = []
     forms = []
@@ -209,6 +186,7 @@ def extract_standings(response_standings: dict) -> pd.DataFrame:
     for i in standings:
         ranks.append(i["rank"])
         teams.append(i["team"]["name"])
+        team_ids.append(i["team"]["id"])
         points.append(i["points"])
         goals_diff.append(i["goalsDiff"])
         forms.append(i["form"])
@@ -224,8 +202,10 @@ def extract_standings(response_standings: dict) -> pd.DataFrame:
         {
             "season": response_standings["response"][0]["league"]["season"],
             "league": response_standings["response"][0]["league"]["name"],
+            "league_id": response_standings["response"][0]["league"]["id"],
             "rank": ranks,
             "team": teams,
+            "team_id": team_ids,
             "points": points,
             "played": played,
             "win": wins,
@@ -251,8 +231,10 @@ def extract_top_scorers_statistics(response_top_scorers: dict) -> pd.DataFrame:
     :return: pd.DataFrame
     """
     league = []
+    league_ids = []
     players = []
     players_teams = []
+    players_teams_ids = []
     ages = []
     nationalities = []
     games_number = []
@@ -265,8 +247,10 @@ def extract_top_scorers_statistics(response_top_scorers: dict) -> pd.DataFrame:
 
     for i in top_scorers:
         league.append(i["statistics"][0]["league"]["name"])
+        league_ids.append(i["statistics"][0]["league"]["id"])
         players.append(i["player"]["name"])
         players_teams.append(i["statistics"][0]["team"]["name"])
+        players_teams_ids.append(i["statistics"][0]["team"]["id"])
         ages.append(i["player"]["age"])
         nationalities.append(i["player"]["nationality"])
         games_number.append(i["statistics"][0]["games"]["appearences"])
@@ -279,8 +263,10 @@ def extract_top_scorers_statistics(response_top_scorers: dict) -> pd.DataFrame:
         {
             "season": int(response_top_scorers["parameters"]["season"]),
             "league": league,
+            "league_id": league_ids,
             "player": players,
             "team": players_teams,
+            "team_id": players_teams_ids,
             "age": ages,
             "nationality": nationalities,
             "games": games_number,
@@ -299,14 +285,22 @@ def extract_top_scorers_statistics(response_top_scorers: dict) -> pd.DataFrame:
     return summary
 
 
-@hydra.main(version_base=None, config_path="../conf", config_name="configs")
-def main(cfg: DictConfig):
-    """"""
-    # rapid api headers
-    headers = {
-        "X-RapidAPI-Key": cfg["rapid_api"]["key"],
-        "X-RapidAPI-Host": cfg["rapid_api"]["host"],
-    }
+def run_extraction(cfg: DictConfig) -> None:
+    """
+    Выгрузка статистики сезонов и турниров из data_extraction и запись в БД.
+
+    :param cfg: DictConfig конфиги
+
+    :return: None
+    """
+    # rapid api client: requests are distributed across pool of keys
+    client = RapidApiClient(
+        keys=cfg["rapid_api"]["keys"],
+        host=cfg["rapid_api"]["host"],
+        requests_per_minute=cfg["rapid_api"]["requests_per_minute"],
+        state_path=cfg["rapid_api"]["state_path"],
+        retries=cfg["rapid_api"]["retries"],
+    )
 
     leagues = cfg["data_extraction"]["leagues"]
 
@@ -317,12 +311,23 @@ def main(cfg: DictConfig):
     else:
         seasons = [cfg["data_extraction"]["seasons"][-1]]
 
-    # extract teams
-    teams = extract_available_teams(
-        url_teams=cfg["urls"]["teams"],
-        headers=headers,
+    # db connection
+    mydb = database_connection.SoccerDatabase(
+        host=cfg["db"]["host"],
+        database=cfg["db"]["database"],
+        user=cfg["db"]["user"],
+        password=cfg["db"]["password"],
+        port=cfg["db"]["port"],
+    )
+
+    # teams from reference table, rapid api is requested only for missing or stale ones
+    teams = update_references(
+        db_connection=mydb,
+        client=client,
+        urls=cfg["urls"],
         seasons=seasons,
         league_ids=leagues,
+        refresh_days=cfg["references"]["refresh_days"],
     )
 
     # urls
@@ -343,12 +348,8 @@ def main(cfg: DictConfig):
             # standings & topscorers statistics extraction
 
             querystring = {"season": season, "league": league}
-            response_standings = requests.get(
-                url_standings, headers=headers, params=querystring
-            ).json()
-            response_topscorers = requests.get(
-                url_topscorers, headers=headers, params=querystring
-            ).json()
+            response_standings = client.get(url_standings, params=querystring)
+            response_topscorers = client.get(url_topscorers, params=querystring)
 
             # standigs statistics
             standings = extract_standings(response_standings=response_standings)
@@ -361,18 +362,21 @@ def main(cfg: DictConfig):
             all_topscorers.append(topscorers)
 
             # teams statistics extraction
-            for team in teams[season]["leagues"][league]["teams"]:
-                team_id = team["team"]["id"]
+            league_teams = teams[
+                (teams["season"] == season) & (teams["league_id"] == league)
+            ]
+
+            for team_id in league_teams["team_id"]:
+                team_id = int(team_id)
 
                 teams_querystring = {
                     "league": league,
                     "season": season,
                     "team": team_id,
                 }
-                response_stats = requests.get(
-                    url_teams_statistics, headers=headers, params=teams_querystring
-                ).json()
-                time.sleep(3)
+                response_stats = client.get(
+                    url_teams_statistics, params=teams_querystring
+                )
                 stats = response_stats["response"]
 
                 # cards statistics
@@ -404,43 +408,46 @@ def main(cfg: DictConfig):
     all_cleansheets = pd.concat(all_cleansheets)
     all_goals = pd.concat(all_goals)
 
-    # db connection
-    mydb = database_connection.SoccerDatabase(
-        host=cfg["db"]["host"],
-        database=cfg["db"]["database"],
-        user=cfg["db"]["user"],
-        password=cfg["db"]["password"],
-        port=cfg["db"]["port"],
+    # one run: shared time_extraction, all tables are published atomically
+    run_id = uuid.uuid4().hex
+    time_extraction = datetime.datetime.now()
+
+    frames = {
+        "standings": all_standings,
+        "topscorers": all_topscorers,
+        "cards": all_cards,
+        "lineups": all_lineups,
+        "penalties": all_penalties,
+        "cleansheets": all_cleansheets,
+        "goals": all_goals,
+    }
+
+    for data in frames.values():
+        data["date_extraction"] = time_extraction.date()
+        data["time_extraction"] = time_extraction
+
+    # write to staging tables, validate and publish with log of loaded seasons & leagues
+    mydb.write_run(
+        frames=frames,
+        partitions=all_standings[["season", "league_id", "league"]]
+        .drop_duplicates()
+        .itertuples(index=False),
+        run_id=run_id,
+        time_extraction=time_extraction,
     )
 
-    for data, name in zip(
-        [
-            all_standings,
-            all_topscorers,
-            all_cards,
-            all_lineups,
-            all_penalties,
-            all_cleansheets,
-            all_goals,
-        ],
-        [
-            "standings",
-            "topscorers",
-            "cards",
-            "lineups",
-            "penalties",
-            "cleansheets",
-            "goals",
-        ],
-    ):
-        today = datetime.datetime.now()
-        data["date_extraction"] = today.date()
-        data["time_extraction"] = today
-
-        mydb.write_dataframe(table_name=name, df=data)
+    # aggregate loaded seasons & leagues in the same process
+    if cfg["statistics_aggregation"]["after_extraction"]:
+        aggregate_loaded(db_connection=mydb, cfg=cfg, run_id=run_id)
 
     mydb.close()
 
 
+@hydra.main(version_base=None, config_path="../conf", config_name="configs")
+def main(cfg: DictConfig):
+    """"""
+    run_extraction(cfg=cfg)
+
+
 if __name__ == "__main__":
     main()
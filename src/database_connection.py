@@ -1,10 +1,372 @@
+import contextlib
+import io
+import threading
+import uuid
+
+import pandas as pd
 import pandas.io.sql as psql
 import psycopg2
+import psycopg2.pool
+import pyarrow as pa
+import pyarrow.parquet as pq
+from psycopg2 import sql
 from sqlalchemy import create_engine
 
+# channel of notifications about new data loads (see SoccerDatabase.log_load)
+DATA_VERSION_CHANNEL = "data_version"
+
+# snapshot of season & league effective at as_of: latest time_extraction <= as_of is found
+# by backward scan of (season, league_id, time_extraction) index, independent of history length
+# (league name is resolved to league_id once by leagues reference)
+AS_OF_QUERY = """
+    SELECT t.* FROM {table_name} t
+    WHERE t.season = %(season)s
+    AND t.league_id = (SELECT l.league_id FROM leagues l WHERE l.name = %(league)s)
+    AND t.time_extraction = (
+        SELECT s.time_extraction FROM {table_name} s
+        WHERE s.season = %(season)s
+        AND s.league_id = (SELECT l.league_id FROM leagues l WHERE l.name = %(league)s)
+        AND s.time_extraction <= %(as_of)s
+        ORDER BY s.time_extraction DESC
+        LIMIT 1
+    )
+"""
+
+# postgres types oids: text columns are read as str, numeric as float, dates parsed
+TEXT_OIDS = {19, 25, 1042, 1043}
+FLOAT_OIDS = {700, 701, 1700}
+DATE_OIDS = {1082, 1114, 1184}
+
+# bulk export formats and their content types
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+# parquet column types by postgres types oids (other types are written as strings)
+ARROW_TYPES = {
+    16: pa.bool_(),
+    20: pa.int64(),
+    21: pa.int64(),
+    23: pa.int64(),
+    1082: pa.date32(),
+    1114: pa.timestamp("us"),
+} | {oid: pa.float64() for oid in FLOAT_OIDS}
+
+# version of loaded data: changes with every extraction/aggregation/compaction run
+DATA_VERSION_QUERY = "SELECT md5(count(*) || '|' || coalesce(max(time_extraction)::text, '')) FROM load_log"
+
+
+def copy_to_dataframe(conn, query, params=None):
+    """
+    Read query result with COPY ... TO STDOUT (CSV) parsed by pandas C parser.
+
+    Much faster and lighter than read_sql, which builds python tuple for every row.
+    Column dtypes are taken from query result description.
+    """
+    cursor = conn.cursor()
+
+    # result columns & types without reading rows
+    cursor.execute(f"SELECT * FROM ({query}) AS q LIMIT 0", params)
+    columns = [(column.name, column.type_code) for column in cursor.description]
+
+    buffer = io.BytesIO()
+    query = cursor.mogrify(query, params).decode()
+    cursor.copy_expert(
+        f"COPY ({query}) TO STDOUT WITH (FORMAT csv, HEADER true)", buffer
+    )
+    cursor.close()
+    conn.commit()
+
+    buffer.seek(0)
+
+    df = pd.read_csv(
+        buffer,
+        dtype={name: str for name, oid in columns if oid in TEXT_OIDS}
+        | {name: "float64" for name, oid in columns if oid in FLOAT_OIDS},
+        parse_dates=[name for name, oid in columns if oid in DATE_OIDS],
+        date_format="ISO8601",
+        keep_default_na=False,
+        # NULL is unquoted empty field, numeric NaN is written by postgres as 'NaN'
+        na_values={
+            name: ["", "NaN"] if oid in FLOAT_OIDS else [""] for name, oid in columns
+        },
+    )
+
+    return df
+
+
+def copy_from_dataframe(cursor, table_name, df):
+    """
+    Bulk write of dataframe to table with COPY ... FROM STDIN (CSV).
+    """
+    df = df.copy()
+
+    # integer columns with missing values are float in pandas: write them as integers
+    for column in df.select_dtypes("float").columns:
+        values = df[column].dropna()
+        if (values == values.round()).all():
+            df[column] = df[column].astype("Int64")
+
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+
+    columns = ", ".join(df.columns)
+    cursor.copy_expert(
+        f"COPY {table_name} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer
+    )
+
+
+class _ChunkSink:
+    """Write-only file collecting bytes written by parquet writer until they are taken."""
+
+    def __init__(self):
+        self.closed = False
+        self.position = 0
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def take(self):
+        data, self.chunks = b"".join(self.chunks), []
+
+        return data
+
+
+def export_query(
+    table_name, columns, seasons=None, leagues=None, date_from=None, date_to=None
+):
+    """
+    Query of table rows filtered by seasons, leagues and time_extraction dates (None - all).
+
+    Rows are ordered by all columns, so the same data is always exported byte to byte
+    the same and interrupted download can be resumed from byte offset.
+    """
+    conditions, params = [], {}
+
+    if seasons:
+        conditions.append(sql.SQL("season = any(%(seasons)s)"))
+        params["seasons"] = [int(i) for i in seasons]
+    if leagues:
+        conditions.append(sql.SQL("league = any(%(leagues)s)"))
+        params["leagues"] = list(leagues)
+    if date_from:
+        conditions.append(sql.SQL("time_extraction >= %(date_from)s"))
+        params["date_from"] = date_from
+    if date_to:
+        conditions.append(sql.SQL("time_extraction < %(date_to)s::date + 1"))
+        params["date_to"] = date_to
+
+    query = sql.SQL(
+        "SELECT * FROM {table} WHERE {conditions} ORDER BY {columns}"
+    ).format(
+        table=sql.Identifier(table_name),
+        conditions=sql.SQL(" AND ").join(conditions or [sql.SQL("true")]),
+        columns=sql.SQL(", ").join(sql.Identifier(column) for column in columns),
+    )
+
+    return query, params
+
+
+def stream_export(
+    conn,
+    table_name,
+    fmt="csv",
+    seasons=None,
+    leagues=None,
+    date_from=None,
+    date_to=None,
+    chunksize=50000,
+):
+    """
+    Table rows as chunks of CSV, NDJSON or parquet bytes (one row group per chunk).
+
+    Rows are read by server-side cursor, so memory use doesn't depend on result size.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            sql.SQL("SELECT * FROM {table} LIMIT 0").format(
+                table=sql.Identifier(table_name)
+            )
+        )
+        description = [(column.name, column.type_code) for column in cursor.description]
+        cursor.close()
+
+        columns = [name for name, _ in description]
+        query, params = export_query(
+            table_name, columns, seasons, leagues, date_from, date_to
+        )
+
+        cursor = conn.cursor(name=f"soccer_{uuid.uuid4().hex}")
+        cursor.itersize = chunksize
+        cursor.execute(query, params)
+
+        schema = pa.schema(
+            [(name, ARROW_TYPES.get(oid, pa.string())) for name, oid in description]
+        )
+        sink = _ChunkSink()
+        writer = pq.ParquetWriter(sink, schema) if fmt == "parquet" else None
+        header = True
+
+        while True:
+            rows = cursor.fetchmany(chunksize)
+
+            if not rows:
+                break
+
+            df = pd.DataFrame.from_records(rows, columns=columns)
+
+            if fmt == "csv":
+                yield df.to_csv(index=False, header=header).encode()
+            elif fmt == "ndjson":
+                yield df.to_json(
+                    orient="records", lines=True, date_format="iso"
+                ).rstrip("\n").encode() + b"\n"
+            else:
+                for name, oid in description:
+                    if oid in FLOAT_OIDS:
+                        df[name] = pd.to_numeric(df[name], errors="coerce")
+                writer.write_table(
+                    pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+                )
+                yield sink.take()
+
+            header = False
+
+        if writer is not None:
+            writer.close()
+            yield sink.take()
+
+        cursor.close()
+    finally:
+        # read-only transaction: also ends it when client stops reading
+        conn.rollback()
+
+
+def slice_bytes(chunks, start=0, stop=None):
+    """
+    Bytes [start, stop) of stream of chunks (stop None - till the end).
+    """
+    position = 0
+
+    for chunk in chunks:
+        begin, end = position, position + len(chunk)
+        position = end
+
+        if end <= start:
+            continue
+        if stop is not None and begin >= stop:
+            break
+
+        first = max(start - begin, 0)
+        last = None if stop is None else stop - begin
+        yield chunk[first:last]
+
+
+def validate_staging(cursor, table_name, df):
+    """
+    Check that staging table has all rows of dataframe and no rows without keys.
+    """
+    keys = [i for i in ["season", "league_id", "team_id"] if i in df.columns]
+    no_keys = " or ".join(f"{key} is null" for key in keys) or "false"
+
+    cursor.execute(
+        f"SELECT count(*), count(*) filter (where {no_keys}) FROM {table_name};"
+    )
+    rows, rows_without_keys = cursor.fetchone()
+
+    if rows != len(df):
+        raise ValueError(f"{table_name}: {rows} rows are staged instead of {len(df)}")
+    if rows_without_keys:
+        raise ValueError(f"{table_name}: {rows_without_keys} rows without {keys}")
+
+
+class SoccerDatabasePool:
+    """Thread safe pool of DB connections for concurrent reads.
+
+    Callers wait for a free connection when all maxconn are taken
+    (psycopg2 pool raises PoolError instead).
+    """
+
+    def __init__(self, host, database, user, password, port, maxconn=8):
+        self.pool = psycopg2.pool.ThreadedConnectionPool(
+            minconn=1,
+            maxconn=maxconn,
+            host=host,
+            database=database,
+            user=user,
+            password=password,
+            port=port,
+        )
+        self._slots = threading.BoundedSemaphore(maxconn)
+
+    @contextlib.contextmanager
+    def connection(self):
+        with self._slots:
+            conn = self.pool.getconn()
+
+            try:
+                yield conn
+            finally:
+                self.pool.putconn(conn)
+
+    def query(self, query, params=None):
+        with self.connection() as conn:
+            df = psql.read_sql(query, conn, params=params)
+
+        return df
+
+    def copy_query(self, query, params=None):
+        with self.connection() as conn:
+            try:
+                df = copy_to_dataframe(conn, query, params=params)
+            except Exception:
+                conn.rollback()
+                raise
+
+        return df
+
+    def query_as_of(self, table_name, season, league, as_of):
+        df = self.copy_query(
+            AS_OF_QUERY.format(table_name=table_name),
+            params={"season": int(season), "league": league, "as_of": as_of},
+        )
+
+        return df
+
+    def data_version(self):
+        return self.query(DATA_VERSION_QUERY).iloc[0, 0]
+
+    def stream_export(self, table_name, **kwargs):
+        with self.connection() as conn:
+            yield from stream_export(conn, table_name, **kwargs)
+
+    def close(self):
+        self.pool.closeall()
+
 
 class SoccerDatabase:
     """Connection to DB and data extraction."""
+
     def __init__(self, host, database, user, password, port):
         self.host = host
         self.database = database
@@ -13,34 +375,105 @@ class SoccerDatabase:
         self.port = port
 
         self.conn = psycopg2.connect(
-            host=host,
-            database=database,
-            user=user,
-            password=password,
-            port=port
+            host=host, database=database, user=user, password=password, port=port
         )
 
+    def execute(self, query, params=None):
+        cursor = self.conn.cursor()
+
+        cursor.execute(query, params)
+        rowcount = cursor.rowcount
+
+        self.conn.commit()
+        cursor.close()
+
+        return rowcount
+
+    def table_size(self, table_name):
+        cursor = self.conn.cursor()
+
+        # with indexes & toast
+        cursor.execute("SELECT pg_total_relation_size(%s);", (table_name,))
+        size = cursor.fetchone()[0]
+
+        self.conn.commit()
+        cursor.close()
+
+        return size
+
+    def vacuum(self, table_name, full=False):
+        # VACUUM can't run inside transaction block
+        self.conn.autocommit = True
+        cursor = self.conn.cursor()
+
+        try:
+            cursor.execute(f'VACUUM ({"FULL, " if full else ""}ANALYZE) {table_name};')
+        finally:
+            cursor.close()
+            self.conn.autocommit = False
+
     def create_table(self, query):
         cursor = self.conn.cursor()
 
         cursor.execute(query=query)
 
-        self.conn.commit() 
+        self.conn.commit()
         cursor.close()
 
-    def query(self, query):
-        df = psql.read_sql(query, self.conn)
-        
+    def query(self, query, params=None):
+        df = psql.read_sql(query, self.conn, params=params)
+
         return df
-    
+
+    def copy_query(self, query, params=None):
+        df = copy_to_dataframe(self.conn, query, params=params)
+
+        return df
+
+    def query_as_of(self, table_name, season, league, as_of):
+        df = self.copy_query(
+            AS_OF_QUERY.format(table_name=table_name),
+            params={"season": int(season), "league": league, "as_of": as_of},
+        )
+
+        return df
+
+    def data_version(self):
+        return self.query(DATA_VERSION_QUERY).iloc[0, 0]
+
+    def stream_export(self, table_name, **kwargs):
+        return stream_export(self.conn, table_name, **kwargs)
+
+    def query_chunks(self, query, params=None, chunksize=100000):
+        # server-side cursor: rows are fetched from postgres by chunks
+        cursor = self.conn.cursor(name=f"soccer_{uuid.uuid4().hex}")
+        cursor.itersize = chunksize
+
+        cursor.execute(query, params)
+
+        while True:
+            rows = cursor.fetchmany(chunksize)
+
+            if not rows:
+                break
+
+            yield pd.DataFrame.from_records(
+                rows, columns=[column.name for column in cursor.description]
+            )
+
+        cursor.close()
+        self.conn.commit()
+
     def show_tables(self):
         cursor = self.conn.cursor()
 
-        cursor.execute("""
+        cursor.execute(
+            """
                SELECT table_name FROM information_schema.tables
                WHERE table_schema = 'public'
-               """)
-        
+               """
+        )
+
         tables = [i[0] for i in cursor.fetchall()]
 
         self.conn.commit()
@@ -51,16 +484,75 @@ class SoccerDatabase:
 
     def write_dataframe(self, table_name, df):
         engine = create_engine(
-            f'postgresql://{self.user}:{self.password}@{self.host}:{self.port}/{self.database}'
-            )
-        
-        df.to_sql(table_name, engine, if_exists='append', index=False)
+            f"postgresql://{self.user}:{self.password}@{self.host}:{self.port}/{self.database}"
+        )
+
+        df.to_sql(table_name, engine, if_exists="append", index=False)
+
+    def write_run(self, frames, partitions, run_id, time_extraction):
+        # all tables of run are published in one transaction: readers see whole run or nothing
+        cursor = self.conn.cursor()
+
+        try:
+            for table_name, df in frames.items():
+                # unlogged staging table: fast bulk write without WAL
+                staging_table = f"{table_name}_staging_{run_id}"
+
+                cursor.execute(
+                    f"CREATE UNLOGGED TABLE {staging_table} (LIKE {table_name} INCLUDING DEFAULTS);"
+                )
+                copy_from_dataframe(cursor, staging_table, df)
+                validate_staging(cursor, staging_table, df)
+
+                columns = ", ".join(df.columns)
+                cursor.execute(
+                    f"INSERT INTO {table_name} ({columns}) SELECT {columns} FROM {staging_table};"
+                )
+                cursor.execute(f"DROP TABLE {staging_table};")
+
+            self._log_load(cursor, "extraction", partitions, time_extraction, run_id)
+
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def log_load(self, stage, partitions, time_extraction, run_id=None):
+        cursor = self.conn.cursor()
+
+        self._log_load(cursor, stage, partitions, time_extraction, run_id)
+
+        self.conn.commit()
+        cursor.close()
+
+    def _log_load(self, cursor, stage, partitions, time_extraction, run_id):
+        # partitions: (season, league_id, league name)
+        cursor.executemany(
+            "INSERT INTO load_log (season, league_id, league, stage, time_extraction, run_id) "
+            "VALUES (%s, %s, %s, %s, %s, %s);",
+            [
+                (
+                    int(season),
+                    int(league_id),
+                    str(league),
+                    stage,
+                    time_extraction,
+                    run_id,
+                )
+                for season, league_id, league in partitions
+            ],
+        )
+
+        # tell running dashboards that new data version is available (delivered on commit)
+        cursor.execute("SELECT pg_notify(%s, %s);", (DATA_VERSION_CHANNEL, stage))
 
     def drop_table(self, table_name):
         cursor = self.conn.cursor()
 
         # cursor.execute(f"TRUNCATE {table_name}; DELETE FROM {table_name};")
-        cursor.execute(f'DROP TABLE IF EXISTS {table_name};')
+        cursor.execute(f"DROP TABLE IF EXISTS {table_name};")
 
         # Commit the changes to the database
         self.conn.commit()
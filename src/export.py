@@ -0,0 +1,127 @@
+import hashlib
+import logging
+import os
+
+import hydra
+from omegaconf import DictConfig
+
+import database_connection
+
+log = logging.getLogger(__name__)
+
+
+def export_table(
+    db_connection: database_connection,
+    table_name: str,
+    output: str,
+    fmt: str = "csv",
+    seasons: list = None,
+    leagues: list = None,
+    date_from: str = None,
+    date_to: str = None,
+    resume: bool = True,
+    chunksize: int = 50000,
+) -> int:
+    """
+    Потоковая выгрузка таблицы в файл (CSV, NDJSON или parquet) с постоянным
+    расходом памяти. Прерванная выгрузка продолжается с конца файла, если данные
+    в БД и параметры выгрузки не изменились (ключ версии данных, таблицы, формата
+    и фильтров хранится рядом с файлом в <output>.version).
+
+    :param db_connection: database_connection - открытое соединение с БД
+    :param table_name: str название таблицы
+    :param output: str путь к файлу
+    :param fmt: str формат (csv, ndjson, parquet)
+    :param seasons: list сезонов (None - все)
+    :param leagues: list турниров (None - все)
+    :param date_from: str первая дата выгрузки (time_extraction)
+    :param date_to: str последняя дата выгрузки (time_extraction)
+    :param resume: bool продолжить прерванную выгрузку
+    :param chunksize: int строк в одном чанке
+
+    :return: int размер файла в байтах
+    """
+    # same data version, table, format and filters give byte to byte the same file
+    version = hashlib.md5(
+        "|".join(
+            [
+                db_connection.data_version(),
+                table_name,
+                fmt,
+                str(sorted(int(season) for season in seasons or [])),
+                str(sorted(str(league) for league in leagues or [])),
+                str(date_from),
+                str(date_to),
+                str(chunksize),
+            ]
+        ).encode()
+    ).hexdigest()
+    version_path = f"{output}.version"
+
+    offset = 0
+    if resume and os.path.exists(output) and os.path.exists(version_path):
+        with open(version_path, "r") as f:
+            if f.read() == version:
+                offset = os.path.getsize(output)
+
+    with open(version_path, "w") as f:
+        f.write(version)
+
+    chunks = db_connection.stream_export(
+        table_name,
+        fmt=fmt,
+        seasons=seasons,
+        leagues=leagues,
+        date_from=date_from,
+        date_to=date_to,
+        chunksize=chunksize,
+    )
+
+    with open(output, "ab" if offset else "wb") as f:
+        for chunk in database_connection.slice_bytes(chunks, start=offset):
+            f.write(chunk)
+
+    os.remove(version_path)
+
+    return os.path.getsize(output)
+
+
+@hydra.main(version_base=None, config_path="../conf", config_name="configs")
+def main(cfg: DictConfig):
+    """"""
+    export_cfg = cfg["export"]
+
+    if export_cfg["table"] not in export_cfg["tables"]:
+        raise ValueError(f"Table is not exported: {export_cfg['table']}")
+
+    # db connection
+    mydb = database_connection.SoccerDatabase(
+        host=cfg["db"]["host"],
+        database=cfg["db"]["database"],
+        user=cfg["db"]["user"],
+        password=cfg["db"]["password"],
+        port=cfg["db"]["port"],
+    )
+
+    output = export_cfg["output"] or f"{export_cfg['table']}.{export_cfg['format']}"
+
+    size = export_table(
+        db_connection=mydb,
+        table_name=export_cfg["table"],
+        output=output,
+        fmt=export_cfg["format"],
+        seasons=export_cfg["seasons"],
+        leagues=export_cfg["leagues"],
+        date_from=export_cfg["date_from"],
+        date_to=export_cfg["date_to"],
+        resume=export_cfg["resume"],
+        chunksize=export_cfg["chunksize"],
+    )
+
+    log.info(f"{export_cfg['table']} exported to {output}: {size} bytes")
+
+    mydb.close()
+
+
+if __name__ == "__main__":
+    main()
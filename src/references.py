@@ -0,0 +1,194 @@
+import datetime
+
+import hydra
+import pandas as pd
+from omegaconf import DictConfig
+
+import database_connection
+from api_client import RapidApiClient
+
+
+def extract_leagues(url_leagues: str, client: RapidApiClient, league_ids: list):
+    """
+    Извлечение справочника турниров.
+
+    :param url_leagues: str url к странице с информацией о турнирах на rapid-api
+    :param client: RapidApiClient клиент rapid api
+    :param league_ids: list id лиг
+
+    :return: pd.DataFrame
+    """
+    leagues = []
+
+    for league_id in league_ids:
+        response_leagues = client.get(url_leagues, params={"id": league_id})
+
+        for i in response_leagues["response"]:
+            leagues.append(
+                {
+                    "league_id": i["league"]["id"],
+                    "name": i["league"]["name"],
+                    "country": i["country"]["name"],
+                    "logo": i["league"]["logo"],
+                }
+            )
+
+    return pd.DataFrame(
+        leagues, columns=["league_id", "name", "country", "logo"]
+    ).drop_duplicates("league_id")
+
+
+def extract_teams(url_teams: str, client: RapidApiClient, season: int, league_id: int):
+    """
+    Извлечение всех команд, принимавших участие в турнире в заданном сезоне.
+
+    :param url_teams: str url к странице с информацией о командах на rapid-api
+    :param client: RapidApiClient клиент rapid api
+    :param season: int сезон
+    :param league_id: int id лиги
+
+    :return: pd.DataFrame
+    """
+    response_teams = client.get(
+        url_teams, params={"league": league_id, "season": season}
+    )
+
+    teams = pd.DataFrame(
+        [
+            {
+                "team_id": i["team"]["id"],
+                "name": i["team"]["name"],
+                "code": i["team"]["code"],
+                "country": i["team"]["country"],
+                "logo": i["team"]["logo"],
+            }
+            for i in response_teams["response"]
+        ],
+        columns=["team_id", "name", "code", "country", "logo"],
+    )
+    teams.insert(0, "season", season)
+    teams.insert(1, "league_id", league_id)
+
+    return teams
+
+
+def update_references(
+    db_connection: database_connection,
+    client: RapidApiClient,
+    urls: dict,
+    seasons: list,
+    league_ids: list,
+    refresh_days: int,
+) -> pd.DataFrame:
+    """
+    Обновление справочников leagues и teams в БД: с rapid-api выгружаются только
+    отсутствующие турниры и пары (сезон, турнир) или выгруженные раньше, чем
+    refresh_days дней назад.
+
+    :param db_connection: database_connection - открытое соединение с БД
+    :param client: RapidApiClient клиент rapid api
+    :param urls: dict urls rapid-api (leagues, teams)
+    :param seasons: list сезонов
+    :param league_ids: list id лиг
+    :param refresh_days: int срок актуальности справочников в днях
+
+    :return: pd.DataFrame команды выбранных сезонов и турниров
+    """
+    now = datetime.datetime.now()
+    fresh_since = now - datetime.timedelta(days=refresh_days)
+
+    seasons = [int(i) for i in seasons]
+    league_ids = [int(i) for i in league_ids]
+
+    # leagues
+    fresh_leagues = db_connection.query(
+        "select league_id from leagues where league_id = any(%s) and time_extraction >= %s",
+        params=(league_ids, fresh_since),
+    )
+    stale_leagues = sorted(set(league_ids) - set(fresh_leagues["league_id"]))
+
+    if stale_leagues:
+        leagues = extract_leagues(
+            url_leagues=urls["leagues"], client=client, league_ids=stale_leagues
+        )
+        leagues["time_extraction"] = now
+
+        db_connection.execute(
+            "delete from leagues where league_id = any(%s)", params=(stale_leagues,)
+        )
+        db_connection.write_dataframe(table_name="leagues", df=leagues)
+
+    # teams
+    fresh_teams = db_connection.query(
+        """
+        select distinct season, league_id from teams
+        where season = any(%s) and league_id = any(%s) and time_extraction >= %s
+        """,
+        params=(seasons, league_ids, fresh_since),
+    )
+    fresh_partitions = set(fresh_teams.itertuples(index=False, name=None))
+
+    for season in seasons:
+        for league_id in league_ids:
+            if (season, league_id) in fresh_partitions:
+                continue
+
+            teams = extract_teams(
+                url_teams=urls["teams"],
+                client=client,
+                season=season,
+                league_id=league_id,
+            )
+            teams["time_extraction"] = now
+
+            db_connection.execute(
+                "delete from teams where season = %s and league_id = %s",
+                params=(season, league_id),
+            )
+            db_connection.write_dataframe(table_name="teams", df=teams)
+
+    return db_connection.query(
+        "select * from teams where season = any(%s) and league_id = any(%s)",
+        params=(seasons, league_ids),
+    )
+
+
+@hydra.main(version_base=None, config_path="../conf", config_name="configs")
+def main(cfg: DictConfig):
+    """"""
+    # db connection
+    mydb = database_connection.SoccerDatabase(
+        host=cfg["db"]["host"],
+        database=cfg["db"]["database"],
+        user=cfg["db"]["user"],
+        password=cfg["db"]["password"],
+        port=cfg["db"]["port"],
+    )
+
+    client = RapidApiClient(
+        keys=cfg["rapid_api"]["keys"],
+        host=cfg["rapid_api"]["host"],
+        requests_per_minute=cfg["rapid_api"]["requests_per_minute"],
+        state_path=cfg["rapid_api"]["state_path"],
+        retries=cfg["rapid_api"]["retries"],
+    )
+
+    # справочники всех сезонов и турниров
+    update_references(
+        db_connection=mydb,
+        client=client,
+        urls=cfg["urls"],
+        seasons=cfg["data_extraction"]["seasons"],
+        league_ids=cfg["data_extraction"]["leagues"],
+        refresh_days=cfg["references"]["refresh_days"],
+    )
+
+    # заполнение league_id и team_id в данных, выгруженных до появления справочников
+    with open(cfg["sql"]["backfill_ids_query_path"], "r") as f:
+        mydb.execute(query=f.read())
+
+    mydb.close()
+
+
+if __name__ == "__main__":
+    main()
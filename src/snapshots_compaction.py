@@ -0,0 +1,111 @@
+import datetime
+import logging
+import os
+
+import hydra
+from omegaconf import DictConfig
+from psycopg2 import sql
+
+import database_connection
+
+log = logging.getLogger(__name__)
+
+
+def compact_snapshots(
+    db_connection: database_connection,
+    tables: list,
+    current_season: int,
+    closed_seasons: str,
+    queries_path: str,
+) -> dict:
+    """
+    Thin snapshots of closed seasons (season < current_season) in append-only tables:
+    all snapshots of current season are kept.
+
+    :param db_connection: database_connection - opened PostgresDB connection
+    :param tables: list - tables to compact
+    :param current_season: int - current season
+    :param closed_seasons: str - snapshots of closed seasons to keep:
+                                 last - only final one, weekly - last one of every week
+    :param queries_path: str - path to compaction queries
+
+    :return: dict - number of deleted rows of every table
+    """
+    if closed_seasons not in ("last", "weekly"):
+        raise ValueError(f"Unknown closed seasons retention: {closed_seasons}")
+
+    with open(os.path.join(queries_path, f"{closed_seasons}.sql"), "r") as f:
+        query = f.read()
+
+    deleted = {}
+    for table in tables:
+        deleted[table] = db_connection.execute(
+            query=sql.SQL(query).format(table=sql.Identifier(table)),
+            params={"season": int(current_season)},
+        )
+
+    return deleted
+
+
+def run_compaction(cfg: DictConfig) -> None:
+    """
+    Compaction of snapshots history with VACUUM to reclaim space.
+
+    :param cfg: DictConfig - configs
+
+    :return: None
+    """
+    compaction_cfg = cfg["snapshots_compaction"]
+
+    # db connection
+    mydb = database_connection.SoccerDatabase(
+        host=cfg["db"]["host"],
+        database=cfg["db"]["database"],
+        user=cfg["db"]["user"],
+        password=cfg["db"]["password"],
+        port=cfg["db"]["port"],
+    )
+
+    sizes = {table: mydb.table_size(table) for table in compaction_cfg["tables"]}
+
+    deleted = compact_snapshots(
+        db_connection=mydb,
+        tables=compaction_cfg["tables"],
+        current_season=cfg["data_extraction"]["seasons"][-1],
+        closed_seasons=compaction_cfg["closed_seasons"],
+        queries_path=cfg["sql"]["compaction_queries_path"],
+    )
+
+    # compaction rewrites history: new data version, so exports of the previous
+    # version are not resumed over compacted data (see database_connection.data_version)
+    if any(deleted.values()):
+        mydb.log_load(
+            stage="compaction",
+            partitions=mydb.query(
+                "select distinct season, league_id, league from load_log "
+                "where season < %(season)s and league_id is not null",
+                params={"season": int(cfg["data_extraction"]["seasons"][-1])},
+            ).itertuples(index=False),
+            time_extraction=datetime.datetime.now(),
+        )
+
+    for table in compaction_cfg["tables"]:
+        if compaction_cfg["vacuum"]:
+            mydb.vacuum(table_name=table, full=compaction_cfg["vacuum_full"])
+
+        log.info(
+            f"{table}: {deleted[table]} rows deleted, "
+            f"size {sizes[table]} -> {mydb.table_size(table)} bytes"
+        )
+
+    mydb.close()
+
+
+@hydra.main(version_base=None, config_path="../conf", config_name="configs")
+def main(cfg: DictConfig):
+    """"""
+    run_compaction(cfg=cfg)
+
+
+if __name__ == "__main__":
+    main()
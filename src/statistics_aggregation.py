@@ -1,19 +1,56 @@
+import datetime
 import os
 
 import hydra
+import pandas as pd
 from omegaconf import DictConfig
 
 import database_connection
 
 
+def get_partitions(cfg: DictConfig) -> dict:
+    """
+    Seasons and leagues to aggregate.
+
+    Partitions are taken from statistics_aggregation.partitions ([[season, league_id], ...],
+    e.g. leagues succesfully extracted by DAG) or else all data_extraction.leagues
+    of selected seasons.
+
+    :param cfg: DictConfig - configs
+
+    :return: dict {season: [league ids]}
+    """
+    partitions = cfg["statistics_aggregation"]["partitions"]
+
+    if partitions is None:
+        # если первый запуск, то агрегируем всю историю от seasons[0] до seasons[-1]
+        if cfg["data_extraction"]["first_run"]:
+            seasons = cfg["data_extraction"]["seasons"]
+        # если запуск не первый, то агрегируем статистику только за последний сезон
+        else:
+            seasons = [cfg["data_extraction"]["seasons"][-1]]
+
+        partitions = [
+            [season, league]
+            for season in seasons
+            for league in cfg["data_extraction"]["leagues"]
+        ]
+
+    seasons = {}
+    for season, league in partitions:
+        seasons.setdefault(int(season), []).append(int(league))
+
+    return seasons
+
+
 def aggregate_statistics(
-    db_connection: database_connection, seasons: list, cfg: DictConfig
+    db_connection: database_connection, partitions: dict, cfg: DictConfig
 ) -> None:
     """
     Aggergate extracted statistics and put them to special tables in DB.
 
     :param db_connection: database_connection - opened PostgresDB connection
-    :param seasons: lisr - selected seasons to aggregate
+    :param partitions: dict - selected seasons and their leagues to aggregate
     :param cfg: DictConfig - configs
 
     :return: None
@@ -28,27 +65,122 @@ def aggregate_statistics(
         with open(os.path.join(statistics_aggregation_queries_path, file), "r") as f:
             query = f.read()
 
-            # update only selected seasons
-            for season in seasons:
+            # update only selected seasons & leagues
+            for season, leagues in partitions.items():
                 cursor = db_connection.conn.cursor()
 
-                cursor.execute(query, (str(season),))
+                cursor.execute(query, {"season": season, "leagues": leagues})
 
                 db_connection.conn.commit()
 
                 cursor.close()
 
 
-@hydra.main(version_base=None, config_path="../conf", config_name="configs")
-def main(cfg: DictConfig):
-    """"""
-    # если первый запуск, то извлекаем всю историю от seasons[0] до seasons[-1]
-    if cfg["data_extraction"]["first_run"]:
-        seasons = cfg["data_extraction"]["seasons"]
-    # если запуск не первый, то извлекаем статистику только за последний сезон
-    else:
-        seasons = [cfg["data_extraction"]["seasons"][-1]]
+def get_loaded_partitions(
+    db_connection: database_connection, run_id: str = None, partitions: dict = None
+) -> pd.DataFrame:
+    """
+    Partitions extracted after their last aggregation, according to load_log.
+
+    :param db_connection: database_connection - opened PostgresDB connection
+    :param run_id: str - only partitions of this extraction run (None - of all runs)
+    :param partitions: dict - only these seasons and their leagues (None - all)
+
+    :return: pd.DataFrame (season, league_id, league, run_id)
+    """
+    loaded = db_connection.query(
+        """
+        select distinct e.season, e.league_id, coalesce(l.name, e.league) as league, e.run_id
+        from load_log e
+        left join leagues l
+        on l.league_id = e.league_id
+        where e.stage = 'extraction'
+        and e.league_id is not null
+        and (%(run_id)s is null or e.run_id = %(run_id)s)
+        and e.time_extraction > coalesce(
+            (
+                select max(a.time_extraction)
+                from load_log a
+                where a.stage = 'aggregation'
+                and a.season = e.season
+                and a.league_id = e.league_id
+            ),
+            '-infinity'
+        )
+        """,
+        params={"run_id": run_id},
+    )
+
+    if partitions is not None:
+        selected = pd.MultiIndex.from_tuples(
+            [
+                (season, league)
+                for season, leagues in partitions.items()
+                for league in leagues
+            ]
+        )
+        loaded = loaded[
+            pd.MultiIndex.from_frame(loaded[["season", "league_id"]]).isin(selected)
+        ]
+
+    return loaded
+
+
+def aggregate_loaded(
+    db_connection: database_connection,
+    cfg: DictConfig,
+    run_id: str = None,
+    partitions: dict = None,
+) -> list:
+    """
+    Incremental aggregation: recompute only partitions extracted after their last
+    aggregation (see get_loaded_partitions) and log them with extraction run ids.
+
+    :param db_connection: database_connection - opened PostgresDB connection
+    :param cfg: DictConfig - configs
+    :param run_id: str - only partitions of this extraction run (None - of all runs)
+    :param partitions: dict - only these seasons and their leagues (None - all)
 
+    :return: list - aggregated (season, league)
+    """
+    loaded = get_loaded_partitions(
+        db_connection=db_connection, run_id=run_id, partitions=partitions
+    )
+
+    if loaded.empty:
+        return []
+
+    partitions = {
+        int(season): sorted(int(i) for i in set(data["league_id"]))
+        for season, data in loaded.groupby("season")
+    }
+
+    aggregate_statistics(db_connection=db_connection, partitions=partitions, cfg=cfg)
+
+    time_extraction = datetime.datetime.now()
+    for run, run_loaded in loaded.groupby("run_id", dropna=False):
+        db_connection.log_load(
+            stage="aggregation",
+            partitions=run_loaded[["season", "league_id", "league"]]
+            .drop_duplicates()
+            .itertuples(index=False),
+            time_extraction=time_extraction,
+            run_id=None if pd.isna(run) else run,
+        )
+
+    return sorted(set(loaded[["season", "league"]].itertuples(index=False, name=None)))
+
+
+def run_aggregation(cfg: DictConfig) -> None:
+    """
+    Aggregate statistics of loaded partitions (see aggregate_loaded, limited to
+    statistics_aggregation.partitions if set) or selected partitions
+    (see get_partitions) and log them.
+
+    :param cfg: DictConfig - configs
+
+    :return: None
+    """
     # db connection
     mydb = database_connection.SoccerDatabase(
         host=cfg["db"]["host"],
@@ -58,10 +190,47 @@ def main(cfg: DictConfig):
         port=cfg["db"]["port"],
     )
 
-    aggregate_statistics(db_connection=mydb, seasons=seasons, cfg=dict(cfg))
+    # only partitions loaded since their last aggregation
+    if cfg["statistics_aggregation"]["incremental"]:
+        aggregate_loaded(
+            db_connection=mydb,
+            cfg=cfg,
+            partitions=(
+                get_partitions(cfg=cfg)
+                if cfg["statistics_aggregation"]["partitions"] is not None
+                else None
+            ),
+        )
+        mydb.close()
+
+        return
+
+    partitions = get_partitions(cfg=cfg)
+
+    aggregate_statistics(db_connection=mydb, partitions=partitions, cfg=dict(cfg))
+
+    # log aggregated seasons & leagues (with names for dashboard versions)
+    league_names = dict(
+        mydb.query("select league_id, name from leagues").itertuples(index=False)
+    )
+    mydb.log_load(
+        stage="aggregation",
+        partitions=[
+            (season, league, league_names[league])
+            for season, leagues in partitions.items()
+            for league in leagues
+        ],
+        time_extraction=datetime.datetime.now(),
+    )
 
     mydb.close()
 
 
+@hydra.main(version_base=None, config_path="../conf", config_name="configs")
+def main(cfg: DictConfig):
+    """"""
+    run_aggregation(cfg=cfg)
+
+
 if __name__ == "__main__":
     main()
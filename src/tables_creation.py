@@ -29,6 +29,11 @@ def main(cfg: DictConfig):
 
                 mydb.create_table(query=q)
 
+    # idempotent schema changes of existing tables
+    for file in sorted(os.listdir(cfg["sql"]["migrations_queries_path"])):
+        with open(os.path.join(cfg["sql"]["migrations_queries_path"], file), "r") as f:
+            mydb.create_table(query=f.read())
+
     mydb.close()
 
 
@@ -1,7 +1,8 @@
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 
+from utils_dash.utils_figures import to_array
+
 
 def create_aggregated_goals_plot(data: pd.DataFrame):
     """
@@ -14,37 +15,30 @@ def create_aggregated_goals_plot(data: pd.DataFrame):
         .reset_index()
     )
 
-    fig_sum = go.Figure()
-    fig_mean = go.Figure()
-
-    for league in goals_aggs["league"].unique():
-        fig_sum.add_trace(
-            go.Scatter(
-                x=goals_aggs[goals_aggs["league"] == league]["season"],
-                y=goals_aggs[goals_aggs["league"] == league]["sum"],
-                mode="lines",
-                name=league,
-            )
-        )
-
-        fig_mean.add_trace(
-            go.Scatter(
-                x=goals_aggs[goals_aggs["league"] == league]["season"],
-                y=goals_aggs[goals_aggs["league"] == league]["mean"],
-                mode="lines",
-                name=league,
+    figs = []
+
+    for name, column in zip(["Sum", "Mean"], ["sum", "mean"]):
+        figs.append(
+            go.Figure(
+                data=[
+                    go.Scatter(
+                        x=to_array(league_aggs["season"]),
+                        y=to_array(league_aggs[column]),
+                        mode="lines",
+                        name=league,
+                    )
+                    for league, league_aggs in goals_aggs.groupby("league", sort=False)
+                ],
+                layout=dict(
+                    yaxis_title="goals",
+                    height=400,
+                    width=1200,
+                    title_text=f"{name} of Scored goals through seasons",
+                ),
             )
         )
 
-    for fig, name in zip([fig_sum, fig_mean], ["Sum", "Mean"]):
-        fig.update_layout(
-            yaxis_title="goals",
-            height=400,
-            width=1200,
-            plot_bgcolor="white",
-            yaxis=dict(showgrid=True, gridcolor="lightgrey"),
-            title_text=f"{name} of Scored goals through seasons",
-        )
+    fig_sum, fig_mean = figs
 
     return fig_sum, fig_mean
 
@@ -53,9 +47,6 @@ def create_aggregated_cards_plot(data: pd.DataFrame):
     """
     Selected leagues aggregated goals plots.
     """
-    fig_sum = go.Figure()
-    fig_mean = go.Figure()
-
     cards_aggs = (
         data.groupby(["color", "league"])["sum_number"]
         .agg(["mean", "sum"])
@@ -63,39 +54,38 @@ def create_aggregated_cards_plot(data: pd.DataFrame):
     )
     cards_aggs["mean"] = cards_aggs["mean"].round(2)
 
-    for card, color in zip(["yellow", "red"], ["#E7E19B", "#E69CA5"]):
-        fig_sum.add_trace(
-            go.Bar(
-                y=cards_aggs[cards_aggs["color"] == card]["league"],
-                x=cards_aggs[cards_aggs["color"] == card]["sum"],
-                name=card,
-                text=[i for i in cards_aggs[cards_aggs["color"] == card]["sum"]],
-                orientation="h",
-                marker=dict(color=color, line=dict(color="#000000", width=0.75)),
+    figs = []
+
+    for name, column in zip(["Sum", "Mean"], ["sum", "mean"]):
+        traces = []
+
+        for card, color in zip(["yellow", "red"], ["#E7E19B", "#E69CA5"]):
+            card_aggs = cards_aggs[cards_aggs["color"] == card]
+
+            traces.append(
+                go.Bar(
+                    y=to_array(card_aggs["league"]),
+                    x=to_array(card_aggs[column]),
+                    name=card,
+                    text=to_array(card_aggs[column]),
+                    orientation="h",
+                    marker_color=color,
+                )
             )
-        )
 
-    for card, color in zip(["yellow", "red"], ["#E7E19B", "#E69CA5"]):
-        fig_mean.add_trace(
-            go.Bar(
-                y=cards_aggs[cards_aggs["color"] == card]["league"],
-                x=cards_aggs[cards_aggs["color"] == card]["mean"],
-                name=card,
-                text=[i for i in cards_aggs[cards_aggs["color"] == card]["mean"]],
-                orientation="h",
-                marker=dict(color=color, line=dict(color="#000000", width=0.75)),
+        figs.append(
+            go.Figure(
+                data=traces,
+                layout=dict(
+                    yaxis_title="cards",
+                    height=400,
+                    width=600,
+                    title_text=f"{name} of cards",
+                ),
             )
         )
 
-    for fig, name in zip([fig_sum, fig_mean], ["Sum", "Mean"]):
-        fig.update_layout(
-            yaxis_title="cards",
-            height=400,
-            width=600,
-            plot_bgcolor="white",
-            yaxis=dict(showgrid=True, gridcolor="lightgrey"),
-            title_text=f"{name} of cards",
-        )
+    fig_sum, fig_mean = figs
 
     return fig_sum, fig_mean
 
@@ -107,22 +97,26 @@ def create_aggregated_cleansheets_plot(data: pd.DataFrame):
     cs_aggs = data.groupby(["league"])["sum_games"].agg(["mean", "sum"]).reset_index()
     cs_aggs["mean"] = cs_aggs["mean"].round(2)
 
-    fig = px.bar(
-        cs_aggs,
-        x="league",
-        y="sum",
-        color="league",
-        text_auto=".s",
-        title="Sum of Cleansheets",
-    )
-
-    fig.update_layout(
-        height=400,
-        width=1200,
-        plot_bgcolor="white",
-        yaxis=dict(showgrid=True, gridcolor="lightgrey"),
+    fig = go.Figure(
+        data=[
+            go.Bar(
+                x=to_array(league_aggs["league"]),
+                y=to_array(league_aggs["sum"]),
+                name=league,
+                legendgroup=league,
+                texttemplate="%{y:.s}",
+            )
+            for league, league_aggs in cs_aggs.groupby("league", sort=False)
+        ],
+        layout=dict(
+            barmode="relative",
+            xaxis_title="league",
+            yaxis_title="sum",
+            legend_title_text="league",
+            height=400,
+            width=1200,
+            title_text="Sum of Cleansheets",
+        ),
     )
 
-    fig.update_traces(marker=dict(line=dict(color="#000000", width=0.75)))
-
     return fig
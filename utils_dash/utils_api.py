@@ -0,0 +1,276 @@
+import datetime
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+import pyarrow as pa
+from flask import Blueprint, Response, abort, jsonify, request
+
+import src.database_connection as database_connection
+from utils_dash.utils_data import TABLES, DashboardData
+
+JSON_MIMETYPE = "application/json"
+ARROW_MIMETYPE = "application/vnd.apache.arrow.stream"
+
+# sizes of exports kept for Range requests
+EXPORT_SIZES = 256
+
+
+def to_arrow(data: pd.DataFrame) -> bytes:
+    """
+    Dataframe as Arrow IPC stream.
+    """
+    table = pa.Table.from_pandas(data, preserve_index=False)
+    sink = pa.BufferOutputStream()
+
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+
+    return sink.getvalue().to_pybytes()
+
+
+def select_data(
+    data: DashboardData, name: str, season=None, league=None, team=None
+) -> pd.DataFrame:
+    """
+    Dashboard data filtered by season, league and team (None - all).
+    """
+    if season is not None and league is not None:
+        selected = data.get_slice(name, season, league)
+    else:
+        selected = data[name]
+        if season is not None:
+            selected = selected[selected["season"] == season]
+        if league is not None:
+            selected = selected[selected["league"] == league]
+
+    if team is not None:
+        selected = selected[selected["team"] == team]
+
+    return selected.reset_index(drop=True)
+
+
+def is_known(data: DashboardData, name: str, season=None, league=None, team=None):
+    """
+    Season, league and team (None - any) are present in dashboard data.
+    """
+    keys = data.state.slices[name]
+
+    if season is not None and season not in {key[0] for key in keys}:
+        return False
+    if league is not None and league not in {key[1] for key in keys}:
+        return False
+    if team is not None:
+        teams = data.cached(
+            name=("api_teams", name),
+            builder=lambda d: set(d[name]["team"]) if "team" in d[name] else set(),
+        )
+        if team not in teams:
+            return False
+
+    return True
+
+
+def create_api_blueprint(
+    data: DashboardData,
+    db_connection=None,
+    export_tables: list = (),
+    max_age: int = 60,
+    compress_min_size: int = 500,
+) -> Blueprint:
+    """
+    Read-only HTTP API over dashboard data: GET /<name>?season=&league=&team=
+    for every name of TABLES (format=json|arrow or Accept header).
+
+    Encoded (and gzipped) responses are cached per data version, ETag is keyed on
+    data version and query, so conditional GETs are answered with 304 without
+    encoding. Unknown seasons, leagues and teams are answered with 404, so cached
+    responses are bounded by dashboard data.
+
+    Whole tables are streamed from DB by GET /export/<table>?season=&league=
+    &date_from=&date_to=&format=csv|ndjson|parquet with Range requests support.
+
+    params:
+        data - DashboardData served by dashboard
+        db_connection - database_connection.SoccerDatabasePool for exports
+                        (dedicated: exports hold connections while streaming)
+        export_tables - tables allowed to export
+        max_age - Cache-Control max-age in seconds
+        compress_min_size - min size of response body to gzip
+    """
+    api = Blueprint("api", __name__)
+
+    # sizes of exports by ETag (least recently used are dropped): known from full
+    # downloads only, Range requests of unknown size are answered with full body
+    export_sizes = OrderedDict()
+    export_sizes_lock = threading.Lock()
+
+    def remember_size(etag, size):
+        with export_sizes_lock:
+            export_sizes[etag] = size
+            export_sizes.move_to_end(etag)
+            while len(export_sizes) > EXPORT_SIZES:
+                export_sizes.popitem(last=False)
+
+    def get_size(etag):
+        with export_sizes_lock:
+            size = export_sizes.get(etag)
+            if size is not None:
+                export_sizes.move_to_end(etag)
+
+        return size
+
+    def counted(etag, chunks):
+        size = 0
+        for chunk in chunks:
+            size += len(chunk)
+            yield chunk
+
+        remember_size(etag, size)
+
+    def parse_int(name, value):
+        # type=int of request.args drops invalid values silently
+        try:
+            return int(value)
+        except ValueError:
+            abort(400, description=f"Invalid {name}: {value}")
+
+    def get_date(name):
+        value = request.args.get(name)
+        if value is None:
+            return None
+
+        try:
+            return datetime.datetime.fromisoformat(value)
+        except ValueError:
+            abort(400, description=f"Invalid {name}: {value}")
+
+    def encode(name, season, league, team, fmt) -> dict:
+        selected = select_data(
+            data=data, name=name, season=season, league=league, team=team
+        )
+
+        if fmt == "arrow":
+            body = to_arrow(selected)
+        else:
+            body = selected.to_json(orient="records", date_format="iso").encode()
+
+        return {
+            "body": body,
+            "gzip": gzip.compress(body) if len(body) >= compress_min_size else None,
+        }
+
+    def respond(payload: dict, mimetype: str, etag: str) -> Response:
+        if request.if_none_match.contains_weak(etag):
+            response = Response(status=304)
+        elif payload["gzip"] is not None and "gzip" in request.accept_encodings:
+            response = Response(payload["gzip"], mimetype=mimetype)
+            response.headers["Content-Encoding"] = "gzip"
+        else:
+            response = Response(payload["body"], mimetype=mimetype)
+
+        response.set_etag(etag, weak=True)
+        response.headers["Cache-Control"] = f"public, max-age={max_age}"
+        response.headers["Vary"] = "Accept, Accept-Encoding"
+
+        return response
+
+    @api.route("/version")
+    def get_version():
+        return jsonify(version=data.version)
+
+    @api.route("/<name>")
+    def get_statistics(name):
+        if name not in TABLES:
+            abort(404)
+
+        season = request.args.get("season")
+        if season is not None:
+            season = parse_int("season", season)
+        league = request.args.get("league")
+        team = request.args.get("team")
+
+        fmt = request.args.get("format")
+        if fmt is None:
+            fmt = "arrow" if request.accept_mimetypes.best == ARROW_MIMETYPE else "json"
+        if fmt not in ("json", "arrow"):
+            abort(400, description=f"Unknown format: {fmt}")
+
+        if not is_known(data=data, name=name, season=season, league=league, team=team):
+            abort(404)
+
+        etag = hashlib.md5(
+            f"{data.version}|{name}|{season}|{league}|{team}|{fmt}".encode()
+        ).hexdigest()
+
+        payload = data.cached(
+            name=("api", name, season, league, team, fmt),
+            builder=lambda _: encode(name, season, league, team, fmt),
+        )
+
+        return respond(
+            payload=payload,
+            mimetype=ARROW_MIMETYPE if fmt == "arrow" else JSON_MIMETYPE,
+            etag=etag,
+        )
+
+    @api.route("/export/<table>")
+    def get_export(table):
+        if db_connection is None or table not in export_tables:
+            abort(404)
+
+        fmt = request.args.get("format", "csv")
+        if fmt not in database_connection.EXPORT_FORMATS:
+            abort(400, description=f"Unknown format: {fmt}")
+
+        params = dict(
+            fmt=fmt,
+            seasons=[
+                parse_int("season", value) for value in request.args.getlist("season")
+            ],
+            leagues=request.args.getlist("league"),
+            date_from=get_date("date_from"),
+            date_to=get_date("date_to"),
+        )
+
+        def stream():
+            return db_connection.stream_export(table, **params)
+
+        # same data version and filters give byte to byte the same export
+        etag = hashlib.md5(
+            f"{db_connection.data_version()}|{table}|{sorted(params.items())}".encode()
+        ).hexdigest()
+        headers = {
+            "Accept-Ranges": "bytes",
+            "Content-Disposition": f"attachment; filename={table}.{fmt}",
+            "ETag": f'"{etag}"',
+        }
+        mimetype = database_connection.EXPORT_FORMATS[fmt]
+
+        # size unknown: full body (200) instead of streaming the export twice
+        size = get_size(etag)
+        if (
+            request.range is None
+            or size is None
+            or (request.if_range.etag is not None and request.if_range.etag != etag)
+        ):
+            return Response(counted(etag, stream()), mimetype=mimetype, headers=headers)
+
+        byte_range = request.range.range_for_length(size)
+        if byte_range is None:
+            return Response(status=416, headers={"Content-Range": f"bytes */{size}"})
+
+        start, stop = byte_range
+        headers["Content-Range"] = f"bytes {start}-{stop - 1}/{size}"
+        headers["Content-Length"] = str(stop - start)
+
+        return Response(
+            database_connection.slice_bytes(stream(), start=start, stop=stop),
+            status=206,
+            mimetype=mimetype,
+            headers=headers,
+        )
+
+    return api
@@ -0,0 +1,417 @@
+import hashlib
+import logging
+import select
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pandas as pd
+import psycopg2
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
+import src.database_connection as database_connection
+
+log = logging.getLogger(__name__)
+
+# dashboard data name -> DB table and its preprocessing
+TABLES = {
+    "standings": {"table": "standings", "drop": ["description"]},
+    "topscorers": {"table": "topscorers"},
+    "lineups": {"table": "lineups"},
+    "penalties": {"table": "penalties"},
+    "cleansheets": {"table": "cleansheets"},
+    "cards_aggregations": {"table": "cards_aggregations"},
+    "cleansheets_aggregations": {"table": "cleansheets_aggregations"},
+    "goals_aggregations": {"table": "goals_aggregations"},
+    "cards": {
+        "table": "cards_minutes_aggregations",
+        "rename": {"sum_number": "number"},
+        "by_minute": True,
+    },
+    "goals_distribution": {
+        "table": "goals_minutes_aggregations",
+        "rename": {"sum_goals": "goals"},
+        "by_minute": True,
+    },
+    # all extraction dates, not only the last snapshot
+    "standings_progression": {
+        "table": "standings_progression",
+        "history": True,
+        "keep": ["date_extraction"],
+    },
+}
+
+# consistent view of served data: frames, their (season, league) slices and versions
+DataState = namedtuple("DataState", ["frames", "slices", "versions", "version"])
+
+
+def filter_max_date(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Фильтрация данных по максимальной дате экстракции статистики.
+
+    :param data: pd.DataFrame со статистикой
+
+    :return: pd.DataFrame
+    """
+    max_date = data.groupby(["season", "league"])["time_extraction"].max().reset_index()
+
+    data = data.merge(max_date, on=["season", "league", "time_extraction"])
+
+    return data.reset_index(drop=True)
+
+
+def sort_by_minute(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Сортировка поминутной статистики по началу отрезка матча ("0-15", "16-30", ...).
+
+    :param data: pd.DataFrame с колонкой minute
+
+    :return: pd.DataFrame
+    """
+    minute_start = data["minute"].str.split("-").str[0].astype(int)
+
+    return data.iloc[minute_start.argsort(kind="stable")].reset_index(drop=True)
+
+
+def split_by_season_league(data: pd.DataFrame) -> dict:
+    """
+    Разбиение данных на срезы по сезону и турниру.
+
+    :param data: pd.DataFrame со статистикой
+
+    :return: dict {(season, league): pd.DataFrame}
+    """
+    return {
+        key: slice_data.reset_index(drop=True)
+        for key, slice_data in data.groupby(["season", "league"])
+    }
+
+
+def get_data(table_name, db_connection, season=None, league=None, history=False):
+    """
+    Выгрузка таблицы целиком или последнего снапшота сезона и турнира
+    (через COPY ... TO STDOUT, см. database_connection.copy_to_dataframe).
+
+    :param table_name: str название таблицы
+    :param db_connection: database_connection.SoccerDatabase
+    :param season: сезон (None - вся таблица)
+    :param league: турнир (None - вся таблица)
+    :param history: bool все снапшоты сезона и турнира, а не только последний
+
+    :return: pd.DataFrame
+    """
+    if season is None:
+        return db_connection.copy_query(f"select * from {table_name}")
+
+    if history:
+        return db_connection.copy_query(
+            f"select * from {table_name} where season = %(season)s and league = %(league)s",
+            params={"season": int(season), "league": league},
+        )
+
+    data = db_connection.copy_query(
+        f"""
+        select * from {table_name}
+        where season = %(season)s and league = %(league)s
+        and time_extraction = (
+            select max(time_extraction) from {table_name}
+            where season = %(season)s and league = %(league)s
+        )
+        """,
+        params={"season": int(season), "league": league},
+    )
+
+    return data
+
+
+def prepare_data(data: pd.DataFrame, redundant_columns: list, **spec) -> pd.DataFrame:
+    """
+    Подготовка выгруженной таблицы для дашборда: последний снапшот (кроме таблиц
+    с историей), удаление лишних колонок, переименование и сортировка по минутам.
+
+    :param data: pd.DataFrame выгруженная таблица
+    :param redundant_columns: list колонок, не нужных дашборду
+    :param spec: описание таблицы из TABLES
+
+    :return: pd.DataFrame
+    """
+    if not spec.get("history"):
+        data = filter_max_date(data=data)
+
+    drop = [
+        i
+        for i in redundant_columns + spec.get("drop", [])
+        if i in data and i not in spec.get("keep", [])
+    ]
+    data = data.drop(drop, axis=1).rename(columns=spec.get("rename", {}))
+
+    if spec.get("by_minute"):
+        data = sort_by_minute(data=data)
+
+    return data
+
+
+def get_versions(db_connection) -> dict:
+    """
+    Версии данных: время последней агрегации каждого сезона и турнира из load_log.
+
+    :param db_connection: database_connection.SoccerDatabase
+
+    :return: dict {(season, league): time_extraction}
+    """
+    versions = db_connection.query(
+        """
+        select season, league, max(time_extraction) as time_extraction
+        from load_log
+        where stage = 'aggregation'
+        group by season, league
+        """
+    )
+
+    return {
+        (season, league): time_extraction
+        for season, league, time_extraction in versions.itertuples(index=False)
+    }
+
+
+class DashboardData:
+    """
+    Data served by dashboard.
+
+    Whole state (frames, slices, versions) is replaced by a single assignment, so
+    callbacks always read one consistent snapshot via DashboardData.state.
+    """
+
+    def __init__(self, redundant_columns: list):
+        self.redundant_columns = list(redundant_columns)
+        self.state = DataState(frames={}, slices={}, versions={}, version=None)
+
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._cache = {}
+
+    def __getitem__(self, name) -> pd.DataFrame:
+        return self.state.frames[name]
+
+    @property
+    def version(self) -> str:
+        return self.state.version
+
+    def get_slice(self, name, season, league) -> pd.DataFrame:
+        """
+        Season & league slice of data (empty dataframe if there is no such slice).
+        """
+        state = self.state
+
+        return state.slices[name].get((season, league), state.frames[name].iloc[:0])
+
+    def get_slice_as_of(self, name, season, league, as_of, db_connection):
+        """
+        Season & league slice of data as it was on as_of date (last snapshot extracted
+        on that day or before), latest slice if as_of is None.
+        """
+        if as_of is None:
+            return self.get_slice(name, season, league)
+
+        spec = TABLES[name]
+        # end of as_of day
+        as_of = (
+            pd.Timestamp(as_of).normalize()
+            + pd.Timedelta(days=1)
+            - pd.Timedelta(microseconds=1)
+        )
+
+        data = db_connection.query_as_of(
+            table_name=spec["table"], season=season, league=league, as_of=as_of
+        )
+
+        if data.empty:
+            return self.state.frames[name].iloc[:0]
+
+        return prepare_data(data=data, redundant_columns=self.redundant_columns, **spec)
+
+    def cached(self, name, builder):
+        """
+        Result of builder(self) computed once per data version: concurrent calls
+        with the same name wait for the first one instead of building again.
+        """
+        key = (name, self.version)
+
+        with self._lock:
+            future = self._cache.get(key)
+            leader = future is None
+
+            if leader:
+                future = self._cache[key] = Future()
+
+        if leader:
+            try:
+                future.set_result(builder(self))
+            except Exception as error:
+                # next call builds again
+                with self._lock:
+                    if self._cache.get(key) is future:
+                        del self._cache[key]
+
+                future.set_exception(error)
+
+        return future.result()
+
+    def _swap(self, frames: dict, versions: dict):
+        slices = {
+            name: split_by_season_league(data=data) for name, data in frames.items()
+        }
+        version = hashlib.md5(repr(sorted(versions.items())).encode()).hexdigest()
+        state = DataState(
+            frames=frames, slices=slices, versions=versions, version=version
+        )
+
+        with self._lock:
+            self.state = state
+            # drop results of previous versions (calls in flight keep their futures)
+            self._cache = {k: v for k, v in self._cache.items() if k[1] == version}
+
+    def _load_table(self, name, db_connection) -> pd.DataFrame:
+        spec = TABLES[name]
+
+        start = time.perf_counter()
+        data = get_data(table_name=spec["table"], db_connection=db_connection)
+        fetched = time.perf_counter()
+        prepared = prepare_data(
+            data=data, redundant_columns=self.redundant_columns, **spec
+        )
+
+        log.info(
+            f"Loaded {name}: {len(data)} rows fetched in {fetched - start:.2f}s, "
+            f"{len(prepared)} rows prepared in {time.perf_counter() - fetched:.2f}s"
+        )
+
+        return prepared
+
+    def load(self, db_connection, max_workers: int = 1):
+        """
+        Full load of all dashboard tables.
+
+        Tables are fetched and prepared concurrently by max_workers threads, so
+        db_connection should be database_connection.SoccerDatabasePool when
+        max_workers > 1.
+        """
+        start = time.perf_counter()
+        versions = get_versions(db_connection=db_connection)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                name: executor.submit(self._load_table, name, db_connection)
+                for name in TABLES
+            }
+            frames = {name: future.result() for name, future in futures.items()}
+
+        self._swap(frames=frames, versions=versions)
+
+        log.info(f"Dashboard data loaded in {time.perf_counter() - start:.2f}s")
+
+    def refresh(self, db_connection) -> list:
+        """
+        Reload only (season, league) slices which have new data version.
+
+        :return: list of reloaded (season, league)
+        """
+        # refreshes are serialized, callbacks keep reading current state meanwhile
+        with self._refresh_lock:
+            state = self.state
+            versions = get_versions(db_connection=db_connection)
+            changed = [
+                key
+                for key, version in versions.items()
+                if state.versions.get(key) != version
+            ]
+
+            if not changed:
+                return []
+
+            frames = {}
+            for name, spec in TABLES.items():
+                data = state.frames[name]
+                keep = ~pd.MultiIndex.from_frame(data[["season", "league"]]).isin(
+                    changed
+                )
+                changed_data = [
+                    prepare_data(
+                        data=get_data(
+                            table_name=spec["table"],
+                            db_connection=db_connection,
+                            season=season,
+                            league=league,
+                            history=spec.get("history", False),
+                        ),
+                        redundant_columns=self.redundant_columns,
+                        **spec,
+                    )
+                    for season, league in changed
+                ]
+
+                frames[name] = pd.concat([data[keep]] + changed_data, ignore_index=True)
+
+            self._swap(frames=frames, versions=versions)
+
+        log.info(f"Data refreshed for {changed}, version {self.version}")
+
+        return changed
+
+
+class DataRefresher(threading.Thread):
+    """
+    Background refresh of dashboard data.
+
+    Waits for notification of new load (LISTEN on DATA_VERSION_CHANNEL) or checks
+    load_log every interval seconds, then reloads changed slices of data.
+    """
+
+    def __init__(
+        self, data: DashboardData, db: dict, interval: int = 300, retry: int = 10
+    ):
+        super().__init__(name="data_refresher", daemon=True)
+
+        self.data = data
+        self.db = dict(db)
+        self.interval = interval
+        self.retry = retry
+
+    def refresh(self):
+        try:
+            mydb = database_connection.SoccerDatabase(**self.db)
+            try:
+                self.data.refresh(db_connection=mydb)
+            finally:
+                mydb.close()
+        except Exception:
+            log.exception("Data refresh failed")
+
+    def run(self):
+        # LISTEN connection is opened again after failures, loads notified while
+        # it was down are caught by refresh right after reconnect
+        while True:
+            conn = None
+
+            try:
+                conn = psycopg2.connect(**self.db)
+                conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+
+                cursor = conn.cursor()
+                cursor.execute(f"LISTEN {database_connection.DATA_VERSION_CHANNEL};")
+
+                while True:
+                    self.refresh()
+
+                    if select.select([conn], [], [], self.interval) != ([], [], []):
+                        conn.poll()
+                        conn.notifies.clear()
+            except Exception:
+                log.exception(
+                    f"Data refresh listener failed, reconnect in {self.retry}s"
+                )
+                time.sleep(self.retry)
+            finally:
+                if conn is not None:
+                    conn.close()
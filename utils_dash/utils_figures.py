@@ -0,0 +1,63 @@
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+
+TEMPLATE = "soccer"
+MARKER_LINE = dict(color="#000000", width=0.75)
+
+
+def register_template(name: str = TEMPLATE) -> None:
+    """
+    Register dashboard template and make it default for all figures.
+
+    Template holds layout and traces settings shared by utils_dash builders, so they
+    don't re-apply them with update_layout/update_traces for every figure.
+    """
+    template = go.layout.Template(pio.templates["plotly"])
+    template.layout.update(
+        plot_bgcolor="white", yaxis=dict(showgrid=True, gridcolor="lightgrey")
+    )
+    template.data.bar = [go.Bar(marker=dict(line=MARKER_LINE))]
+    template.data.pie = [go.Pie(marker=dict(line=MARKER_LINE))]
+
+    pio.templates[name] = template
+    pio.templates.default = name
+
+
+def to_array(values) -> np.ndarray:
+    """
+    Values (pd.Series, list) as NumPy array to build traces from.
+    """
+    return np.asarray(values)
+
+
+def split_domains(cols: int, spacing: float = 0.001) -> list:
+    """
+    Horizontal domains of one-row subplots, same as make_subplots(rows=1, cols=cols).
+    """
+    width = (1 - spacing * (cols - 1)) / cols
+
+    return [[i * (width + spacing), i * (width + spacing) + width] for i in range(cols)]
+
+
+def create_subplot_titles(titles: list, domains: list) -> list:
+    """
+    Subplots titles annotations, same as make_subplots(subplot_titles=titles).
+    """
+    return [
+        dict(
+            text=title,
+            x=sum(domain) / 2,
+            y=1.0,
+            xref="paper",
+            yref="paper",
+            xanchor="center",
+            yanchor="bottom",
+            showarrow=False,
+            font=dict(size=16),
+        )
+        for title, domain in zip(titles, domains)
+    ]
+
+
+register_template()
@@ -1,5 +1,11 @@
+from collections import namedtuple
+
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
+from dash import Patch
+
+from utils_dash.utils_figures import create_subplot_titles, split_domains, to_array
 
 
 def create_barplot(data: pd.DataFrame, column: str, team: str, horizontal=False):
@@ -15,10 +21,10 @@ def create_barplot(data: pd.DataFrame, column: str, team: str, horizontal=False)
     if horizontal:
         if team in data["team"].unique():
             fig = go.Bar(
-                y=data["team"],
-                x=data[column],
+                y=to_array(data["team"]),
+                x=to_array(data[column]),
                 name=team,
-                text=[i for i in data[column]],
+                text=to_array(data[column]),
                 orientation="h",
             )
         else:
@@ -32,10 +38,10 @@ def create_barplot(data: pd.DataFrame, column: str, team: str, horizontal=False)
     else:
         if team in data["team"].unique():
             fig = go.Bar(
-                x=data["team"],
-                y=data[column],
+                x=to_array(data["team"]),
+                y=to_array(data[column]),
                 name=team,
-                text=[i for i in data[column]],
+                text=to_array(data[column]),
             )
         else:
             fig = go.Bar(
@@ -43,3 +49,311 @@ def create_barplot(data: pd.DataFrame, column: str, team: str, horizontal=False)
             )
 
     return fig
+
+
+# statistics of comparison traces with their colors/titles
+RESULTS_TRACES = [("win", "#7BD190"), ("draw", "#E7E19B"), ("lose", "#E69CA5")]
+GOALS_TRACES = [("for", "scored"), ("against", "missed")]
+CARDS_TRACES = [("yellow", "#E7E19B"), ("red", "#E69CA5")]
+
+
+# statistics of teams in H2H comparison matrix
+H2H_COLUMNS = ["points", "win", "draw", "lose", "for", "against", "yellow", "red"]
+
+# team x statistic matrix of season & league: row of every team, whether team is
+# in standings, values with extra zero row for teams out of season & league
+H2HMatrix = namedtuple("H2HMatrix", ["teams", "listed", "values"])
+
+
+def create_h2h_matrix(
+    standings: pd.DataFrame, goals: pd.DataFrame, cards: pd.DataFrame
+) -> H2HMatrix:
+    """
+    Statistics of all teams of season & league for comparison.
+
+    params:
+        standings - season & league standings
+        goals - season & league goals aggregations (sum_goals by team & direction)
+        cards - season & league cards aggregations (sum_number by team & color)
+    """
+    goals_sum = goals.pivot_table(
+        index="team", columns="direction", values="sum_goals", aggfunc="sum"
+    )
+    cards_sum = cards.pivot_table(
+        index="team", columns="color", values="sum_number", aggfunc="sum"
+    )
+
+    statistics = (
+        standings.set_index("team")[["points", "win", "draw", "lose"]]
+        .join(goals_sum, how="outer")
+        .join(cards_sum, how="outer")
+        .reindex(columns=H2H_COLUMNS)
+        .fillna(0)
+        .astype(int)
+    )
+
+    values = np.zeros((len(statistics) + 1, len(H2H_COLUMNS)), dtype=int)
+    values[:-1] = statistics.to_numpy()
+
+    return H2HMatrix(
+        teams={team: i for i, team in enumerate(statistics.index)},
+        listed=np.append(statistics.index.isin(standings["team"]), False),
+        values=values,
+    )
+
+
+def create_h2h_matrices(
+    standings_slices: dict, goals_slices: dict, cards_slices: dict
+) -> dict:
+    """
+    H2H matrices of every season & league: {(season, league): H2HMatrix}.
+    """
+    return {
+        key: create_h2h_matrix(
+            standings=standings,
+            goals=goals_slices.get(
+                key, pd.DataFrame(columns=["team", "direction", "sum_goals"])
+            ),
+            cards=cards_slices.get(
+                key, pd.DataFrame(columns=["team", "color", "sum_number"])
+            ),
+        )
+        for key, standings in standings_slices.items()
+    }
+
+
+def gather_h2h_statistics(matrix: H2HMatrix, teams: list) -> pd.DataFrame:
+    """
+    Selected teams statistics for comparison, one row per team in selection order:
+    rows of H2H matrix gathered by team positions.
+
+    params:
+        matrix - H2HMatrix of season & league (None - no data)
+        teams - selected teams
+    """
+    if matrix is None:
+        matrix = H2HMatrix(
+            teams={},
+            listed=np.zeros(1, dtype=bool),
+            values=np.zeros((1, len(H2H_COLUMNS)), dtype=int),
+        )
+
+    # teams out of season & league point to zero row
+    rows = np.array([matrix.teams.get(team, -1) for team in teams], dtype=int)
+
+    statistics = pd.DataFrame(
+        matrix.values[rows], index=pd.Index(teams, name="team"), columns=H2H_COLUMNS
+    )
+    statistics["listed"] = matrix.listed[rows]
+
+    return statistics
+
+
+def create_h2h_statistics(
+    standings: pd.DataFrame, goals: pd.DataFrame, cards: pd.DataFrame, teams: list
+) -> pd.DataFrame:
+    """
+    Selected teams statistics for comparison, one row per team in selection order.
+
+    params:
+        standings - season & league standings
+        goals - season & league goals aggregations (sum_goals by team & direction)
+        cards - season & league cards aggregations (sum_number by team & color)
+        teams - selected teams
+    """
+    return gather_h2h_statistics(
+        matrix=create_h2h_matrix(standings=standings, goals=goals, cards=cards),
+        teams=teams,
+    )
+
+
+def create_points_trace(statistics: pd.DataFrame, team: str) -> go.Bar:
+    """
+    Selected team points barplot.
+    """
+    data = statistics.loc[[team]]
+
+    return create_barplot(
+        data=data[data["listed"]].reset_index(), column="points", team=team
+    )
+
+
+def create_points_comparison(statistics: pd.DataFrame) -> go.Figure:
+    """
+    Points comparison of selected teams, one trace per team.
+    """
+    fig = go.Figure(
+        data=[
+            create_points_trace(statistics=statistics, team=team)
+            for team in statistics.index
+        ],
+        layout=dict(yaxis_title="points", title_text="Points comparison"),
+    )
+
+    return fig
+
+
+def create_results_comparison(statistics: pd.DataFrame) -> go.Figure:
+    """
+    Win/draw/lose comparison of selected teams.
+    """
+    teams = to_array(statistics.index)
+
+    fig = go.Figure(
+        data=[
+            go.Bar(
+                y=teams,
+                x=to_array(statistics[column]),
+                name=column,
+                text=to_array(statistics[column]),
+                orientation="h",
+                marker_color=color,
+            )
+            for column, color in RESULTS_TRACES
+        ],
+        layout=dict(
+            yaxis_title="teams", title_text="Results comparison", barmode="stack"
+        ),
+    )
+
+    return fig
+
+
+def create_goals_comparison(statistics: pd.DataFrame) -> go.Figure:
+    """
+    Scored/missed goals comparison of selected teams.
+    """
+    teams = to_array(statistics.index)
+    domains = split_domains(cols=2)
+
+    fig = go.Figure(
+        data=[
+            go.Pie(
+                labels=teams,
+                values=to_array(statistics[direction]),
+                name=direction,
+                hole=0.5,
+                textposition="inside",
+                textinfo="value+percent",
+                domain=dict(x=domain, y=[0.0, 1.0]),
+            )
+            for (direction, _), domain in zip(GOALS_TRACES, domains)
+        ],
+        layout=dict(
+            annotations=create_subplot_titles(
+                [title for _, title in GOALS_TRACES], domains
+            ),
+            title_text="Goals comparison",
+        ),
+    )
+
+    return fig
+
+
+def create_cards_comparison(statistics: pd.DataFrame) -> go.Figure:
+    """
+    Yellow/red cards comparison of selected teams.
+    """
+    teams = to_array(statistics.index)
+
+    fig = go.Figure(
+        data=[
+            go.Bar(
+                y=teams,
+                x=to_array(statistics[card]),
+                name=card,
+                text=to_array(statistics[card]),
+                orientation="h",
+                marker_color=color,
+            )
+            for card, color in CARDS_TRACES
+        ],
+        layout=dict(
+            yaxis_title="teams", title_text="Cards comparison", barmode="stack"
+        ),
+    )
+
+    return fig
+
+
+def diff_teams(previous: list, current: list):
+    """
+    Difference between previous and current teams selection.
+
+    Returns positions of removed teams (in descending order, so they can be deleted
+    one by one) and added teams, or None if current selection can't be reached from
+    previous one by removing teams and appending new ones.
+
+    params:
+        previous - previously rendered teams
+        current - selected teams
+    """
+    removed = [i for i, team in enumerate(previous) if team not in current]
+    kept = [team for team in previous if team in current]
+    added = [team for team in current if team not in previous]
+
+    if kept + added != current:
+        return None
+
+    return removed[::-1], added
+
+
+def patch_points_comparison(
+    statistics: pd.DataFrame, removed: list, added: list
+) -> Patch:
+    """
+    Incremental update of points comparison: one trace per team.
+    """
+    patch = Patch()
+
+    for position in removed:
+        del patch["data"][position]
+
+    for team in added:
+        patch["data"].append(create_points_trace(statistics=statistics, team=team))
+
+    return patch
+
+
+def patch_comparison(
+    statistics: pd.DataFrame,
+    removed: list,
+    added: list,
+    columns: list,
+    teams_axis: str,
+    values_axis: str,
+    with_text: bool = True,
+) -> Patch:
+    """
+    Incremental update of comparison figure with one trace per statistic.
+
+    Teams of each trace are stored in teams_axis array and their statistics in
+    values_axis (and text) array, so only removed/added teams are sent to browser.
+
+    params:
+        statistics - added teams statistics (gather_h2h_statistics)
+        removed - positions of removed teams in descending order
+        added - added teams
+        columns - statistics columns of figure traces in traces order
+        teams_axis - trace array with teams ("x", "y" or "labels")
+        values_axis - trace array with statistics ("x", "y" or "values")
+        with_text - whether trace text is equal to statistics
+    """
+    patch = Patch()
+    arrays = [teams_axis, values_axis] + (["text"] if with_text else [])
+
+    for i, column in enumerate(columns):
+        for position in removed:
+            for array in arrays:
+                del patch["data"][i][array][position]
+
+        if added:
+            values = statistics.loc[added, column].tolist()
+
+            patch["data"][i][teams_axis].extend(added)
+            patch["data"][i][values_axis].extend(values)
+
+            if with_text:
+                patch["data"][i]["text"].extend(values)
+
+    return patch
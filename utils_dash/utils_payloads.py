@@ -0,0 +1,53 @@
+import plotly.graph_objects as go
+
+from utils_dash.utils_tables import (
+    create_results_boxplot,
+    create_standings_boxplot,
+    create_topscorers_barplot,
+)
+
+
+def payload_key(season, league) -> str:
+    """
+    Key of (season, league) figures payload in dcc.Store.
+    """
+    return f"{season}|{league}"
+
+
+def create_tables_payloads(
+    standings_slices: dict, topscorers_slices: dict, **args
+) -> dict:
+    """
+    Pre-serialized Tables page figures for every (season, league).
+
+    Figures are stored as JSON strings, so the browser picks them from dcc.Store
+    with a clientside callback instead of asking the server to rebuild them.
+
+    params:
+        standings_slices - {(season, league): standings dataframe}
+        topscorers_slices - {(season, league): topscorers dataframe}
+        args - dash colors
+    """
+    payloads = {}
+
+    for (season, league), standings in standings_slices.items():
+        figures = {
+            "standings": create_standings_boxplot(data=standings, **args),
+            "results": create_results_boxplot(data=standings, **args),
+        }
+
+        topscorers = topscorers_slices.get((season, league))
+
+        for column in ["min_per_goal", "shots_per_goal"]:
+            if topscorers is not None and column in topscorers:
+                figures[column] = go.Figure(
+                    create_topscorers_barplot(data=topscorers, column=column, **args)
+                )
+            else:
+                figures[column] = go.Figure()
+
+        payloads[payload_key(season, league)] = {
+            name: fig.to_json() for name, fig in figures.items()
+        }
+
+    return payloads
@@ -0,0 +1,142 @@
+from collections import namedtuple
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+# fitted model of season & league: teams order, expected goals and score-line
+# probabilities of every (team, opponent) pair
+PoissonModel = namedtuple("PoissonModel", ["teams", "expected_goals", "scores"])
+
+
+def fit_strengths(standings: pd.DataFrame, goals: pd.DataFrame) -> tuple:
+    """
+    Attack/defence strengths of teams: scored/conceded goals per game relative to
+    league average goals per game.
+
+    params:
+        standings - standings of season & league (played games)
+        goals - sum of goals by direction (goals_aggregations) of season & league
+
+    return: (teams, attack, defence, league average goals per game)
+    """
+    totals = goals.pivot_table(
+        index="team", columns="direction", values="sum_goals", aggfunc="sum"
+    ).reindex(columns=["for", "against"], fill_value=0)
+    played = standings.set_index("team")["played"]
+
+    teams = played.index.intersection(totals.index)
+    played = played.loc[teams].to_numpy(dtype=float)
+    scored = totals.loc[teams, "for"].to_numpy(dtype=float)
+    conceded = totals.loc[teams, "against"].to_numpy(dtype=float)
+
+    average = scored.sum() / max(played.sum(), 1)
+    games = np.maximum(played, 1) * max(average, 1e-9)
+
+    return teams.to_numpy(), scored / games, conceded / games, average
+
+
+def predict_scores(
+    attack: np.ndarray, defence: np.ndarray, average: float, max_goals: int = 10
+) -> tuple:
+    """
+    Expected goals and score-line probabilities of all pairs at once: goals of team
+    against opponent are Poisson(average * attack[team] * defence[opponent]).
+
+    params:
+        attack - attack strengths of teams
+        defence - defence strengths of teams
+        average - league average goals per game
+        max_goals - max number of goals of team in score-line
+
+    return: (expected goals (teams, teams), scores (teams, teams, goals, goals))
+    """
+    expected_goals = average * np.outer(attack, defence)
+
+    # log pmf of 0..max_goals goals: k * log(lambda) - lambda - log(k!)
+    goals = np.arange(max_goals + 1)
+    log_factorial = np.concatenate([[0], np.cumsum(np.log(goals[1:]))])
+    log_pmf = (
+        goals * np.log(np.maximum(expected_goals, 1e-12))[..., None]
+        - expected_goals[..., None]
+        - log_factorial
+    )
+    pmf = np.exp(log_pmf)
+
+    # scores[i, j, a, b] - team i scores a and opponent j scores b
+    scores = pmf[:, :, :, None] * pmf.transpose(1, 0, 2)[:, :, None, :]
+
+    return expected_goals, scores
+
+
+def fit_leagues(standings_slices: dict, goals_slices: dict, max_goals=10) -> dict:
+    """
+    Poisson models of every season & league.
+
+    params:
+        standings_slices - {(season, league): standings dataframe}
+        goals_slices - {(season, league): goals_aggregations dataframe}
+        max_goals - max number of goals of team in score-line
+
+    return: dict {(season, league): PoissonModel}
+    """
+    models = {}
+
+    for key, standings in standings_slices.items():
+        goals = goals_slices.get(key)
+        if goals is None or goals.empty:
+            continue
+
+        teams, attack, defence, average = fit_strengths(
+            standings=standings, goals=goals
+        )
+        expected_goals, scores = predict_scores(
+            attack=attack, defence=defence, average=average, max_goals=max_goals
+        )
+        models[key] = PoissonModel(
+            teams={team: i for i, team in enumerate(teams)},
+            expected_goals=expected_goals,
+            scores=scores,
+        )
+
+    return models
+
+
+def create_predictions(model: PoissonModel, teams: list) -> pd.DataFrame:
+    """
+    Predictions of every pair of selected teams (neutral venue): expected goals,
+    win/draw/lose probabilities and most likely score.
+
+    params:
+        model - PoissonModel of season & league
+        teams - selected teams
+    """
+    columns = ["team", "opponent", "xg", "xg_opponent", "win", "draw", "lose", "score"]
+
+    pairs = list(combinations([team for team in teams if team in model.teams], 2))
+    if not pairs:
+        return pd.DataFrame(columns=columns)
+
+    team, opponent = np.array(
+        [[model.teams[i] for i, _ in pairs], [model.teams[j] for _, j in pairs]]
+    )
+    scores = model.scores[team, opponent]
+    size = scores.shape[-1]
+
+    # team goals a (rows) > opponent goals b (columns) below diagonal
+    win = np.tril(np.ones((size, size)), -1)
+    most_likely = scores.reshape(len(pairs), -1).argmax(axis=1)
+
+    return pd.DataFrame(
+        {
+            "team": [i for i, _ in pairs],
+            "opponent": [j for _, j in pairs],
+            "xg": model.expected_goals[team, opponent].round(2),
+            "xg_opponent": model.expected_goals[opponent, team].round(2),
+            "win": (scores * win).sum(axis=(1, 2)),
+            "draw": np.trace(scores, axis1=1, axis2=2),
+            "lose": (scores * win.T).sum(axis=(1, 2)),
+            "score": [f"{a}:{b}" for a, b in zip(*divmod(most_likely, size))],
+        },
+        columns=columns,
+    ).round({"win": 3, "draw": 3, "lose": 3})
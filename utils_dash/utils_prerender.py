@@ -0,0 +1,212 @@
+import functools
+import gzip
+import hashlib
+import inspect
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
+from dash._utils import to_json
+
+log = logging.getLogger(__name__)
+
+# Prerender of current render stage: forked workers find callbacks here
+_RENDERER = None
+
+
+def season_league_space(data) -> list:
+    """
+    All (season, league) of dashboard data.
+    """
+    return sorted(data.state.slices["standings"])
+
+
+def team_space(data) -> list:
+    """
+    All (season, league, team) of dashboard data.
+    """
+    return [
+        (season, league, team)
+        for season, league in season_league_space(data)
+        for team in data.get_slice("standings", season, league)["team"]
+    ]
+
+
+def leagues_space(data) -> list:
+    """
+    All selections of leagues in options order (filter_multiple_leagues).
+    """
+    leagues = data["standings"]["league"].unique().tolist()
+
+    return [
+        list(selection)
+        for size in range(1, len(leagues) + 1)
+        for selection in combinations(leagues, size)
+    ]
+
+
+def _render_tasks(name: str, tasks: list, path: str) -> int:
+    callback = inspect.unwrap(_RENDERER.callbacks[name]["fn"])
+    size = 0
+
+    for args in tasks:
+        size += _RENDERER.write(
+            path=path, name=name, args=args, payload=callback(*args)
+        )
+
+    return size
+
+
+class Prerender:
+    """
+    Pre-rendered outputs of dashboard callbacks.
+
+    Render stage (after ETL) calls every registered callback for every combination
+    of its inputs (space) and writes outputs as gzipped JSON to path/<data version>.
+    In serving mode callbacks return pre-rendered output of current data version
+    (one file read) and compute it only for inputs out of space.
+    """
+
+    def __init__(self, path: str, version, serve: bool = False):
+        self.path = path
+        self.version = version
+        self.serve = serve
+        self.callbacks = {}
+
+    def register(self, space):
+        """
+        Decorator of callback: space(data) - list of callback arguments tuples.
+        """
+
+        def decorator(fn):
+            self.callbacks[fn.__name__] = {"fn": fn, "space": space}
+
+            if not self.serve:
+                return fn
+
+            @functools.wraps(fn)
+            def wrapper(*args):
+                payload = self.read(name=fn.__name__, args=args)
+
+                return fn(*args) if payload is None else payload
+
+            return wrapper
+
+        return decorator
+
+    @staticmethod
+    def _file(path: str, name: str, args) -> str:
+        # arguments as JSON: same key for numpy values of space and inputs from browser
+        key = hashlib.md5(to_json(list(args)).encode()).hexdigest()
+
+        return os.path.join(path, name, f"{key}.json.gz")
+
+    def _current(self) -> str:
+        try:
+            with open(os.path.join(self.path, "CURRENT"), "r") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def read(self, name: str, args):
+        """
+        Pre-rendered output of callback (None if there is no output for current data).
+        """
+        version = self.version()
+        if self._current() != version:
+            return None
+
+        try:
+            with gzip.open(
+                self._file(os.path.join(self.path, version), name, args)
+            ) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def write(self, path: str, name: str, args, payload) -> int:
+        file = self._file(path, name, args)
+        data = gzip.compress(to_json(payload).encode())
+
+        with open(file, "wb") as f:
+            f.write(data)
+
+        return len(data)
+
+    def render(self, data, processes: int = None) -> dict:
+        """
+        Render outputs of all registered callbacks for all inputs of their spaces.
+
+        params:
+            data - DashboardData
+            processes - number of worker processes (None - number of CPUs)
+
+        return: dict (version, files, bytes, seconds)
+        """
+        global _RENDERER
+
+        start = time.perf_counter()
+        version = self.version()
+
+        # new version is written aside and switched to when complete
+        path = os.path.join(self.path, version)
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path)
+
+        tasks = []
+        size = files = 0
+        for name, callback in self.callbacks.items():
+            os.makedirs(os.path.join(path, name))
+            space = [tuple(args) for args in callback["space"](data)]
+            if not space:
+                continue
+
+            # first output is rendered here: data.cached builders of the callback
+            # (projections, ...) run once before fork and workers share their results
+            size += self.write(
+                path=path,
+                name=name,
+                args=space[0],
+                payload=inspect.unwrap(callback["fn"])(*space[0]),
+            )
+            space = space[1:]
+            files += 1
+
+            chunk = max(len(space) // (4 * (processes or os.cpu_count())), 1)
+            for i in range(0, len(space), chunk):
+                end = i + chunk
+                tasks.append((name, space[i:end], path))
+
+        # forked workers share loaded data & callbacks closures
+        _RENDERER = self
+        with ProcessPoolExecutor(
+            max_workers=processes, mp_context=multiprocessing.get_context("fork")
+        ) as executor:
+            size += sum(executor.map(_render_tasks, *zip(*tasks))) if tasks else 0
+        _RENDERER = None
+
+        with open(os.path.join(self.path, "CURRENT.tmp"), "w") as f:
+            f.write(version)
+        os.replace(
+            os.path.join(self.path, "CURRENT.tmp"), os.path.join(self.path, "CURRENT")
+        )
+
+        # previous versions
+        for old in os.listdir(self.path):
+            if old != version and os.path.isdir(os.path.join(self.path, old)):
+                shutil.rmtree(os.path.join(self.path, old), ignore_errors=True)
+
+        report = {
+            "version": version,
+            "files": files + sum(len(task[1]) for task in tasks),
+            "bytes": size,
+            "seconds": round(time.perf_counter() - start, 2),
+        }
+        log.info(f"Pre-rendered dashboard: {report}")
+
+        return report
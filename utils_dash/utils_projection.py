@@ -0,0 +1,275 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# points for a win and a draw
+WIN_POINTS = 3
+DRAW_POINTS = 1
+
+
+def get_results_probabilities(
+    standings: pd.DataFrame, form_weight: float = 0.5, prior_games: int = 5
+) -> np.ndarray:
+    """
+    Win/draw/lose probabilities of a team's game: season results blended with
+    recent form and smoothed towards league average results by prior_games.
+
+    params:
+        standings - standings of season & league
+        form_weight - weight of every form game relative to season game
+        prior_games - number of league average games added to every team
+
+    return: np.ndarray (teams, 3)
+    """
+    results = standings[["win", "draw", "lose"]].to_numpy(dtype=float)
+
+    form = standings["form"].fillna("").str
+    form_results = np.stack(
+        [form.count("W"), form.count("D"), form.count("L")], axis=1
+    ).astype(float)
+
+    # no games played yet: all results are equally likely
+    league_average = np.full(3, 1 / 3)
+    if results.sum():
+        league_average = results.sum(axis=0) / results.sum()
+
+    counts = results + form_weight * form_results + prior_games * league_average
+
+    return counts / counts.sum(axis=1, keepdims=True)
+
+
+def create_fixtures(remaining: np.ndarray, meetings: int = 2) -> tuple:
+    """
+    Remaining fixtures of a round robin with meetings games of every pair: teams with
+    most remaining games are paired first, a pair meets at most meetings times.
+
+    Standings don't tell which pairs have already played, so fixtures are a plausible
+    schedule matching the number of remaining games of every team, not the real one.
+
+    params:
+        remaining - number of remaining games of every team
+        meetings - games of every pair in the season
+
+    return: (home, away) np.ndarray of teams indexes of every fixture
+    """
+    left = np.array(remaining, dtype=np.int64)
+    played = np.zeros((len(left), len(left)), dtype=np.int64)
+    np.fill_diagonal(played, meetings)
+    home, away = [], []
+
+    while True:
+        team = int(np.argmax(left))
+        if left[team] == 0:
+            break
+
+        # opponents with most games left which still can meet the team
+        opponents = [
+            i
+            for i in np.argsort(-left, kind="stable")
+            if left[i] > 0 and played[team, i] < meetings
+        ][: left[team]]
+        if not opponents:
+            break
+
+        for opponent in opponents:
+            home.append(team)
+            away.append(opponent)
+            played[team, opponent] += 1
+            played[opponent, team] += 1
+            left[opponent] -= 1
+        left[team] -= len(opponents)
+
+    return np.array(home, dtype=np.int64), np.array(away, dtype=np.int64)
+
+
+def get_games_probabilities(
+    probabilities: np.ndarray, home: np.ndarray, away: np.ndarray
+) -> np.ndarray:
+    """
+    Home win/draw/away win probabilities of fixtures: results probabilities of both
+    teams combined (home win = home team wins and away team loses, etc.).
+
+    return: np.ndarray (fixtures, 3)
+    """
+    games = np.stack(
+        [
+            probabilities[home, 0] * probabilities[away, 2],
+            probabilities[home, 1] * probabilities[away, 1],
+            probabilities[home, 2] * probabilities[away, 0],
+        ],
+        axis=1,
+    )
+
+    return games / games.sum(axis=1, keepdims=True)
+
+
+def simulate_points(
+    points: np.ndarray,
+    home: np.ndarray,
+    away: np.ndarray,
+    probabilities: np.ndarray,
+    simulations: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """
+    Final points of every team in every simulation: results of remaining fixtures are
+    drawn at once for all simulations, every result gives points to both teams.
+
+    params:
+        points - current points of teams
+        home, away - teams indexes of fixtures (see create_fixtures)
+        probabilities - home win/draw/away win of fixtures (see get_games_probabilities)
+        simulations - number of simulated seasons
+        rng - random generator
+
+    return: np.ndarray (simulations, teams)
+    """
+    thresholds = np.cumsum(probabilities, axis=1).astype(np.float32)
+    draws = rng.random((simulations, len(home)), dtype=np.float32)
+
+    home_win = (draws < thresholds[:, 0]).astype(np.float32)
+    draw = (draws < thresholds[:, 1]).astype(np.float32) - home_win
+    away_win = 1 - home_win - draw
+
+    # fixtures x teams incidence: points of fixtures are summed by teams
+    teams = len(points)
+    home_teams = np.eye(teams, dtype=np.float32)[home]
+    away_teams = np.eye(teams, dtype=np.float32)[away]
+
+    home_points = WIN_POINTS * home_win + DRAW_POINTS * draw
+    away_points = WIN_POINTS * away_win + DRAW_POINTS * draw
+
+    return points + (home_points @ home_teams + away_points @ away_teams).astype(
+        np.int64
+    )
+
+
+def project_season(
+    standings: pd.DataFrame,
+    simulations: int = 10000,
+    top: int = 4,
+    relegation: int = 3,
+    seed: int = None,
+    chunksize: int = 20000,
+) -> pd.DataFrame:
+    """
+    Monte Carlo projection of the rest of the season.
+
+    Every team plays 2 * (teams - 1) games. Remaining games are paired into fixtures
+    (create_fixtures: real schedule is unknown, so it is approximated by pairing teams
+    with most games left), results are drawn from both teams' get_results_probabilities,
+    so points of a game go to both sides as in the league. Teams are ranked by points,
+    then by goals difference projected with current per-game rate, then randomly.
+
+    params:
+        standings - last standings snapshot of season & league
+        simulations - number of simulated seasons
+        top - number of top places (Champions League)
+        relegation - number of relegated teams
+        seed - random seed
+        chunksize - simulations per chunk (memory bound)
+
+    return: pd.DataFrame (team, points, expected_points, title, top, relegation)
+    """
+    rng = np.random.default_rng(seed)
+
+    teams = len(standings)
+    points = standings["points"].to_numpy(dtype=np.int64)
+    played = standings["played"].to_numpy(dtype=np.int64)
+    remaining = np.clip(2 * (teams - 1) - played, 0, None)
+    home, away = create_fixtures(remaining=remaining)
+    probabilities = get_games_probabilities(
+        probabilities=get_results_probabilities(standings=standings),
+        home=home,
+        away=away,
+    )
+
+    goals_diff = standings["goals_diff"].to_numpy(dtype=float)
+    goals_diff = goals_diff + remaining * goals_diff / np.maximum(played, 1)
+
+    title = np.zeros(teams)
+    top_places = np.zeros(teams)
+    relegated = np.zeros(teams)
+    total_points = np.zeros(teams)
+
+    for start in range(0, simulations, chunksize):
+        size = min(chunksize, simulations - start)
+
+        final_points = simulate_points(
+            points=points,
+            home=home,
+            away=away,
+            probabilities=probabilities,
+            simulations=size,
+            rng=rng,
+        )
+
+        # points first, goals difference and random draw as tie-breakers
+        score = final_points + goals_diff / 1000 + rng.random((size, teams)) / 1e6
+        places = np.argsort(np.argsort(-score, axis=1), axis=1)
+
+        title += (places == 0).sum(axis=0)
+        top_places += (places < top).sum(axis=0)
+        relegated += (places >= teams - relegation).sum(axis=0)
+        total_points += final_points.sum(axis=0)
+
+    return pd.DataFrame(
+        {
+            "team": standings["team"].to_numpy(),
+            "points": points,
+            "expected_points": (total_points / simulations).round(1),
+            "title": (title / simulations).round(3),
+            "top": (top_places / simulations).round(3),
+            "relegation": (relegated / simulations).round(3),
+        }
+    ).sort_values("expected_points", ascending=False, ignore_index=True)
+
+
+def has_remaining_games(standings: pd.DataFrame) -> bool:
+    """
+    Season is not finished: some team has games to play.
+    """
+    return bool((standings["played"] < 2 * (len(standings) - 1)).any())
+
+
+def project_seasons(
+    standings_slices: dict,
+    simulations: int = 10000,
+    processes: int = None,
+    start_method: str = "spawn",
+    **args,
+) -> dict:
+    """
+    Projections of unfinished seasons & leagues, computed in parallel by process pool.
+
+    params:
+        standings_slices - {(season, league): standings dataframe}
+        simulations - number of simulated seasons
+        processes - number of processes (None - number of CPUs, 1 - in-process)
+        start_method - multiprocessing start method of workers: spawn in running
+                       server (threads), fork only in offline render & benchmarks
+        args - project_season params
+
+    return: dict {(season, league): projection dataframe}
+    """
+    keys = [
+        key
+        for key, standings in standings_slices.items()
+        if has_remaining_games(standings)
+    ]
+    tasks = [
+        dict(standings=standings_slices[key], simulations=simulations, **args)
+        for key in keys
+    ]
+
+    if processes == 1 or len(tasks) < 2:
+        return {key: project_season(**task) for key, task in zip(keys, tasks)}
+
+    with ProcessPoolExecutor(
+        max_workers=processes, mp_context=multiprocessing.get_context(start_method)
+    ) as executor:
+        futures = [executor.submit(project_season, **task) for task in tasks]
+
+        return {key: future.result() for key, future in zip(keys, futures)}
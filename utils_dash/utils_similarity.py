@@ -0,0 +1,194 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+# dashboard data used by team profile
+FEATURE_DATA = [
+    "standings",
+    "goals_distribution",
+    "cards",
+    "lineups",
+    "cleansheets",
+    "penalties",
+]
+
+
+def share(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Row-wise shares of values (zero rows stay zero).
+    """
+    return data.div(data.sum(axis=1).replace(0, 1), axis=0)
+
+
+def create_features(slices: dict) -> pd.DataFrame:
+    """
+    Statistical profiles of teams of one season & league: goals and cards by
+    minute, formations, clean sheets and penalties.
+
+    params:
+        slices - {name: dataframe} slices of FEATURE_DATA of season & league
+
+    return: pd.DataFrame (teams, features)
+    """
+    played = slices["standings"].set_index("team")["played"].clip(lower=1)
+
+    goals = slices["goals_distribution"].pivot_table(
+        index="team", columns=["direction", "minute"], values="goals", aggfunc="sum"
+    )
+    cards = slices["cards"].pivot_table(
+        index="team", columns=["color", "minute"], values="number", aggfunc="sum"
+    )
+    lineups = slices["lineups"].pivot_table(
+        index="team", columns="formation", values="games", aggfunc="sum"
+    )
+    cleansheets = slices["cleansheets"].pivot_table(
+        index="team", columns="location", values="games", aggfunc="sum"
+    )
+    penalties = slices["penalties"].pivot_table(
+        index="team", columns="result", values="number", aggfunc="sum"
+    )
+
+    blocks = {
+        # when goals are scored/missed
+        "goals": pd.concat(
+            {
+                direction: share(goals[direction])
+                for direction in goals.columns.unique(level="direction")
+            },
+            axis=1,
+        ),
+        # cards per game by minute
+        "cards": cards.div(played, axis=0),
+        "formation": share(lineups),
+        "cleansheets": cleansheets.div(played, axis=0),
+        "penalties": penalties.div(played, axis=0),
+    }
+
+    features = pd.concat(
+        [
+            block.set_axis(
+                [
+                    "_".join([name] + list(np.atleast_1d(column)))
+                    for column in block.columns
+                ],
+                axis=1,
+            )
+            for name, block in blocks.items()
+        ],
+        axis=1,
+    )
+
+    return features.reindex(played.index).fillna(0)
+
+
+class SimilarityIndex:
+    """
+    Nearest neighbours of teams across all seasons & leagues by cosine similarity
+    of standardized statistical profiles.
+
+    Profiles are kept per (season, league) and rebuilt only for slices with new data
+    version (see DashboardData.refresh), queries are one matrix-vector product.
+    """
+
+    def __init__(self):
+        self.versions = {}
+
+        self._lock = threading.Lock()
+        self._features = {}
+        # (teams, matrix) replaced by a single assignment: queries read matching pair
+        self._index = self._empty_index()
+
+    def sync(self, data) -> list:
+        """
+        Rebuild profiles of (season, league) slices changed since last sync.
+
+        params:
+            data - DashboardData
+
+        return: list of rebuilt (season, league)
+        """
+        with self._lock:
+            state = data.state
+            keys = set(state.slices["standings"])
+            changed = [
+                key
+                for key in keys
+                if key not in self._features
+                or self.versions.get(key) != state.versions.get(key)
+            ]
+            removed = [key for key in self._features if key not in keys]
+
+            if not changed and not removed:
+                return []
+
+            for key in removed:
+                del self._features[key]
+                self.versions.pop(key, None)
+
+            for key in changed:
+                self._features[key] = create_features(
+                    slices={
+                        name: state.slices[name].get(key, state.frames[name].iloc[:0])
+                        for name in FEATURE_DATA
+                    }
+                )
+                self.versions[key] = state.versions.get(key)
+
+            self._build()
+
+            return changed
+
+    @staticmethod
+    def _empty_index():
+        return (
+            pd.MultiIndex.from_tuples([], names=["season", "league", "team"]),
+            np.empty((0, 0), dtype=np.float32),
+        )
+
+    def _build(self):
+        # all slices removed: nothing to concat
+        if not self._features:
+            self._index = self._empty_index()
+            return
+
+        features = pd.concat(self._features, names=["season", "league", "team"])
+        features = features.fillna(0)
+
+        # standardized features, rows of unit length: dot product is cosine
+        matrix = features.to_numpy(dtype=np.float64)
+        std = matrix.std(axis=0)
+        matrix = (matrix - matrix.mean(axis=0)) / np.where(std > 0, std, 1)
+        norm = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix = matrix / np.where(norm > 0, norm, 1)
+
+        self._index = (
+            features.index,
+            np.ascontiguousarray(matrix, dtype=np.float32),
+        )
+
+    def query(self, season, league, team, k: int = 10) -> pd.DataFrame:
+        """
+        k teams (of any season & league) most similar to team of season & league.
+
+        return: pd.DataFrame (season, league, team, similarity)
+        """
+        teams, matrix = self._index
+        columns = ["season", "league", "team", "similarity"]
+
+        k = min(k, len(teams) - 1)
+        if k < 1 or (season, league, team) not in teams:
+            return pd.DataFrame(columns=columns)
+
+        row = teams.get_loc((season, league, team))
+        similarity = matrix @ matrix[row]
+        similarity[row] = -np.inf
+
+        nearest = np.argpartition(-similarity, k - 1)[:k]
+        nearest = nearest[np.argsort(-similarity[nearest])]
+
+        return (
+            teams[nearest]
+            .to_frame(index=False)
+            .assign(similarity=similarity[nearest].round(3))
+        )
@@ -0,0 +1,205 @@
+import fcntl
+import functools
+import hashlib
+import io
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+from plotly.basedatatypes import BaseFigure
+
+
+class _Pickler(pickle.Pickler):
+    """Figures are shared as plain dicts: unpickled Figure is validated again."""
+
+    def reducer_override(self, obj):
+        if isinstance(obj, BaseFigure):
+            return dict, (obj.to_plotly_json(),)
+
+        return NotImplemented
+
+
+def dumps(result) -> bytes:
+    buffer = io.BytesIO()
+    _Pickler(buffer).dump(result)
+
+    return buffer.getvalue()
+
+
+class _Call:
+    """Computation in flight: waiters block on event and get its result."""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalescing of concurrent identical computations.
+
+    Threads of one process asking for the same key while it is computed wait for
+    the leader's result. Across processes (gunicorn workers) leaders of the same key
+    are serialized by flock of the key's lock file: a worker which had to wait for
+    the lock marks the key, so the leader shares its result through SQLite for ttl
+    seconds and the waiting worker reads it instead of computing. Uncontended calls
+    don't touch SQLite.
+    """
+
+    def __init__(self, path: str = None, ttl: int = 60):
+        self.path = path
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self._calls = {}
+
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+
+            with self._connect() as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS results "
+                    "(key TEXT PRIMARY KEY, value BLOB, created REAL)"
+                )
+
+    def do(self, key: str, fn):
+        """
+        Result of fn() computed once for all concurrent callers with the same key.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.event.wait()
+
+            if call.error is not None:
+                raise call.error
+
+            return call.result
+
+        try:
+            call.result = self._do_shared(key=key, fn=fn)
+        except Exception as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+            call.event.set()
+
+        return call.result
+
+    def _acquire(self, key: str) -> tuple:
+        """
+        Open and flock lock file of key.
+
+        return: (locked file, whether another process held the lock)
+        """
+        lock_path = os.path.join(self.path, f"{key}.lock")
+        waited = False
+
+        while True:
+            lock = open(lock_path, "a")
+
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                # leader of another process shares its result when key is marked
+                waited = True
+                open(os.path.join(self.path, f"{key}.wait"), "a").close()
+                fcntl.flock(lock, fcntl.LOCK_EX)
+
+            # lock file is removed by its holder: lock the current one
+            try:
+                current = os.fstat(lock.fileno()).st_ino == os.stat(lock_path).st_ino
+            except FileNotFoundError:
+                current = False
+
+            if current:
+                return lock, waited
+
+            lock.close()
+
+    def _do_shared(self, key: str, fn):
+        if self.path is None:
+            return fn()
+
+        lock, waited = self._acquire(key)
+
+        try:
+            found, result = self._read(key) if waited else (False, None)
+
+            if not found:
+                result = fn()
+
+                wait_path = os.path.join(self.path, f"{key}.wait")
+                if os.path.exists(wait_path):
+                    self._write(key, result)
+                    os.remove(wait_path)
+        finally:
+            # lock files don't pile up: removed before unlock
+            os.remove(lock.name)
+            lock.close()
+
+        return result
+
+    def _connect(self):
+        conn = sqlite3.connect(os.path.join(self.path, "results.sqlite"), timeout=30)
+        # shared results are a cache: no fsync on commit
+        conn.execute("PRAGMA synchronous=OFF")
+
+        return conn
+
+    def _read(self, key: str) -> tuple:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value FROM results WHERE key = ? AND created >= ?",
+                (key, time.time() - self.ttl),
+            ).fetchone()
+
+        if row is None:
+            return False, None
+
+        return True, pickle.loads(row[0])
+
+    def _write(self, key: str, result):
+        now = time.time()
+
+        with self._connect() as conn:
+            conn.execute("DELETE FROM results WHERE created < ?", (now - self.ttl,))
+            conn.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?)",
+                (key, dumps(result), now),
+            )
+
+
+def coalesce(singleflight: SingleFlight, version):
+    """
+    Decorator of dashboard callbacks: calls with the same function, arguments and
+    data version (version()) are computed once by singleflight (None - disabled).
+    """
+
+    def decorator(fn):
+        if singleflight is None:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = hashlib.md5(
+                repr((fn.__name__, args, sorted(kwargs.items()), version())).encode()
+            ).hexdigest()
+
+            return singleflight.do(key=key, fn=lambda: fn(*args, **kwargs))
+
+        return wrapper
+
+    return decorator
@@ -1,66 +1,64 @@
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 
+from utils_dash.utils_figures import create_subplot_titles, split_domains, to_array
 
-def create_goals_distribution(data: pd.DataFrame, **args):
+
+def create_goals_distribution(data: pd.DataFrame, totals: pd.DataFrame, **args):
     """
     Scored/missed goals distribution
+
+    params:
+        data - goals by minutes (goals_minutes_aggregations)
+        totals - sum of goals by direction (goals_aggregations)
     """
     colors = {
         "for": args["dash"]["colors"]["agressive"],
         "against": args["dash"]["colors"]["soft"],
     }
+    domains = split_domains(cols=2)
 
-    fig = make_subplots(
-        rows=1,
-        cols=2,
-        specs=[[{"type": "bar"}, {"type": "pie"}]],
-        horizontal_spacing=0.001,
-        subplot_titles=("by minutes", "total"),
-    )
+    traces = []
 
     for direction, name in zip(["for", "against"], ["scored", "missed"]):
-        fig.add_trace(
+        direction_data = data[data["direction"] == direction]
+        goals = to_array(direction_data["goals"])
+
+        traces.append(
             go.Bar(
-                x=data[data["direction"] == direction]["minute"],
-                y=data[data["direction"] == direction]["goals"],
+                x=to_array(direction_data["minute"]),
+                y=goals,
                 name=name,
-                text=data[data["direction"] == direction]["goals"],
+                text=goals,
                 width=0.35,
                 marker_color=colors[direction],
-            ),
-            row=1,
-            col=1,
+            )
         )
 
-    sum_goals = (
-        data.groupby("direction")["goals"].sum().reset_index().sort_values(by=["goals"])
-    )
+    sum_goals = totals.sort_values(by=["sum_goals"])
 
-    fig.add_trace(
+    traces.append(
         go.Pie(
-            values=sum_goals["goals"],
-            labels=sum_goals["direction"],
+            values=to_array(sum_goals["sum_goals"]),
+            labels=to_array(sum_goals["direction"]),
             showlegend=False,
-            text=sum_goals["goals"],
+            text=to_array(sum_goals["sum_goals"]),
             marker_colors=list(colors.values())[::-1],
-        ),
-        row=1,
-        col=2,
+            domain=dict(x=domains[1], y=[0.0, 1.0]),
+        )
     )
 
-    fig.update_layout(
-        xaxis_title="minutes",
-        yaxis_title="goals",
-        height=400,
-        width=1200,
-        plot_bgcolor="white",
-        yaxis=dict(showgrid=True, gridcolor="lightgrey"),
-        title_text="Scored/missed goals distribution",
+    fig = go.Figure(
+        data=traces,
+        layout=dict(
+            xaxis=dict(domain=domains[0], title_text="minutes"),
+            yaxis_title="goals",
+            annotations=create_subplot_titles(["by minutes", "total"], domains),
+            height=400,
+            width=1200,
+            title_text="Scored/missed goals distribution",
+        ),
     )
-    fig.update_traces(marker=dict(line=dict(color="#000000", width=0.75)))
 
     return fig
 
@@ -74,23 +72,28 @@ def create_cards_boxplot(data: pd.DataFrame, **args):
         "red": args["dash"]["colors"]["soft"],
     }
 
-    fig = px.bar(
-        data,
-        x="minute",
-        y="number",
-        color="color",
-        text_auto=".s",
-        color_discrete_map=colors,
-    )
-
-    fig.update_layout(
-        height=400,
-        width=600,
-        title_text="Cards distribution",
-        plot_bgcolor="white",
-        yaxis=dict(showgrid=True, gridcolor="lightgrey"),
+    fig = go.Figure(
+        data=[
+            go.Bar(
+                x=to_array(color_data["minute"]),
+                y=to_array(color_data["number"]),
+                name=color,
+                legendgroup=color,
+                marker_color=colors.get(color),
+                texttemplate="%{y:.s}",
+            )
+            for color, color_data in data.groupby("color", sort=False)
+        ],
+        layout=dict(
+            barmode="relative",
+            xaxis_title="minute",
+            yaxis_title="number",
+            legend_title_text="color",
+            height=400,
+            width=600,
+            title_text="Cards distribution",
+        ),
     )
-    fig.update_traces(marker=dict(line=dict(color="#000000", width=0.75)))
 
     return fig
 
@@ -99,19 +102,22 @@ def create_lineups_boxplot(data: pd.DataFrame, **args):
     """
     Teams lineups distribution visualisation.
     """
-    fig = px.bar(data, x="formation", y="games", text_auto=".s")
-
-    fig.update_layout(
-        height=400,
-        width=600,
-        title_text="Lineups distribution",
-        plot_bgcolor="white",
-        yaxis=dict(showgrid=True, gridcolor="lightgrey"),
-    )
-
-    fig.update_traces(
-        marker_color=args["dash"]["colors"]["agressive"],
-        marker=dict(line=dict(color="#000000", width=0.75)),
+    fig = go.Figure(
+        data=[
+            go.Bar(
+                x=to_array(data["formation"]),
+                y=to_array(data["games"]),
+                marker_color=args["dash"]["colors"]["agressive"],
+                texttemplate="%{y:.s}",
+            )
+        ],
+        layout=dict(
+            xaxis_title="formation",
+            yaxis_title="games",
+            height=400,
+            width=600,
+            title_text="Lineups distribution",
+        ),
     )
 
     return fig
@@ -121,31 +127,27 @@ def create_penalties_boxplot(data: pd.DataFrame, **args):
     """
     Penalties results distribution visualisation.
     """
-    colors = {
-        "missed": args["dash"]["colors"]["agressive"],
-        "scored": args["dash"]["colors"]["soft"],
-    }
-
-    fig = px.bar(
-        data,
-        x="result",
-        y="number",
-        text_auto=".s",
-        color="result",
-        color_discrete_map=colors,
-    )
-
-    fig.update_layout(
-        height=400,
-        width=600,
-        title_text="Penalties distribution",
-        plot_bgcolor="white",
-        yaxis=dict(showgrid=True, gridcolor="lightgrey"),
-    )
-
-    fig.update_traces(
-        marker_color=args["dash"]["colors"]["soft"],
-        marker=dict(line=dict(color="#000000", width=0.75)),
+    fig = go.Figure(
+        data=[
+            go.Bar(
+                x=to_array(result_data["result"]),
+                y=to_array(result_data["number"]),
+                name=result,
+                legendgroup=result,
+                marker_color=args["dash"]["colors"]["soft"],
+                texttemplate="%{y:.s}",
+            )
+            for result, result_data in data.groupby("result", sort=False)
+        ],
+        layout=dict(
+            barmode="relative",
+            xaxis_title="result",
+            yaxis_title="number",
+            legend_title_text="result",
+            height=400,
+            width=600,
+            title_text="Penalties distribution",
+        ),
     )
 
     return fig
@@ -159,24 +161,20 @@ def create_cleansheets_boxplot(data: pd.DataFrame, **args):
         "home": args["dash"]["colors"]["agressive"],
         "away": args["dash"]["colors"]["soft"],
     }
-
-    fig = px.pie(
-        data,
-        values="games",
-        names="location",
-        color="location",
-        color_discrete_map=colors,
-    )
-
-    fig.update_traces(hole=0.5, textposition="inside", textinfo="value+percent")
-
-    fig.update_layout(
-        height=400,
-        width=600,
-        title_text="Cleansheets distribution",
-        plot_bgcolor="white",
-        yaxis=dict(showgrid=True, gridcolor="lightgrey"),
+    locations = to_array(data["location"])
+
+    fig = go.Figure(
+        data=[
+            go.Pie(
+                values=to_array(data["games"]),
+                labels=locations,
+                marker_colors=[colors.get(location) for location in locations],
+                hole=0.5,
+                textposition="inside",
+                textinfo="value+percent",
+            )
+        ],
+        layout=dict(height=400, width=600, title_text="Cleansheets distribution"),
     )
-    fig.update_traces(marker=dict(line=dict(color="#000000", width=0.75)))
 
     return fig
@@ -1,70 +1,131 @@
+import numpy as np
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 
+from utils_dash.utils_figures import to_array
 
-def create_standings_boxplot(data: pd.DataFrame, **args) -> px.bar:
+
+def create_standings_boxplot(data: pd.DataFrame, **args) -> go.Figure:
     """
     Scored/missed goals distribution visualisation.
     """
-    fig = make_subplots(
-        rows=1, cols=1, specs=[[{"type": "bar"}]], horizontal_spacing=0.001
-    )
+    teams = to_array(data["team"])
 
-    for direction, color in zip(
-        ["scored", "missed"], [args["agressive"], args["soft"]]
-    ):
-        fig.add_trace(
+    fig = go.Figure(
+        data=[
             go.Bar(
-                x=data["team"],
-                y=data[direction],
+                x=teams,
+                y=to_array(data[direction]),
                 name=direction,
-                text=[i for i in data[direction]],
+                text=to_array(data[direction]),
                 marker_color=color,
                 width=0.35,
-            ),
-            row=1,
-            col=1,
-        )
-
-    fig.update_layout(
-        yaxis_title="goals",
-        margin=dict(l=10, r=10, t=10),
-        plot_bgcolor="white",
-        yaxis=dict(showgrid=True, gridcolor="lightgrey"),
+            )
+            for direction, color in zip(
+                ["scored", "missed"], [args["agressive"], args["soft"]]
+            )
+        ],
+        layout=dict(yaxis_title="goals", margin=dict(l=10, r=10, t=10)),
     )
 
     return fig
 
 
-def create_results_boxplot(data: pd.DataFrame, **args) -> px.bar:
+def create_results_boxplot(data: pd.DataFrame, **args) -> go.Figure:
     """
     Win/lose distribution visualisation.
     """
-    fig = make_subplots(
-        rows=1, cols=1, specs=[[{"type": "bar"}]], horizontal_spacing=0.001
-    )
+    teams = to_array(data["team"])
 
-    for result, color in zip(["win", "lose"], [args["agressive"], args["soft"]]):
-        fig.add_trace(
+    fig = go.Figure(
+        data=[
             go.Bar(
-                x=data["team"],
-                y=data[result],
+                x=teams,
+                y=to_array(data[result]),
                 name=result,
-                text=[i for i in data[result]],
+                text=to_array(data[result]),
                 marker_color=color,
                 width=0.35,
-            ),
-            row=1,
-            col=1,
-        )
-
-    fig.update_layout(
-        yaxis_title="results",
-        margin=dict(l=10, r=10, t=10),
-        plot_bgcolor="white",
-        yaxis=dict(showgrid=True, gridcolor="lightgrey"),
+            )
+            for result, color in zip(["win", "lose"], [args["agressive"], args["soft"]])
+        ],
+        layout=dict(yaxis_title="results", margin=dict(l=10, r=10, t=10)),
+    )
+
+    return fig
+
+
+def create_topscorers_barplot(data: pd.DataFrame, column: str, **args) -> dict:
+    """
+    Topscorers statistic (min_per_goal, shots_per_goal) visualisation.
+    """
+    fig = {
+        "data": [
+            {
+                "x": data["player"],
+                "y": data[column],
+                "type": "bar",
+                "marker": {"color": args["agressive"]},
+                "width": 0.3,
+                "text": [np.round(i, 2) for i in data[column].unique()],
+            }
+        ],
+        "layout": {
+            "xaxis": {"automargin": True},
+            "yaxis": {"automargin": True, "title": {"text": column}},
+            "height": 250,
+            "margin": {"t": 10, "l": 10, "r": 10},
+        },
+    }
+
+    return fig
+
+
+def create_progression_plot(
+    data: pd.DataFrame,
+    column: str,
+    teams: list = None,
+    as_of: str = None,
+    title: str = None,
+    **args,
+) -> go.Figure:
+    """
+    Season progression (rank, points) of teams by extraction dates, one line per team.
+
+    params:
+        data - standings_progression of season & league
+        column - rank, points, goals_diff
+        teams - selected teams (None - all teams)
+        as_of - last date of progression (None - whole season)
+        title - figure title
+        args - dash colors
+    """
+    if teams is not None:
+        data = data[data["team"].isin(teams)]
+
+    if as_of is not None:
+        data = data[pd.to_datetime(data["date_extraction"]) <= pd.Timestamp(as_of)]
+
+    data = data.sort_values(["date_extraction", "team"])
+
+    fig = go.Figure(
+        data=[
+            go.Scatter(
+                x=to_array(team_data["date_extraction"]),
+                y=to_array(team_data[column]),
+                name=team,
+                mode="lines+markers",
+                marker=dict(size=4),
+            )
+            for team, team_data in data.groupby("team", sort=False)
+        ],
+        layout=dict(
+            title_text=title,
+            yaxis_title=column,
+            # first place on top
+            yaxis_autorange="reversed" if column == "rank" else True,
+            margin=dict(l=10, r=10, t=10),
+        ),
     )
 
     return fig